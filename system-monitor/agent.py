@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+System Monitor Agent
+원격 호스트에서 수집만 수행하고 샘플 배치를 중앙 서버(main.py)로 전송하는 경량 에이전트
+
+사용법:
+    python agent.py --server tcp://monitor-host:5001 [--name web-1] [--interval 1] [--batch 1]
+    python agent.py --server unix:///tmp/system-monitor.sock
+
+Flask / eventlet / matplotlib 없이 수집기(MetricCollector)만 사용하며, 히스토리 저장, 알림 규칙과
+이상 징후 검출은 중앙 서버가 수행합니다.
+"""
+
+import argparse
+import itertools
+import platform
+import signal
+import socket
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+from monitor import MetricCollector, DEFAULT_COLLECTOR_INTERVALS
+from scheduler import FixedRateScheduler
+from wire import PROTOCOL_VERSION, encode_message, parse_address
+
+DEFAULT_SAMPLE_INTERVAL = 1.0  # 수집기 최소 주기 (초)
+DEFAULT_BATCH_INTERVAL = 1.0  # 배치 전송 주기 (초)
+MAX_PENDING_SAMPLES = 3600  # 연결이 끊긴 동안 보관하는 샘플 수 (넘으면 오래된 것부터 버림)
+MAX_BATCH_SAMPLES = 600  # 메시지 하나의 최대 샘플 수
+RECONNECT_MIN = 1.0  # 재연결 첫 대기 시간 (초)
+RECONNECT_MAX = 30.0  # 재연결 대기 시간 상한 (초)
+SOCKET_TIMEOUT = 10.0  # 연결/전송 제한 시간 (초)
+
+
+class AgentConnection:
+    """집계 서버와의 지속 연결 (끊기면 지수 백오프로 재연결하고 연결마다 hello 전송)"""
+
+    def __init__(self, address: str, hello: Dict[str, Any], clock=time.monotonic):
+        self.family, self.address = parse_address(address)
+        self.hello = hello
+        self.clock = clock
+        self._sock: Optional[socket.socket] = None
+        self._backoff = RECONNECT_MIN
+        self._next_attempt = 0.0
+        self.last_error = None
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def _connect(self) -> bool:
+        now = self.clock()
+        if now < self._next_attempt:
+            return False
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.settimeout(SOCKET_TIMEOUT)
+        try:
+            sock.connect(self.address)
+            if self.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(encode_message(self.hello))
+        except OSError as e:
+            sock.close()
+            self.last_error = str(e)
+            self._next_attempt = now + self._backoff
+            self._backoff = min(self._backoff * 2, RECONNECT_MAX)
+            return False
+        self._sock = sock
+        self._backoff = RECONNECT_MIN
+        return True
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        """메시지 전송 (연결이 없으면 연결 시도, 실패하면 False)"""
+        if self._sock is None and not self._connect():
+            return False
+        try:
+            self._sock.sendall(encode_message(message))
+            return True
+        except OSError as e:
+            self.last_error = str(e)
+            self.close()
+            return False
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+
+
+class Agent:
+    """수집 스케줄러 + 배치 전송 스레드
+
+    샘플링 루프는 수집 결과를 대기열에 넣기만 하고, 전송 스레드가 배치로 묶어 보냅니다.
+    연결이 끊긴 동안에는 최근 MAX_PENDING_SAMPLES개를 보관했다가 재연결 후 전송합니다.
+    상위 프로세스 목록은 새로 수집한 틱에만 담습니다(나머지는 None).
+    """
+
+    def __init__(self, server: str, name: str = None, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 batch_interval: float = DEFAULT_BATCH_INTERVAL, gpu_backend='auto', token: str = None,
+                 proc_backend='auto'):
+        self.collector = MetricCollector(gpu_backend=gpu_backend, proc_backend=proc_backend)
+        self.name = name or platform.node()
+        self.batch_interval = batch_interval
+        self.intervals = {collector: max(seconds, interval)
+                          for collector, seconds in DEFAULT_COLLECTOR_INTERVALS.items() if seconds is not None}
+        self.collector.system_info = self.collector.get_system_info()
+        self.connection = AgentConnection(server, {
+            'type': 'hello',
+            'version': PROTOCOL_VERSION,
+            'host': self.name,
+            'token': token,
+            'interval': interval,
+            'system_info': self.collector.system_info
+        })
+        self._seq = itertools.count(1)
+        self._pending = deque(maxlen=MAX_PENDING_SAMPLES)  # (seq, 샘플)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._last_processes = None
+        self.sent = 0
+        self.dropped = 0
+
+    def run(self, duration: float = 0):
+        """수집 루프 실행 (duration이 0이면 stop()까지) - 종료 시 남은 샘플 전송"""
+        self._running = True
+        sender = threading.Thread(target=self._send_loop, daemon=True)
+        sender.start()
+
+        scheduler = FixedRateScheduler({**self.intervals, 'send': self.batch_interval})
+
+        def on_tick(due, now, wall_time):
+            collectors = [name for name in due if name != 'send']
+            if collectors:
+                self._enqueue(self.collector.sample(collectors, now, wall_time))
+            if 'send' in due:
+                self._wake.set()
+
+        try:
+            scheduler.run(on_tick, lambda: self._running and (not duration or scheduler.elapsed() < duration))
+        finally:
+            self._running = False
+            self._wake.set()
+            sender.join(SOCKET_TIMEOUT)
+            self.connection.close()
+            self.collector.close()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def _enqueue(self, data: Dict[str, Any]):
+        sample = dict(data)
+        if data['processes'] is self._last_processes:
+            sample['processes'] = None  # 변경 없음 (서버가 마지막 목록 유지)
+        self._last_processes = data['processes']
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append((next(self._seq), sample))
+
+    def _send_loop(self):
+        while self._running or self._pending:
+            self._wake.wait(self.batch_interval)
+            self._wake.clear()
+            while self._pending:
+                with self._lock:
+                    batch = list(itertools.islice(self._pending, MAX_BATCH_SAMPLES))
+                if not self.connection.send({'type': 'batch', 'samples': [sample for _, sample in batch]}):
+                    if not self._running:
+                        return  # 종료 중 연결 실패: 더 기다리지 않음
+                    break
+                # 전송 중 대기열이 가득 차 앞부분이 밀려났을 수 있으므로 seq로 제거
+                last = batch[-1][0]
+                with self._lock:
+                    while self._pending and self._pending[0][0] <= last:
+                        self._pending.popleft()
+                self.sent += len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='System Monitor 수집 에이전트')
+    parser.add_argument('--server', default='tcp://127.0.0.1:5001',
+                        help='집계 서버 주소 (tcp://host:port 또는 unix:///path)')
+    parser.add_argument('--name', help='호스트 이름 (기본값: 이 머신의 호스트 이름)')
+    parser.add_argument('--interval', type=float, default=DEFAULT_SAMPLE_INTERVAL, help='수집기 최소 주기 (초)')
+    parser.add_argument('--batch', type=float, default=DEFAULT_BATCH_INTERVAL, help='배치 전송 주기 (초)')
+    parser.add_argument('--gpu-backend', default='auto', help="'auto', 'nvml', 'gputil', 'fake[:N]', 'none'")
+    parser.add_argument('--proc-backend', default='auto', choices=('auto', 'procfs', 'psutil'),
+                        help='CPU/메모리/디스크/네트워크 수집 경로')
+    parser.add_argument('--token', help='집계 서버의 AGENT_TOKEN과 같은 공유 토큰')
+    parser.add_argument('--duration', type=float, default=0, help='실행 시간 (초, 0 = 무제한)')
+    args = parser.parse_args()
+
+    agent = Agent(args.server, args.name, args.interval, args.batch, args.gpu_backend, args.token,
+                  args.proc_backend)
+    signal.signal(signal.SIGTERM, lambda *_: agent.stop())
+    print(f"에이전트 시작: {agent.name} -> {args.server}")
+    try:
+        agent.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    print(f"에이전트 종료: 전송 {agent.sent}개, 버림 {agent.dropped}개")
+
+
+if __name__ == '__main__':
+    main()
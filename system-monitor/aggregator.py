@@ -0,0 +1,429 @@
+"""
+Fleet Aggregator
+에이전트가 보낸 샘플을 호스트별 히스토리에 모으고 전체(fleet) 집계 히스토리를 만드는 중앙 수집기
+"""
+
+import heapq
+import os
+import re
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from alerts import AlertEngine, ALERT_GROUPS, DEFAULT_RULES
+from monitor import HostHistory, DEVICE_KINDS, MAX_DEVICES
+from wire import PROTOCOL_VERSION, ProtocolError, read_message, parse_address
+
+LOCAL_HOST = 'local'  # main.py가 직접 수집하는 호스트
+FLEET_HOST = 'fleet'  # 전체 호스트 집계
+RESERVED_HOSTS = (LOCAL_HOST, FLEET_HOST)
+
+REMOTE_HISTORY_CAPACITY = 3600  # 원격 호스트 원본 히스토리 (1 Hz 기준 1시간, 이후는 롤업 계층)
+FLEET_INTERVAL = 1.0  # 전체 집계 샘플 주기 (초)
+STALE_AFTER = 30.0  # 이 시간(초) 동안 샘플이 없는 호스트는 전체 집계에서 제외
+FLEET_TOP_PROCESSES = 5
+
+# hello의 system_info는 신뢰할 수 없으므로 히스토리 컬럼 폭과 호스트 수에 상한을 둠
+MAX_HOSTS = 256
+MAX_CPU_THREADS = 1024
+MAX_GPU_DEVICES = 64
+
+STATUS_ORDER = ('normal', 'warning', 'critical')
+_UNSAFE_NAME = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def host_key(name: str) -> str:
+    """호스트 이름 -> 저장소 키 (파일 이름에 안전한 문자만, '.'으로 시작하지 않음 - '.', '..' 제외)"""
+    key = _UNSAFE_NAME.sub('_', str(name))[:64].lstrip('.') or 'unknown'
+    return f'{key}_' if key in RESERVED_HOSTS else key
+
+
+def _bounded(value: Any, limit: int) -> int:
+    """system_info의 개수 필드 -> 0 ~ limit 정수 (잘못된 값은 0)"""
+    try:
+        return min(max(int(value or 0), 0), limit)
+    except (TypeError, ValueError):
+        return 0
+
+
+def sanitize_system_info(system_info: Any) -> Dict[str, Any]:
+    """에이전트 hello의 system_info에서 히스토리 크기를 정하는 필드를 상한 안으로 제한"""
+    info = dict(system_info) if isinstance(system_info, dict) else {}
+    info['cpu_threads'] = _bounded(info.get('cpu_threads'), MAX_CPU_THREADS)
+    info['gpu_count'] = _bounded(info.get('gpu_count'), MAX_GPU_DEVICES)
+    for kind in DEVICE_KINDS:
+        names = info.get(kind)
+        info[kind] = [str(name)[:128] for name in names[:MAX_DEVICES]] if isinstance(names, list) else []
+    return info
+
+
+def _worst(statuses: List[str]) -> str:
+    ranked = [STATUS_ORDER.index(s) for s in statuses if s in STATUS_ORDER]
+    return STATUS_ORDER[max(ranked)] if ranked else 'normal'
+
+
+def combine_samples(samples: Dict[str, Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """호스트별 마지막 샘플 -> 전체 집계 샘플 (collect() 형식)
+
+    CPU 사용률/주파수는 평균, 온도는 최고값, 메모리/디스크/네트워크는 합계(사용률은 합계로 psutil과
+    같은 정의로 계산 - 메모리는 (전체 - 사용 가능) / 전체, 디스크는 사용 / (사용 + 남은 용량)),
+    상태는 가장 나쁜 호스트 상태입니다. GPU, 상위 프로세스와 디스크/마운트/인터페이스별 값은
+    'host: 이름'으로 합칩니다.
+    """
+    def valid(group: str) -> List[Dict[str, Any]]:
+        return [data[group] for data in samples.values() if data.get(group) and 'error' not in data[group]]
+
+    def total(values: List[Dict[str, Any]], field: str) -> float:
+        return sum(v.get(field) or 0 for v in values)
+
+    def devices(group: str, key: str) -> List[Dict[str, Any]]:
+        return [{**item, 'name': f"{host}: {item.get('name', '')}"}
+                for host, sample in samples.items() if sample.get(group) and 'error' not in sample[group]
+                for item in sample[group].get(key) or []]
+
+    data = {
+        'timestamp': datetime.fromtimestamp(wall_time).strftime('%Y-%m-%d %H:%M:%S'),
+        'epoch': wall_time,
+        'hosts': len(samples)
+    }
+
+    cpus = valid('cpu')
+    data['cpu'] = {
+        'percent': sum(c['percent'] for c in cpus) / len(cpus),
+        'per_core': [],
+        'breakdown': {},
+        'frequency': total(cpus, 'frequency') / len(cpus),
+        'temperature': max(c['temperature'] for c in cpus),
+        'status': _worst([c.get('status') for c in cpus])
+    } if cpus else {'error': 'no hosts'}
+
+    memories = valid('memory')
+    data['memory'] = {
+        'percent': (1 - total(memories, 'available') / total(memories, 'total')) * 100
+                   if total(memories, 'total') else 0,
+        'used': total(memories, 'used'),
+        'available': total(memories, 'available'),
+        'total': total(memories, 'total'),
+        'swap_percent': total(memories, 'swap_percent') / len(memories),
+        'swap_used': total(memories, 'swap_used'),
+        'status': _worst([m.get('status') for m in memories])
+    } if memories else {'error': 'no hosts'}
+
+    disks = valid('disk')
+    data['disk'] = {
+        'percent': total(disks, 'used') / (total(disks, 'used') + total(disks, 'free')) * 100
+                   if total(disks, 'used') + total(disks, 'free') else 0,
+        'used': total(disks, 'used'),
+        'free': total(disks, 'free'),
+        'total': total(disks, 'total'),
+        'read_speed': total(disks, 'read_speed'),
+        'write_speed': total(disks, 'write_speed'),
+        'status': _worst([d.get('status') for d in disks]),
+        'devices': devices('disk', 'devices'),
+        'mounts': devices('disk', 'mounts')
+    } if disks else {'error': 'no hosts'}
+
+    networks = valid('network')
+    data['network'] = {
+        field: total(networks, field)
+        for field in ('bytes_sent', 'bytes_recv', 'upload_speed', 'download_speed', 'packets_sent', 'packets_recv')
+    } if networks else {'error': 'no hosts'}
+    if networks:
+        data['network']['status'] = _worst([n.get('status') for n in networks])
+        data['network']['interfaces'] = devices('network', 'interfaces')
+
+    gpus = []
+    processes = []
+    for host, sample in samples.items():
+        for gpu in sample.get('gpu') or []:
+            if 'error' not in gpu:
+                gpus.append({**gpu, 'id': len(gpus), 'name': f"{host}: {gpu.get('name', '')}"})
+        for proc in sample.get('processes') or []:
+            if 'error' not in proc:
+                processes.append({**proc, 'name': f"{host}: {proc.get('name', '')}"})
+    data['gpu'] = gpus
+    data['processes'] = heapq.nlargest(FLEET_TOP_PROCESSES, processes, key=lambda p: p.get('cpu_percent', 0))
+    return data
+
+
+def summarize_sample(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """호스트 목록용 요약 (CPU/메모리/디스크 사용률, GPU 평균 사용률, 상태)"""
+    data = data or {}
+    groups = [data.get(group) or {} for group in ('cpu', 'memory', 'disk', 'network')]
+    gpus = [gpu for gpu in data.get('gpu') or [] if 'error' not in gpu]
+    return {
+        'cpu': groups[0].get('percent'),
+        'memory': groups[1].get('percent'),
+        'disk': groups[2].get('percent'),
+        'gpu': sum(gpu['load'] for gpu in gpus) / len(gpus) if gpus else None,
+        'status': _worst([g.get('status') for g in groups] + [gpu.get('status') for gpu in gpus])
+    }
+
+
+class RemoteHost:
+    """에이전트 호스트 하나 (시스템 정보 + 히스토리 + 알림 규칙 + 마지막 샘플)"""
+
+    def __init__(self, name: str, system_info: Dict[str, Any], history: HostHistory,
+                 alerts: AlertEngine = None):
+        self.name = name
+        self.system_info = dict(system_info or {})
+        self.history = history
+        self.alerts = alerts
+        self.latest: Optional[Dict[str, Any]] = None
+        self.connections = 0
+        self.samples = 0
+        self.first_seen = time.time()
+        self.last_seen = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'host': self.name,
+            'hostname': self.system_info.get('hostname', self.name),
+            'connected': self.connections > 0 or self.name == FLEET_HOST,
+            'samples': self.samples,
+            'last_seen': self.last_seen,
+            **summarize_sample(self.latest)
+        }
+
+
+class Fleet:
+    """원격 호스트 레지스트리와 전체 집계
+
+    에이전트 연결 스레드에서 ingest()가 호출되므로 모든 변경은 lock 안에서 수행합니다.
+    히스토리를 읽는 쪽(대시보드, 리포트, HTTP API)도 reading() 안에서 조회하세요.
+    전체 집계 샘플은 ingest 시점에 FLEET_INTERVAL마다 한 번, 최근 STALE_AFTER초 안에
+    샘플을 보낸 호스트(observe_local로 알린 로컬 호스트 포함)의 마지막 샘플로 만듭니다.
+    에이전트는 수집만 하므로 구성 요소 상태('status')는 호스트마다 alert_rules로 여기서 정합니다.
+    """
+
+    def __init__(self, storage_dir: str = None, history_capacity: int = REMOTE_HISTORY_CAPACITY,
+                 fleet_interval: float = FLEET_INTERVAL, clock=time.time, alert_rules=DEFAULT_RULES):
+        self.storage_dir = storage_dir
+        self.alert_rules = alert_rules
+        self.history_capacity = history_capacity
+        self.fleet_interval = fleet_interval
+        self.clock = clock
+        self.hosts: Dict[str, RemoteHost] = {}
+        self.fleet: Optional[RemoteHost] = None
+        self.lock = threading.RLock()
+        self._local = None  # (이름, 마지막 샘플, 시스템 정보)
+        self._last_combined = 0.0
+
+    def reading(self):
+        """히스토리 조회용 잠금 (with fleet.reading(): ...)"""
+        return self.lock
+
+    def _history(self, key: str, system_info: Dict[str, Any]) -> HostHistory:
+        storage = None
+        if self.storage_dir:
+            root = os.path.realpath(self.storage_dir)
+            storage = os.path.realpath(os.path.join(root, key))
+            if os.path.dirname(storage) != root:
+                raise ProtocolError(f"invalid host key: {key!r}")
+        history = HostHistory(self.history_capacity, storage,
+                              cpu_cores=system_info.get('cpu_threads') or 1,
+                              gpu_devices=system_info.get('gpu_count') or 0,
+                              devices={kind: system_info.get(kind) or [] for kind in DEVICE_KINDS})
+        history.start_monitoring()
+        return history
+
+    def register(self, name: str, system_info: Dict[str, Any]) -> RemoteHost:
+        """에이전트 연결 등록 (재연결이면 기존 히스토리 재사용, 호스트가 MAX_HOSTS개면 ProtocolError)"""
+        key = host_key(name)
+        system_info = sanitize_system_info(system_info)
+        with self.lock:
+            host = self.hosts.get(key)
+            if host is None:
+                if len(self.hosts) >= MAX_HOSTS:
+                    raise ProtocolError(f"too many hosts ({MAX_HOSTS})")
+                host = RemoteHost(key, system_info, self._history(key, system_info), AlertEngine(self.alert_rules))
+                self.hosts[key] = host
+            else:
+                host.system_info = system_info
+            host.connections += 1
+            return host
+
+    def disconnect(self, key: str):
+        with self.lock:
+            host = self.hosts.get(key)
+            if host is not None:
+                host.connections = max(0, host.connections - 1)
+
+    def ingest(self, key: str, samples: List[Dict[str, Any]]):
+        """에이전트 배치 저장 (processes가 None인 샘플은 마지막 목록 유지, 상태는 알림 규칙으로 기록)"""
+        with self.lock:
+            host = self.hosts[key]
+            for sample in samples:
+                if sample.get('processes') is None:
+                    sample['processes'] = (host.latest or {}).get('processes') or []
+                epoch = sample['epoch']
+                for group in ALERT_GROUPS:
+                    host.alerts.observe(group, sample.get(group), epoch, epoch)
+                host.alerts.annotate(sample)
+                host.history.ingest(sample)
+                host.latest = sample
+                host.samples += 1
+            host.last_seen = self.clock()
+
+            now = self.clock()
+            if now - self._last_combined >= self.fleet_interval:
+                self._last_combined = now
+                self._combine(now)
+
+    def observe_local(self, name: str, data: Dict[str, Any], system_info: Dict[str, Any] = None):
+        """로컬 호스트의 마지막 샘플 알림 (전체 집계와 호스트 목록에 포함, 참조만 보관)"""
+        self._local = (name, data, system_info or {})
+
+    def _combine(self, now: float):
+        samples = {host.name: host.latest for host in self.hosts.values()
+                   if host.latest is not None and now - host.last_seen < STALE_AFTER}
+        local = self._local
+        if local is not None and now - local[1]['epoch'] < STALE_AFTER:
+            samples[local[0]] = local[1]
+        if not samples:
+            return
+        data = combine_samples(samples, now)
+        if self.fleet is None:
+            self.fleet = RemoteHost(FLEET_HOST, {}, self._history(FLEET_HOST, {}))
+        self.fleet.history.ingest(data)
+        self.fleet.latest = data
+        self.fleet.samples += 1
+        self.fleet.last_seen = now
+        self.fleet.system_info = self.fleet_system_info()
+
+    def fleet_system_info(self) -> Dict[str, Any]:
+        """전체 집계용 시스템 정보 (리포트 표지)"""
+        infos = [host.system_info for host in self.hosts.values()]
+        if self._local is not None:
+            infos.append(self._local[2])
+
+        def memory_gb(info):
+            try:
+                return float(str(info.get('total_memory', '0')).split()[0])
+            except ValueError:
+                return 0.0
+
+        return {
+            'hostname': f'{FLEET_HOST} ({len(infos)} hosts)',
+            'os': ', '.join(sorted({info.get('os', '') for info in infos if info.get('os')})),
+            'processor': ', '.join(sorted({info.get('processor', '') for info in infos if info.get('processor')})),
+            'cpu_count': sum(info.get('cpu_count') or 0 for info in infos),
+            'cpu_threads': sum(info.get('cpu_threads') or 0 for info in infos),
+            'cpu_freq_max': 'N/A',
+            'total_memory': f"{sum(memory_gb(info) for info in infos):.2f} GB",
+            'gpu_count': sum(info.get('gpu_count') or 0 for info in infos),
+            'gpu_backend': FLEET_HOST,
+            'proc_backend': FLEET_HOST
+        }
+
+    def get(self, key: str) -> Optional[RemoteHost]:
+        """원격 호스트 또는 전체 집계 (없으면 None)"""
+        with self.lock:
+            if key == FLEET_HOST:
+                return self.fleet
+            return self.hosts.get(key)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """호스트별 요약 (로컬 호스트, 전체 집계, 원격 호스트 순)"""
+        hosts = []
+        local = self._local
+        if local is not None:
+            name, data, system_info = local
+            hosts.append({'host': name, 'hostname': system_info.get('hostname', name), 'connected': True,
+                          'samples': None, 'last_seen': data['epoch'], **summarize_sample(data)})
+        with self.lock:
+            if self.fleet is not None:
+                hosts.append(self.fleet.summary())
+            hosts.extend(host.summary() for host in self.hosts.values())
+        return hosts
+
+    def close(self):
+        with self.lock:
+            for host in list(self.hosts.values()) + ([self.fleet] if self.fleet else []):
+                host.history.close()
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.agent_server.serve_connection(self.rfile, self.client_address)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _TCP6Server(_TCPServer):
+    address_family = socket.AF_INET6
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class AgentServer:
+    """에이전트 연결 수신 서버 (연결마다 스레드 하나)
+
+    첫 메시지는 hello {'version', 'host', 'token', 'system_info'}이고 이후는
+    batch {'samples': [collect() 결과, ...]}입니다. 응답은 보내지 않습니다.
+    """
+
+    def __init__(self, fleet: Fleet, address: str = 'tcp://127.0.0.1:5001', token: str = None):
+        self.fleet = fleet
+        self.address = address
+        self.token = token
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(address):
+                os.remove(address)  # 이전 실행이 남긴 소켓 파일
+            server_class = _UnixServer
+        else:
+            server_class = _TCP6Server if family == socket.AF_INET6 else _TCPServer
+        self._server = server_class(address, _AgentHandler)
+        self._server.agent_server = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_connection(self, stream, client_address):
+        """에이전트 연결 하나 처리 (연결이 끊길 때까지)"""
+        key = None
+        try:
+            hello = read_message(stream)
+            if hello is None:
+                return
+            if hello.get('type') != 'hello' or hello.get('version') != PROTOCOL_VERSION:
+                raise ProtocolError(f"expected hello version {PROTOCOL_VERSION}")
+            if self.token is not None and hello.get('token') != self.token:
+                raise ProtocolError("invalid token")
+            key = self.fleet.register(hello.get('host') or str(client_address), hello.get('system_info')).name
+            print(f"에이전트 연결됨: {key}")
+
+            while True:
+                message = read_message(stream)
+                if message is None:
+                    break
+                if message['type'] == 'batch':
+                    self.fleet.ingest(key, message.get('samples') or [])
+        except (ProtocolError, OSError) as e:
+            print(f"에이전트 연결 오류 ({key or client_address}): {e}")
+        except Exception:
+            traceback.print_exc()
+        finally:
+            if key is not None:
+                self.fleet.disconnect(key)
+                print(f"에이전트 연결 해제됨: {key}")
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self._server, _UnixServer) and os.path.exists(self._server.server_address):
+                os.remove(self._server.server_address)
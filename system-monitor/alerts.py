@@ -0,0 +1,413 @@
+"""
+Alert Engine
+규칙 기반 알림 엔진 - 새 샘플마다 규칙별 O(1)로 평가하고 상태 전이를 싱크(Socket.IO, 웹훅, 파일)로 전송
+
+규칙은 수집 결과의 경로(예: 'cpu.percent', 'disk.devices.util', 'gpu.temperature')에 대한
+경고/위험 임계값이며, 지속 시간('for'), 히스테리시스, 변화량('rate') 조건과 장치 필터를 지원합니다.
+장치 목록 경로는 장치마다 별도 상태를 가지며, 구성 요소 상태(cpu/memory/disk/network/gpu의 'status')는
+그 구성 요소 규칙 중 가장 높은 수준입니다.
+"""
+
+import json
+import math
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+
+LEVELS = ('normal', 'warning', 'critical')
+ALERT_GROUPS = ('cpu', 'memory', 'disk', 'network', 'gpu')  # 규칙을 걸 수 있는 수집 결과 그룹
+OPERATORS = {'>': 1, '<': -1}  # 비교 방향 (내부에서는 부호를 곱해 항상 '>'로 비교)
+
+ALERT_HISTORY = 200  # 보관하는 최근 상태 전이 수
+RATE_RESOLUTION = 60  # 변화량 규칙이 구간마다 보관하는 최대 샘플 수 (메모리 일정)
+WEBHOOK_QUEUE_SIZE = 100  # 웹훅 전송 대기열 크기 (넘치면 버림)
+WEBHOOK_TIMEOUT = 5.0  # 웹훅 요청 제한 시간 (초)
+
+# 기본 규칙 - 사용률은 이전 고정 임계값(60/80 %)을 유지하되 짧은 스파이크로 상태가 바뀌지 않도록
+# 지속 시간과 히스테리시스를 둠
+DEFAULT_RULES = (
+    {'name': 'cpu_usage', 'metric': 'cpu.percent', 'warning': 60, 'critical': 80, 'for': 5, 'hysteresis': 5,
+     'label': 'CPU 사용률'},
+    {'name': 'cpu_temperature', 'metric': 'cpu.temperature', 'warning': 80, 'critical': 90, 'for': 10,
+     'hysteresis': 3, 'label': 'CPU 온도'},
+    {'name': 'memory_usage', 'metric': 'memory.percent', 'warning': 60, 'critical': 80, 'for': 5, 'hysteresis': 2,
+     'label': '메모리 사용률'},
+    {'name': 'memory_growth', 'metric': 'memory.percent', 'rate': 300, 'warning': 10, 'critical': 20,
+     'label': '메모리 사용률 5분 증가량'},
+    {'name': 'disk_usage', 'metric': 'disk.percent', 'warning': 60, 'critical': 80, 'hysteresis': 1,
+     'label': '디스크 사용률'},
+    {'name': 'mount_usage', 'metric': 'disk.mounts.percent', 'warning': 80, 'critical': 90, 'hysteresis': 1,
+     'label': '마운트 사용률'},
+    {'name': 'disk_util', 'metric': 'disk.devices.util', 'warning': 80, 'critical': 95, 'for': 30, 'hysteresis': 10,
+     'label': '디스크 사용률(I/O)'},
+    {'name': 'interface_errors', 'metric': 'network.interfaces.errors', 'warning': 1, 'critical': 10, 'for': 10,
+     'label': '인터페이스 오류/s'},
+    {'name': 'interface_drops', 'metric': 'network.interfaces.drops', 'warning': 10, 'critical': 100, 'for': 10,
+     'label': '인터페이스 드롭/s'},
+    {'name': 'gpu_load', 'metric': 'gpu.load', 'warning': 60, 'critical': 80, 'for': 5, 'hysteresis': 5,
+     'label': 'GPU 사용률'},
+    {'name': 'gpu_temperature', 'metric': 'gpu.temperature', 'warning': 80, 'critical': 90, 'for': 10,
+     'hysteresis': 3, 'label': 'GPU 온도'},
+)
+
+
+class AlertRule:
+    """메트릭 경로 하나에 대한 경고/위험 임계값 규칙
+
+    metric: 'group.field' (스칼라), 'group.list.field' (장치별, 예: 'disk.mounts.percent'),
+            'gpu.field' (GPU별)
+    op: '>' (기본값) 또는 '<', for: 조건이 이 시간(초) 이상 계속되어야 수준을 올림,
+    hysteresis: 수준을 내리려면 값이 (임계값 - 폭) 아래로 내려가야 함 ('<'이면 반대),
+    rate: 지정하면 값 대신 최근 rate초 동안의 변화량을 비교, devices: 평가할 장치 이름 목록 (기본값: 전체)
+    """
+
+    __slots__ = ('name', 'metric', 'label', 'group', 'items', 'field', 'op', 'warning', 'critical',
+                 'duration', 'hysteresis', 'rate', 'devices', '_sign', '_bounds', '_floor')
+
+    def __init__(self, name: str, metric: str, warning: float = None, critical: float = None, op: str = '>',
+                 duration: float = 0.0, hysteresis: float = 0.0, rate: float = None,
+                 devices: Iterable[str] = None, label: str = None):
+        parts = metric.split('.')
+        if parts[0] not in ALERT_GROUPS:
+            raise ValueError(f"{name}: unknown metric group '{parts[0]}' (expected one of {', '.join(ALERT_GROUPS)})")
+        if parts[0] == 'gpu':
+            if len(parts) != 2:
+                raise ValueError(f"{name}: GPU metric must be 'gpu.<field>'")
+            items, field = '', parts[1]  # GPU 그룹은 그 자체가 장치 목록
+        elif len(parts) == 2:
+            items, field = None, parts[1]
+        elif len(parts) == 3:
+            items, field = parts[1], parts[2]
+        else:
+            raise ValueError(f"{name}: metric must be 'group.field' or 'group.list.field'")
+        if op not in OPERATORS:
+            raise ValueError(f"{name}: op must be '>' or '<'")
+        if warning is None and critical is None:
+            raise ValueError(f"{name}: warning or critical threshold is required")
+        if duration < 0 or hysteresis < 0 or (rate is not None and rate <= 0):
+            raise ValueError(f"{name}: for/hysteresis must be >= 0 and rate > 0")
+
+        self.name = name
+        self.metric = metric
+        self.label = label or metric
+        self.group = parts[0]
+        self.items = items
+        self.field = field
+        self.op = op
+        self.warning = warning
+        self.critical = critical
+        self.duration = float(duration)
+        self.hysteresis = float(hysteresis)
+        self.rate = float(rate) if rate is not None else None
+        self.devices = frozenset(devices) if devices else None
+        self._sign = OPERATORS[op]
+        # (수준, 부호를 곱한 임계값) - 수준 오름차순
+        self._bounds = [(level, threshold * self._sign)
+                        for level, threshold in ((1, warning), (2, critical)) if threshold is not None]
+        if len(self._bounds) == 2 and self._bounds[0][1] > self._bounds[1][1]:
+            raise ValueError(f"{name}: critical threshold must be beyond warning threshold for op '{op}'")
+        self._floor = self._bounds[0][1]  # 가장 낮은 수준의 임계값 (정상 상태의 빠른 비교용)
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'AlertRule':
+        """설정 dict (JSON 규칙 파일의 항목)에서 생성 - 'for'는 duration으로, 'device'는 devices로 받음"""
+        options = dict(config)
+        if 'name' not in options or 'metric' not in options:
+            raise ValueError(f"alert rule needs 'name' and 'metric': {config}")
+        if 'for' in options:
+            options['duration'] = options.pop('for')
+        if 'device' in options:
+            options['devices'] = [options.pop('device')]
+        try:
+            return cls(**options)
+        except TypeError as e:
+            raise ValueError(f"{options['name']}: {e}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'metric': self.metric, 'label': self.label, 'op': self.op,
+                'warning': self.warning, 'critical': self.critical, 'for': self.duration,
+                'hysteresis': self.hysteresis, 'rate': self.rate,
+                'devices': sorted(self.devices) if self.devices else None}
+
+    def threshold(self, level: int) -> Optional[float]:
+        return (self.warning, self.critical)[level - 1] if level else None
+
+    def advance(self, state: 'AlertState', value: float, now: float) -> Optional[int]:
+        """값 하나를 반영하고 바뀐 수준 반환 (바뀌지 않았으면 None) - 수준 2개, 상수 시간"""
+        x = value * self._sign
+        raw = 0
+        for level, bound in self._bounds:
+            if x > bound:
+                raw = level
+
+        # 조건이 처음 성립한 시각부터 duration이 지난 가장 높은 수준
+        promoted = 0
+        for level, _ in self._bounds:
+            if raw >= level:
+                if state.since[level] is None:
+                    state.since[level] = now
+                if now - state.since[level] >= self.duration:
+                    promoted = level
+            else:
+                state.since[level] = None
+        if promoted > state.level:
+            return promoted
+
+        if raw < state.level:
+            # 히스테리시스 폭 안에 있는 가장 높은 수준까지만 내려감
+            target = raw
+            for level, bound in self._bounds:
+                if raw < level <= state.level and x > bound - self.hysteresis:
+                    target = level
+            if target != state.level:
+                return target
+        return None
+
+
+class AlertState:
+    """규칙 하나 x 장치 하나의 평가 상태"""
+
+    __slots__ = ('level', 'quiet', 'since', 'value', 'changed', 'samples')
+
+    def __init__(self):
+        self.level = 0
+        self.quiet = True  # 정상 수준이고 지속 시간을 세는 조건도 없음
+        self.since = [None, None, None]  # 수준별 조건 성립 시작 시각 (단조 시계)
+        self.value = None
+        self.changed = None  # 마지막 전이 epoch 시각
+        self.samples = None  # 변화량 규칙의 (시각, 값) 목록
+
+    def change(self, value: float, now: float, window: float) -> Optional[float]:
+        """최근 window초 동안의 변화량 (아직 window만큼 쌓이지 않았으면 None)
+
+        window / RATE_RESOLUTION 간격으로만 샘플을 보관하므로 메모리와 시간이 샘플링 주기와 무관합니다.
+        """
+        samples = self.samples
+        if samples is None:
+            samples = self.samples = deque()
+        if not samples or now - samples[-1][0] >= window / RATE_RESOLUTION:
+            samples.append((now, value))
+        while len(samples) > 1 and samples[1][0] <= now - window:
+            samples.popleft()
+        started, previous = samples[0]
+        if now - started < window:
+            return None
+        return value - previous
+
+
+class AlertEngine:
+    """규칙 목록을 그룹별로 색인해 수집 결과마다 해당 그룹의 규칙만 평가하는 엔진
+
+    observe()는 수집기 결과 하나를 받아 규칙(장치별 규칙은 장치마다)을 O(1)로 평가하고,
+    수준이 바뀌면 전이 dict를 싱크(callable)에 전달합니다. 활성 알림(경고 이상)만 따로
+    보관하므로 구성 요소 상태 조회는 활성 알림 수에만 비례합니다.
+    """
+
+    def __init__(self, rules: Iterable[Any] = DEFAULT_RULES, sinks: Iterable[Callable] = (),
+                 history: int = ALERT_HISTORY):
+        self.rules: List[AlertRule] = [rule if isinstance(rule, AlertRule) else AlertRule.from_dict(rule)
+                                       for rule in rules]
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"duplicate alert rule names: {', '.join(duplicates)}")
+        # 그룹 -> 규칙 목록 (수집 결과에 필드가 있는 규칙만 평가)
+        self._rules: Dict[str, List[AlertRule]] = {group: [] for group in ALERT_GROUPS}
+        for rule in self.rules:
+            self._rules[rule.group].append(rule)
+        self._states: Dict[Tuple[str, Optional[str]], AlertState] = {}
+        self.sinks: List[Callable[[Dict[str, Any]], None]] = list(sinks)
+        self.active: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}  # (규칙, 장치) -> 마지막 전이
+        self.recent = deque(maxlen=history)
+        self.transitions = 0
+
+    def add_sink(self, sink: Callable[[Dict[str, Any]], None]):
+        """상태 전이를 받을 callable 추가 (수집 루프에서 호출되므로 오래 막으면 안 됨)"""
+        self.sinks.append(sink)
+
+    def observe(self, group: str, result: Any, now: float = None, wall_time: float = None) -> List[Dict[str, Any]]:
+        """그룹의 수집 결과 하나로 규칙 평가 - 이번에 일어난 상태 전이 목록 반환
+
+        result: collect() 형식의 그룹 값 (GPU는 dict 목록), now: 단조 시계 시각 (지속 시간/변화량용)
+        """
+        rules = self._rules.get(group)
+        if not rules or not result or (isinstance(result, dict) and 'error' in result):
+            return []
+        if now is None:
+            now = time.monotonic()
+        transitions = []
+        for rule in rules:
+            if rule.items is None:
+                value = result.get(rule.field)
+                if value is not None:
+                    self._evaluate(rule, None, value, now, wall_time, transitions)
+                continue
+            items = result if rule.items == '' else result.get(rule.items)
+            for item in items or ():
+                if 'error' in item:
+                    continue
+                device = str(item['id']) if rule.items == '' else item.get('name')
+                value = item.get(rule.field)
+                if value is not None and (rule.devices is None or device in rule.devices):
+                    self._evaluate(rule, device, value, now, wall_time, transitions)
+        return transitions
+
+    def _evaluate(self, rule: AlertRule, device: Optional[str], value: float, now: float,
+                  wall_time: Optional[float], transitions: List[Dict[str, Any]]):
+        if not isinstance(value, (int, float)) or math.isnan(value):
+            return
+        key = (rule.name, device)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = AlertState()
+        if rule.rate is not None:
+            value = state.change(value, now, rule.rate)
+            if value is None:
+                return
+        state.value = value
+        # 대부분의 샘플은 정상 상태에서 가장 낮은 임계값 비교 한 번으로 끝남
+        if state.quiet and value * rule._sign <= rule._floor:
+            return
+        level = rule.advance(state, value, now)
+        if level is not None:
+            self._transit(rule, device, key, state, level, value, wall_time, transitions)
+        state.quiet = state.level == 0 and state.since[1] is None and state.since[2] is None
+
+    def _transit(self, rule: AlertRule, device: Optional[str], key: Tuple[str, Optional[str]], state: AlertState,
+                 level: int, value: float, wall_time: Optional[float], transitions: List[Dict[str, Any]]):
+        previous, state.level = state.level, level
+        state.changed = time.time() if wall_time is None else wall_time
+        transition = self._transition(rule, device, previous, level, value, state.changed)
+        if level:
+            self.active[key] = transition
+        else:
+            self.active.pop(key, None)
+        self.recent.append(transition)
+        self.transitions += 1
+        transitions.append(transition)
+        for sink in self.sinks:
+            try:
+                sink(transition)
+            except Exception as e:
+                print(f"알림 전송 실패 ({getattr(sink, '__name__', type(sink).__name__)}): {e}")
+
+    @staticmethod
+    def _transition(rule: AlertRule, device: Optional[str], previous: int, level: int, value: float,
+                    epoch: float) -> Dict[str, Any]:
+        subject = f"{rule.label} [{device}]" if device is not None else rule.label
+        if level:
+            message = f"{subject} {value:.2f} {rule.op} {rule.threshold(level):g}"
+            if rule.duration:
+                message += f" ({rule.duration:g}초 지속)"
+        else:
+            message = f"{subject} 정상 복귀 ({value:.2f})"
+        return {
+            'rule': rule.name,
+            'metric': rule.metric,
+            'group': rule.group,
+            'device': device,
+            'level': LEVELS[level],
+            'previous': LEVELS[previous],
+            'value': value,
+            'threshold': rule.threshold(level or previous),
+            'epoch': epoch,
+            'timestamp': datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S'),
+            'message': message
+        }
+
+    def status(self, group: str, device: str = None) -> str:
+        """구성 요소(와 장치)의 상태 - 해당 규칙의 활성 알림 중 가장 높은 수준"""
+        level = 0
+        for (_, active_device), transition in self.active.items():
+            if transition['group'] == group and (device is None or active_device == device):
+                level = max(level, LEVELS.index(transition['level']))
+        return LEVELS[level]
+
+    def annotate(self, data: Dict[str, Any]):
+        """collect() 결과에 구성 요소 상태('status') 기록 (GPU는 GPU별)"""
+        for group in ('cpu', 'memory', 'disk', 'network'):
+            if 'error' not in data[group]:
+                data[group]['status'] = self.status(group)
+        for gpu in data['gpu']:
+            if 'error' not in gpu:
+                gpu['status'] = self.status('gpu', str(gpu['id']))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """규칙, 활성 알림, 최근 상태 전이 (/api/alerts 응답)"""
+        return {
+            'rules': [rule.to_dict() for rule in self.rules],
+            'active': self.active_alerts(),
+            'recent': list(self.recent),
+            'transitions': self.transitions
+        }
+
+    def active_alerts(self) -> List[Dict[str, Any]]:
+        """활성 알림 (위험 먼저, 같은 수준은 최근 전이 먼저)"""
+        return sorted(self.active.values(), key=lambda t: (-LEVELS.index(t['level']), -t['epoch']))
+
+
+def load_rules(path: str) -> List[AlertRule]:
+    """JSON 규칙 파일 읽기 - 규칙 목록 또는 {"rules": [...], "defaults": true}
+
+    defaults가 true면 DEFAULT_RULES에 더하며, 같은 이름의 규칙은 파일의 규칙으로 바꿉니다.
+    """
+    with open(path) as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        config = {'rules': config}
+    if not isinstance(config, dict) or not isinstance(config.get('rules'), list):
+        raise ValueError(f"{path}: expected a list of rules or {{\"rules\": [...]}}")
+    rules = [AlertRule.from_dict(rule) for rule in config['rules']]
+    if config.get('defaults'):
+        names = {rule.name for rule in rules}
+        rules = [AlertRule.from_dict(rule) for rule in DEFAULT_RULES if rule['name'] not in names] + rules
+    return rules
+
+
+class FileSink:
+    """상태 전이를 JSON Lines 파일에 한 줄씩 추가하는 싱크"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, transition: Dict[str, Any]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(transition, ensure_ascii=False) + '\n')
+
+
+class WebhookSink:
+    """상태 전이를 URL로 POST(JSON)하는 싱크 - 전송은 별도 스레드에서 하므로 수집 루프를 막지 않음
+
+    대기열이 가득 차면(엔드포인트가 느리거나 죽었으면) 새 전이는 버리고 dropped를 셉니다.
+    """
+
+    def __init__(self, url: str, timeout: float = WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.dropped = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name='alert-webhook', daemon=True)
+        self._thread.start()
+
+    def __call__(self, transition: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(transition)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        import urllib.request  # 웹훅을 쓸 때만 불러옴 (시작 시간)
+        while True:
+            transition = self._queue.get()
+            request = urllib.request.Request(self.url, data=json.dumps(transition).encode('utf-8'),
+                                             headers={'Content-Type': 'application/json'}, method='POST')
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout):
+                    pass
+            except OSError as e:
+                self.failed += 1
+                print(f"알림 웹훅 전송 실패 ({self.url}): {e}")
@@ -0,0 +1,269 @@
+"""
+Anomaly Detection
+메트릭 스트림의 이상치 / 변화점 검출 - 히스토리의 모든 컬럼을 벡터 하나로 묶어 샘플마다 한 번에 갱신
+
+시리즈마다 EWMA 평균/분산 기준선을 두고 z 점수가 ANOMALY_Z를 넘으면 이상치(짧은 스파이크),
+양/음 방향 CUSUM 누적합(z x 초)이 CUSUM_THRESHOLD를 넘으면 변화점(수준 변화, 천천히 새는 메모리처럼
+기준선이 따라가지 못하는 추세)으로 판정합니다. 상태는 시리즈 수 길이의 NumPy 배열뿐이므로 샘플 하나의 비용은 시리즈 수에만 비례하고
+히스토리 길이와는 무관합니다.
+"""
+
+import math
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Sequence
+import numpy as np
+
+ANOMALY_HALF_LIFE = 300.0  # 기준선 EWMA 반감기 (초)
+ANOMALY_Z = 6.0  # 이상치 판정 |z| (CUSUM에 더하는 z도 이 값으로 자름)
+ANOMALY_CLEAR_Z = 3.0  # 이상치 해제 |z| (경계에서 반복 검출 방지)
+CUSUM_DRIFT = 0.5  # CUSUM 허용 편차 k (z 단위)
+CUSUM_THRESHOLD = 60.0  # CUSUM 판정 임계값 h (z x 초 - 예: z 3이 24초, z 1이 2분 계속되면 변화점)
+CUSUM_MAX_STEP = 5.0  # 샘플 하나가 CUSUM에 더하는 최대 경과 시간 (초, 수집이 멈췄다 재개된 경우)
+WARMUP_SAMPLES = 30  # 판정 전에 기준선을 만드는 시리즈별 샘플 수
+EVENT_COOLDOWN = 30.0  # 같은 시리즈의 이상치 이벤트 최소 간격 (초)
+TREND_WINDOW = 1800.0  # 같은 방향 변화점이 이 시간(초) 안에 이어지면 한 추세로 보고 첫 변화점만 보고
+ANOMALY_HISTORY = 500  # 보관하는 최근 이벤트 수
+RELATIVE_FLOOR = 0.001  # 표준편차 하한의 평균 대비 비율 (거의 일정한 시리즈의 과민 반응 방지)
+DEFAULT_NOISE_FLOOR = 0.01  # 표준편차 하한 (NOISE_FLOORS에 없는 컬럼)
+
+# 컬럼별 표준편차 하한 (단위별 의미 없는 변화 크기)
+NOISE_FLOORS = {
+    'cpu_percent': 1.0, 'cpu_per_core': 1.0, 'cpu_temp': 2.0,
+    'memory_percent': 0.2, 'memory_used': 0.02,
+    'disk_percent': 0.1, 'disk_read': 0.1, 'disk_write': 0.1,
+    'network_sent': 0.05, 'network_recv': 0.05,
+    'gpu_usage': 1.0, 'gpu_temp': 2.0, 'gpu_per_device': 1.0, 'gpu_temp_per_device': 2.0,
+    'disk_read_per_device': 0.1, 'disk_write_per_device': 0.1, 'disk_iops_per_device': 5.0,
+    'disk_await_per_device': 0.5, 'disk_queue_per_device': 0.1, 'disk_util_per_device': 1.0,
+    'mount_percent_per_device': 0.1,
+    'net_recv_per_device': 0.05, 'net_sent_per_device': 0.05, 'net_packets_per_device': 10.0,
+    'net_errors_per_device': 1.0, 'net_drops_per_device': 1.0
+}
+
+# 컬럼 -> 이벤트 메시지의 이름
+SERIES_LABELS = {
+    'cpu_percent': 'CPU 사용률', 'cpu_per_core': '코어 사용률', 'cpu_temp': 'CPU 온도',
+    'memory_percent': '메모리 사용률', 'memory_used': '메모리 사용량',
+    'disk_percent': '디스크 사용률', 'disk_read': '디스크 읽기', 'disk_write': '디스크 쓰기',
+    'network_sent': '업로드', 'network_recv': '다운로드',
+    'gpu_usage': 'GPU 사용률', 'gpu_temp': 'GPU 온도', 'gpu_per_device': 'GPU 사용률',
+    'gpu_temp_per_device': 'GPU 온도',
+    'disk_read_per_device': '디스크 읽기', 'disk_write_per_device': '디스크 쓰기',
+    'disk_iops_per_device': '디스크 IOPS', 'disk_await_per_device': '디스크 대기 시간',
+    'disk_queue_per_device': '디스크 큐 깊이', 'disk_util_per_device': '디스크 사용률(I/O)',
+    'mount_percent_per_device': '마운트 사용률',
+    'net_recv_per_device': '다운로드', 'net_sent_per_device': '업로드', 'net_packets_per_device': '패킷',
+    'net_errors_per_device': '인터페이스 오류', 'net_drops_per_device': '인터페이스 드롭'
+}
+
+# 컬럼 이름 접두어 -> 대시보드 메트릭 그룹 (이벤트 전송 room)
+SERIES_GROUPS = (('cpu', 'cpu'), ('memory', 'memory'), ('disk', 'disk'), ('mount', 'disk'),
+                 ('network', 'network'), ('net_', 'network'), ('gpu', 'gpu'))
+
+KINDS = ('anomaly', 'change')
+
+
+def series_group(column: str) -> Optional[str]:
+    """컬럼이 속한 메트릭 그룹"""
+    for prefix, group in SERIES_GROUPS:
+        if column.startswith(prefix):
+            return group
+    return None
+
+
+class AnomalyDetector:
+    """히스토리 컬럼 전체에 대한 스트리밍 이상치 / 변화점 검출기
+
+    update()는 HistoryStore.append()와 같은 (epoch ms, 컬럼 -> 값) 샘플을 받아 모든 시리즈를
+    벡터 연산 한 번으로 갱신하고, 새로 검출한 이벤트 dict 목록을 반환하며 싱크(callable)에 전달합니다.
+    값이 이전 샘플과 같은 시리즈는 갱신하지 않으므로(다른 수집기의 틱에 함께 저장된 이전 값),
+    기준선과 CUSUM은 각 시리즈의 실제 수집 주기로 움직입니다.
+    """
+
+    def __init__(self, widths: Dict[str, int], devices: Dict[str, Sequence[str]] = None,
+                 half_life: float = ANOMALY_HALF_LIFE, history: int = ANOMALY_HISTORY,
+                 sinks: Sequence[Callable] = ()):
+        """widths: 컬럼 이름 -> 폭 (HistoryStore.widths와 같은 형식)
+        devices: 장치별 컬럼 -> 행 순서의 장치 이름 (없는 컬럼은 행 번호)
+        """
+        devices = devices or {}
+        self.half_life = half_life
+        # (컬럼, 시작, 끝) - 평탄한 벡터에서 컬럼이 차지하는 구간
+        self._layout = []
+        self._columns: List[str] = []  # 시리즈 -> 컬럼
+        self._devices: List[Optional[str]] = []  # 시리즈 -> 장치 (스칼라 컬럼은 None)
+        floors = []
+        for name, width in widths.items():
+            start = len(self._columns)
+            names = list(devices.get(name) or [])
+            for index in range(width or 1):
+                self._columns.append(name)
+                self._devices.append(None if not width else names[index] if index < len(names) else str(index))
+                floors.append(NOISE_FLOORS.get(name, DEFAULT_NOISE_FLOOR))
+            self._layout.append((name, start, len(self._columns), bool(width)))
+
+        n = len(self._columns)
+        self._floor = np.array(floors, dtype=np.float64)
+        self._x = np.full(n, np.nan)
+        self._last = np.full(n, np.nan)  # 마지막으로 갱신에 쓴 값
+        self._time = np.full(n, -np.inf)  # 마지막 갱신 시각 (epoch 초)
+        self._count = np.zeros(n, dtype=np.int64)
+        self._mean = np.full(n, np.nan)
+        self._var = np.zeros(n)  # 기준선 대비 EWMA 분산
+        self._pos = np.zeros(n)  # 위쪽 CUSUM
+        self._neg = np.zeros(n)  # 아래쪽 CUSUM
+        self._active = np.zeros(n, dtype=bool)  # 이상치 구간 안
+        self._fired = np.full(n, -np.inf)  # 마지막 이상치 이벤트 시각
+        self._trend = np.zeros(n)  # 마지막 변화점 방향 (+1 / -1)
+        self._changed = np.full(n, -np.inf)  # 마지막 변화점 시각 (보고하지 않은 것 포함)
+
+        self.sinks: List[Callable[[Dict[str, Any]], None]] = list(sinks)
+        self.recent = deque(maxlen=history)
+        self.detected = 0
+        self.elapsed = 0.0  # 마지막 update() 소요 시간 (초, 자체 계측용)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def add_sink(self, sink: Callable[[Dict[str, Any]], None]):
+        """이벤트를 받을 callable 추가 (수집 루프에서 호출되므로 오래 막으면 안 됨)"""
+        self.sinks.append(sink)
+
+    def update(self, timestamp_ms: int, values: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """샘플 하나로 모든 시리즈의 기준선 / CUSUM 갱신 (O(시리즈 수)) 후 새 이벤트 반환"""
+        started = time.perf_counter()
+        x = self._x
+        for name, start, end, per_device in self._layout:
+            value = values.get(name)
+            if value is None:
+                x[start:end] = np.nan
+            elif per_device:
+                count = min(end - start, len(value))
+                x[start:start + count] = value[:count]
+                x[start + count:end] = np.nan
+            else:
+                x[start] = value
+
+        now = timestamp_ms / 1000.0
+        with np.errstate(invalid='ignore', over='ignore'):
+            fresh = np.isfinite(x) & (x != self._last)
+            if not fresh.any():
+                self.elapsed = time.perf_counter() - started
+                return []
+            self._last[fresh] = x[fresh]
+            count = self._count
+            mean = self._mean
+
+            # 표준편차 + 하한 (평균 대비 비율과 컬럼별 절대값)
+            scale = np.sqrt(self._var) + self._floor + RELATIVE_FLOOR * np.abs(mean)
+            z = (x - mean) / scale
+            ready = fresh & (count >= WARMUP_SAMPLES)
+
+            # 이상치: |z|가 ANOMALY_Z를 넘는 순간만 이벤트, ANOMALY_CLEAR_Z 아래로 내려오면 해제
+            absz = np.abs(z)
+            spikes = ready & ~self._active & (absz > ANOMALY_Z)
+            self._active = (self._active | spikes) & ~(fresh & (absz < ANOMALY_CLEAR_Z))
+
+            # CUSUM: 자른 z에서 허용 편차를 뺀 값을 경과 시간(초)만큼 누적 - 수집 주기와 무관하게 같은 크기의
+            # 편차는 같은 시간 뒤에 판정하며, 한 번의 스파이크만으로는 넘지 않음
+            elapsed = np.minimum(now - self._time, CUSUM_MAX_STEP)
+            clipped = np.clip(z, -ANOMALY_Z, ANOMALY_Z)
+            self._pos = np.where(ready, np.maximum(0.0, self._pos + (clipped - CUSUM_DRIFT) * elapsed), self._pos)
+            self._neg = np.where(ready, np.maximum(0.0, self._neg - (clipped + CUSUM_DRIFT) * elapsed), self._neg)
+            changes = (self._pos > CUSUM_THRESHOLD) | (self._neg > CUSUM_THRESHOLD)
+
+            # 기준선 갱신 - 시간 기반 EWMA, 처음에는 누적 평균 (짧은 이력에서 분산을 낮게 잡지 않도록)
+            alpha = -np.expm1(-elapsed * (math.log(2) / self.half_life))
+            alpha = np.maximum(alpha, 1.0 / (count + 1))
+            # 이상치는 ±ANOMALY_Z 표준편차로 잘라서 반영
+            residual = np.where(count > 0, clipped * scale, 0.0)
+            self._mean = np.where(fresh, np.where(count > 0, mean + alpha * residual, x), mean)
+            self._var = np.where(fresh & (count > 0), self._var + alpha * (residual * residual - self._var),
+                                 self._var)
+
+        self._time[fresh] = now
+        self._count += fresh
+
+        # 변화점이면 새 수준에서 기준선 / CUSUM을 다시 만듦 (WARMUP_SAMPLES 동안 누적 평균, 판정 없음)
+        if changes.any():
+            direction = np.where(z > 0, 1.0, -1.0)
+            # 천천히 오르는 메모리처럼 같은 방향으로 이어지는 변화점은 첫 번째만 보고
+            changes, trend = changes & ~((direction == self._trend) & (now - self._changed < TREND_WINDOW)), changes
+            self._trend[trend] = direction[trend]
+            self._changed[trend] = now
+            self._mean[trend] = x[trend]
+            self._count[trend] = 1
+            self._pos[trend] = 0.0
+            self._neg[trend] = 0.0
+            self._active[trend] = False
+
+        spikes &= now - self._fired >= EVENT_COOLDOWN
+        self._fired[spikes] = now
+        events = []
+        for kind, detected in zip(KINDS, (spikes, changes)):
+            for i in np.flatnonzero(detected):
+                events.append(self._event(kind, int(i), float(x[i]), float(mean[i]), float(z[i]), now))
+
+        for event in events:
+            self.recent.append(event)
+            self.detected += 1
+            for sink in self.sinks:
+                try:
+                    sink(event)
+                except Exception as e:
+                    print(f"이상 징후 전송 실패 ({getattr(sink, '__name__', type(sink).__name__)}): {e}")
+        self.elapsed = time.perf_counter() - started
+        return events
+
+    def _event(self, kind: str, index: int, value: float, baseline: float, z: float, epoch: float) -> Dict[str, Any]:
+        column, device = self._columns[index], self._devices[index]
+        label = SERIES_LABELS.get(column, column)
+        subject = f"{label} [{device}]" if device is not None else label
+        arrow = '↑' if value >= baseline else '↓'
+        if kind == 'anomaly':
+            message = f"{subject} 이상치 {value:.2f} (기준 {baseline:.2f}, z {z:+.1f})"
+        else:
+            message = f"{subject} 변화점 {arrow} {baseline:.2f} → {value:.2f}"
+        return {
+            'kind': kind,
+            'metric': column,
+            'group': series_group(column),
+            'device': device,
+            'label': subject,
+            'direction': 'up' if value >= baseline else 'down',
+            'value': value,
+            'baseline': baseline,
+            'z': round(z, 2),
+            'epoch': epoch,
+            'timestamp': datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S'),
+            'message': message
+        }
+
+    def events(self, since: float = None, until: float = None) -> List[Dict[str, Any]]:
+        """보관 중인 이벤트 중 [since, until] (epoch 초) 구간 (시간순)"""
+        return [event for event in self.recent
+                if (since is None or event['epoch'] >= since) and (until is None or event['epoch'] <= until)]
+
+    def after(self, detected: int) -> List[Dict[str, Any]]:
+        """전체 검출 수가 detected였던 이후에 새로 검출한 이벤트 (보관 범위 안에서)"""
+        new = min(self.detected - detected, len(self.recent))
+        return list(self.recent)[len(self.recent) - new:] if new > 0 else []
+
+    def snapshot(self, since: float = None) -> Dict[str, Any]:
+        """검출 설정, 시리즈 수, 최근 이벤트 (/api/anomalies 응답)"""
+        return {
+            'series': len(self),
+            'parameters': {
+                'half_life': self.half_life,
+                'z': ANOMALY_Z,
+                'clear_z': ANOMALY_CLEAR_Z,
+                'cusum_drift': CUSUM_DRIFT,
+                'cusum_threshold': CUSUM_THRESHOLD,
+                'warmup': WARMUP_SAMPLES,
+                'cooldown': EVENT_COOLDOWN
+            },
+            'detected': self.detected,
+            'events': self.events(since)
+        }
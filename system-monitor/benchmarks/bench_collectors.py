@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Collector Benchmark
+수집기별 틱당 비용 측정 (psutil 경로 / procfs 경로)
+
+사용법:
+    python benchmarks/bench_collectors.py [--iterations 2000] [--repeat 5] [--json results.json]
+
+각 수집 함수를 iterations번 호출한 평균 시간(µs)의 repeat회 중앙값을 출력합니다.
+'tick'은 10 Hz 수집기(cpu, network), 'all'은 1초 주기 수집기(cpu, network, memory, disk_io)를 한 번씩
+실행한 비용입니다. 측정 전에 두 경로의 결과 구조(키)가 같은지 확인합니다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from monitor import SystemMonitor  # noqa: E402
+
+CASES = {
+    'cpu': lambda m: m.get_cpu_info(),
+    'cpu_temp': lambda m: m._get_cpu_temperature(),
+    'memory': lambda m: m.get_memory_info(),
+    'disk_io': lambda m: m.get_disk_io(),
+    'network': lambda m: m.get_network_info(),
+    'tick': lambda m: (m.get_cpu_info(), m.get_network_info()),
+    'all': lambda m: (m.get_cpu_info(), m.get_network_info(), m.get_memory_info(), m.get_disk_io()),
+}
+
+
+def create(backend: str) -> SystemMonitor:
+    return SystemMonitor(history_capacity=16, gpu_backend='none', rollup_tiers=(), proc_backend=backend)
+
+
+def check_structure(psutil_monitor: SystemMonitor, procfs_monitor: SystemMonitor):
+    """두 경로가 같은 키와 값 형식을 돌려주는지 확인"""
+    for name in ('cpu', 'memory', 'disk_io', 'network'):
+        expected, actual = CASES[name](psutil_monitor), CASES[name](procfs_monitor)
+        if 'error' in expected or 'error' in actual:
+            raise RuntimeError(f"{name}: {expected.get('error') or actual.get('error')}")
+        if expected.keys() != actual.keys():
+            raise RuntimeError(f"{name}: 키가 다름 {sorted(expected)} != {sorted(actual)}")
+        for key in expected:
+            if type(expected[key]) is not type(actual[key]):
+                raise RuntimeError(f"{name}.{key}: 형식이 다름 {type(expected[key])} != {type(actual[key])}")
+
+
+def measure(monitor: SystemMonitor, case, iterations: int, repeat: int) -> float:
+    """호출 한 번의 평균 시간 (µs, repeat회 중앙값)"""
+    case(monitor)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            case(monitor)
+        timings.append((time.perf_counter() - started) / iterations * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000, help='측정 한 번의 호출 횟수')
+    parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--cases', default=','.join(CASES), help='쉼표로 구분한 측정 항목')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    monitors = {'psutil': create('psutil'), 'procfs': create('procfs')}
+    check_structure(monitors['psutil'], monitors['procfs'])
+    print(f"CPU {os.cpu_count()}개, {args.iterations}회 x {args.repeat}")
+    print(f"{'항목':<10} {'psutil':>10} {'procfs':>10} {'배율':>7}")
+
+    results = []
+    for name in args.cases.split(','):
+        timings = {backend: measure(monitor, CASES[name], args.iterations, args.repeat)
+                   for backend, monitor in monitors.items()}
+        speedup = timings['psutil'] / timings['procfs']
+        results.append({'benchmark': 'collectors', 'case': name, 'psutil_us': round(timings['psutil'], 2),
+                        'procfs_us': round(timings['procfs'], 2), 'speedup': round(speedup, 2)})
+        print(f"{name:<10} {timings['psutil']:>8.1f}µs {timings['procfs']:>8.1f}µs {speedup:>6.1f}x")
+
+    for monitor in monitors.values():
+        monitor.close()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
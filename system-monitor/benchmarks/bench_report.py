@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Report Rendering Benchmark
+히스토리 길이별 PDF 렌더링 시간과 파일 크기 측정 (그래프 데이터 줄이기 적용/미적용)
+
+사용법:
+    python benchmarks/bench_report.py [--sizes 1h,24h,7d] [--serial] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from monitor import HISTORY_METRICS  # noqa: E402
+from report_generator import ReportGenerator, ReportSnapshot, PLOT_WIDTH_PX, REPORT_PAGES  # noqa: E402
+
+SIZES = {'1h': 3600, '24h': 86400, '7d': 7 * 86400}  # 1 Hz 샘플 수
+
+SYSTEM_INFO = {
+    'os': 'Linux (synthetic)',
+    'processor': 'benchmark',
+    'cpu_count': 8,
+    'cpu_threads': 16,
+    'cpu_freq_max': '4000.00 MHz',
+    'total_memory': '32.00 GB',
+    'hostname': 'bench'
+}
+
+
+def synthetic_snapshot(points: int, seed: int = 0) -> ReportSnapshot:
+    """드문 스파이크가 섞인 원본(1 Hz) 히스토리 스냅샷"""
+    rng = np.random.default_rng(seed)
+    end = datetime(2024, 1, 1)
+    start = end - timedelta(seconds=points)
+    timestamps = int(start.timestamp() * 1000) + np.arange(points, dtype=np.int64) * 1000
+    t = np.arange(points)
+
+    series = {}
+    for i, metric in enumerate(HISTORY_METRICS):
+        base = 40 + 20 * np.sin(t / (600 + 97 * i)) + rng.normal(0, 3, points)
+        spikes = rng.random(points) < 0.0005
+        base[spikes] += 50
+        values = np.clip(base, 0, 100).astype(np.float32)
+        series[metric] = {'avg': values, 'min': values, 'max': values, 'last': values}
+
+    history = {'tier': 'raw', 'timestamps': timestamps, 'series': series}
+    return ReportSnapshot(SYSTEM_INFO, start, end, history, sampling_interval=1.0)
+
+
+def run(label: str, points: int, plot_width, directory: str, executor, parallel: bool) -> dict:
+    snapshot = synthetic_snapshot(points)
+    filename = os.path.join(directory, f"report_{label}_{plot_width or 'full'}.pdf")
+
+    started = time.perf_counter()
+    ReportGenerator.from_snapshot(snapshot, plot_width=plot_width).generate_report(
+        filename, executor=executor, parallel=parallel)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'benchmark': 'report_render',
+        'history': label,
+        'points': points,
+        'decimation': plot_width is not None,
+        'parallel': parallel,
+        'workers': executor._max_workers,
+        'render_seconds': round(elapsed, 3),
+        'pdf_bytes': os.path.getsize(filename)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1h,24h,7d', help='쉼표로 구분한 히스토리 길이 (1h, 24h, 7d)')
+    parser.add_argument('--skip-full', action='store_true', help='줄이기 미적용 렌더링 생략 (7d는 수 분 소요)')
+    parser.add_argument('--serial', action='store_true', help='페이지 병렬 렌더링 없이 한 프로세스에서 순서대로 렌더링')
+    parser.add_argument('--workers', type=int, default=min(len(REPORT_PAGES), os.cpu_count() or 1),
+                        help='작업 프로세스 수')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    results = []
+    # 대시보드의 작업 큐처럼 미리 띄워 둔 프로세스 풀 사용 (프로세스 시작/matplotlib 로딩 제외)
+    with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(args.workers) as executor:
+        run('warmup', 60, PLOT_WIDTH_PX, directory, executor, not args.serial)
+        for label in args.sizes.split(','):
+            points = SIZES[label]
+            modes = [PLOT_WIDTH_PX] if args.skip_full else [PLOT_WIDTH_PX, None]
+            for plot_width in modes:
+                result = run(label, points, plot_width, directory, executor, not args.serial)
+                results.append(result)
+                print(f"{label:>4} {points:>7} points  decimation={str(result['decimation']):<5}  "
+                      f"parallel={str(result['parallel']):<5}  "
+                      f"{result['render_seconds']:>7.2f} s  {result['pdf_bytes'] / 1024:>9.1f} KiB")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
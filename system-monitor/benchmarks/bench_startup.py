@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+프로세스 시작부터 첫 샘플 수집(과 대시보드 HTTP 응답)까지의 시간 측정
+
+사용법:
+    python benchmarks/bench_startup.py [--runs 5] [--gpu-backend auto] [--json results.json]
+
+측정 모드:
+    headless   python main.py --headless (Flask / eventlet을 불러오지 않음)
+    dashboard  python main.py --no-browser (첫 샘플 후 웹 서버 모듈 로딩, HTTP 응답 시각도 측정)
+    eager      웹 서버 모듈을 먼저 불러온 뒤 모니터를 만들고 수집 (모듈 수준에서 모든 것을 만들던 이전 순서,
+               이전에는 여기에 첫 브라우저 접속까지의 대기가 더해졌음)
+
+각 실행은 임시 폴더에서 시작하고, 측정이 끝나면 프로세스를 바로 종료합니다(리포트 생성 제외).
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+MAIN = os.path.join(SOURCE_DIR, 'main.py')
+FIRST_SAMPLE_PREFIX = '첫 샘플'
+TIMEOUT = 30.0
+
+EAGER_SCRIPT = '''
+import sys
+sys.path.insert(0, {source!r})
+import web
+from monitor import SystemMonitor
+monitor = SystemMonitor(storage_dir='data', gpu_backend={gpu!r})
+monitor.collect_all_data()
+print({prefix!r}, flush=True)
+'''
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_http(url: str, deadline: float) -> bool:
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                return response.status == 200
+        except OSError:
+            time.sleep(0.005)
+    return False
+
+
+def measure(mode: str, gpu_backend: str) -> dict:
+    """실행 한 번 - 첫 샘플까지 / (dashboard) HTTP 응답까지의 시간 (ms)"""
+    port = free_port()
+    if mode == 'eager':
+        command = [sys.executable, '-c', EAGER_SCRIPT.format(source=SOURCE_DIR, gpu=gpu_backend,
+                                                               prefix=FIRST_SAMPLE_PREFIX)]
+    else:
+        command = [sys.executable, MAIN, '--duration', '0', '--gpu-backend', gpu_backend,
+                   '--agent-listen', 'none']
+        command += ['--headless'] if mode == 'headless' else ['--no-browser', '--port', str(port)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=directory, stdout=subprocess.PIPE,
+                                   stderr=subprocess.DEVNULL, text=True, env={**os.environ, 'PYTHONUNBUFFERED': '1'})
+        try:
+            first_sample = None
+            for line in process.stdout:
+                if line.startswith(FIRST_SAMPLE_PREFIX):
+                    first_sample = time.perf_counter() - started
+                    break
+            if first_sample is None:
+                raise RuntimeError(f"{mode}: 첫 샘플 출력 없이 종료됨")
+
+            result = {'benchmark': 'startup', 'mode': mode, 'first_sample_ms': round(first_sample * 1000, 1)}
+            if mode == 'dashboard':
+                if not wait_http(f'http://127.0.0.1:{port}/metrics', started + TIMEOUT):
+                    raise RuntimeError("dashboard: HTTP 응답 없음")
+                result['http_ready_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            return result
+        finally:
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='모드별 실행 횟수')
+    parser.add_argument('--modes', default='headless,dashboard,eager', help='쉼표로 구분한 측정 모드')
+    parser.add_argument('--gpu-backend', default='auto', help="'auto', 'none', 'fake:2' 등")
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    # 디스크 캐시 예열 (첫 실행의 모듈 파일 읽기 제외)
+    measure('headless', args.gpu_backend)
+
+    results = []
+    for mode in args.modes.split(','):
+        runs = [measure(mode, args.gpu_backend) for _ in range(args.runs)]
+        summary = {'benchmark': 'startup', 'mode': mode, 'runs': len(runs), 'gpu_backend': args.gpu_backend}
+        for key in ('first_sample_ms', 'http_ready_ms'):
+            values = [run[key] for run in runs if key in run]
+            if values:
+                summary[key] = {'median': statistics.median(values), 'min': min(values), 'max': max(values)}
+        results.append(summary)
+
+        line = f"{mode:<10} 첫 샘플 {summary['first_sample_ms']['median']:>7.1f} ms"
+        if 'http_ready_ms' in summary:
+            line += f"   HTTP 응답 {summary['http_ready_ms']['median']:>7.1f} ms"
+        print(line + f"   (중앙값, {len(runs)}회)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
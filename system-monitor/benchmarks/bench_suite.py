@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+수집 / 히스토리 / 통계 / 프로세스 / 리포트 경로를 결정적 합성 데이터로 측정하는 회귀 벤치마크
+
+사용법:
+    python benchmarks/bench_suite.py [--only ingest,statistics] [--quick] [--json results.json]
+    python benchmarks/bench_suite.py --json new.json --compare old.json
+
+실제 시스템 대신 synthetic.py의 가짜 psutil 계층(FakePsutil)과 'fake:2' GPU 백엔드를 사용하므로
+실행할 때마다 같은 입력으로 측정합니다. 결과 JSON은 benchmark/case별 중앙값, 최소, 최대와
+실행 환경을 담으며, --compare로 이전 결과와의 배율(새 / 이전)을 출력합니다.
+
+측정 항목:
+    collect      collect_all_data() 한 번 (모든 수집기 + 히스토리 저장, 프로세스 100개)
+    ingest       히스토리 저장 한 번 (수집 결과 dict -> 링 버퍼 / 롤업 / 누적 통계)
+    statistics   get_statistics() - 누적(O(1)), 최근 5분 / 1시간 구간, get_windowed_statistics()
+    processes    get_top_processes() - 프로세스 100 / 1,000 / 10,000개, 후보만 재측정 / 전체 재측정
+    alerts       알림 규칙 100 / 500개를 샘플 하나(모든 그룹)에 평가 (장치별 규칙은 장치마다)
+    anomaly      이상치 / 변화점 검출 - 시리즈 100 / 1,000개를 10 Hz 샘플 하나로 갱신
+    report       generate_report() - 1 Hz 히스토리 5분 / 1시간 / 24시간 (한 프로세스에서 순서대로 렌더링)
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from alerts import AlertEngine, ALERT_GROUPS, DEFAULT_RULES  # noqa: E402
+from anomaly import AnomalyDetector  # noqa: E402
+from monitor import SystemMonitor  # noqa: E402
+from report_generator import ReportGenerator  # noqa: E402
+from synthetic import CALL_INTERVAL, FakePsutil, SYNTHETIC_START, synthetic_samples  # noqa: E402
+
+SUITE_VERSION = 1
+PROCESS_COUNTS = (100, 1000, 10000)
+ALERT_RULE_COUNTS = (100, 500)
+ANOMALY_SERIES_COUNTS = (100, 1000)
+ANOMALY_COLUMNS = 10  # 시리즈를 나눠 담는 컬럼 수 (히스토리처럼 장치별 컬럼 여러 개)
+REPORT_SIZES = {'5m': 300, '1h': 3600, '24h': 86400}  # 1 Hz 샘플 수
+STATISTICS_FILL = 36000  # 통계 측정 전에 채우는 샘플 수 (기본 히스토리 용량)
+
+
+def create(fake: FakePsutil) -> SystemMonitor:
+    """가짜 계층을 쓰는 모니터 (fake.install() 안에서 호출)"""
+    monitor = SystemMonitor(gpu_backend='fake:2', proc_backend=fake)
+    monitor.start_monitoring()
+    return monitor
+
+
+def fill(monitor: SystemMonitor, count: int, seed: int):
+    """합성 샘플 count개 (1 Hz)를 히스토리에 저장하고 모니터링 시작 시각을 첫 샘플에 맞춤"""
+    monitor.start_time = datetime.fromtimestamp(SYNTHETIC_START)
+    for sample in synthetic_samples(count, seed=seed):
+        monitor.ingest(sample)
+
+
+def measure(function, iterations: int, repeat: int) -> list:
+    """호출 한 번의 평균 시간 (초) repeat개 - 첫 호출은 준비 단계로 제외"""
+    function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        timings.append((time.perf_counter() - started) / iterations)
+    return timings
+
+
+def result(benchmark: str, case: str, timings: list, unit: str, iterations: int, **params) -> dict:
+    scale = {'us': 1e6, 'ms': 1e3, 's': 1.0}[unit]
+    return {
+        'benchmark': benchmark,
+        'case': case,
+        'params': params,
+        'unit': unit,
+        'median': round(statistics.median(timings) * scale, 3),
+        'min': round(min(timings) * scale, 3),
+        'max': round(max(timings) * scale, 3),
+        'iterations': iterations,
+        'repeat': len(timings)
+    }
+
+
+def bench_collect(args) -> list:
+    fake = FakePsutil(processes=100, seed=args.seed)
+    clock = [0.0]
+
+    def collect():
+        # 가짜 카운터와 같은 속도로 가는 틱 시각 (속도/사용률이 실제 값 범위에 머물도록)
+        clock[0] += CALL_INTERVAL
+        monitor.collect_all_data(clock[0], SYNTHETIC_START + clock[0])
+
+    with fake.install():
+        monitor = create(fake)
+        timings = measure(collect, args.scale(200), args.repeat)
+        monitor.close()
+    return [result('collect', 'collect_all_data', timings, 'us', args.scale(200), processes=100)]
+
+
+def bench_ingest(args) -> list:
+    count = args.scale(5000)
+    # 반복마다 이어지는 타임스탬프 (되돌아가는 시각 없이 롤업 버킷이 실제처럼 닫히도록)
+    samples = list(synthetic_samples(count * (args.repeat + 1), seed=args.seed))
+    fake = FakePsutil(processes=0, seed=args.seed)
+    with fake.install():
+        monitor = create(fake)
+        for sample in samples[:count]:
+            monitor.ingest(sample)
+        timings = []
+        for index in range(1, args.repeat + 1):
+            chunk = samples[index * count:(index + 1) * count]
+            started = time.perf_counter()
+            for sample in chunk:
+                monitor.ingest(sample)
+            timings.append((time.perf_counter() - started) / count)
+        monitor.close()
+    return [result('ingest', 'ingest', timings, 'us', count, samples=count)]
+
+
+def bench_statistics(args) -> list:
+    fake = FakePsutil(processes=0, seed=args.seed)
+    with fake.install():
+        monitor = create(fake)
+        fill(monitor, args.scale(STATISTICS_FILL), args.seed)
+        # 합성 히스토리의 마지막 샘플을 기준으로 구간 계산 (HistoryStore.window는 마지막 타임스탬프 기준)
+        cases = {
+            'cumulative': (monitor.get_statistics, 2000),
+            'window_5m': (lambda: monitor.get_statistics(300), 200),
+            'window_1h': (lambda: monitor.get_statistics(3600), 50),
+            'windowed': (monitor.get_windowed_statistics, 50)
+        }
+        results = []
+        for case, (function, iterations) in cases.items():
+            timings = measure(function, args.scale(iterations), args.repeat)
+            results.append(result('statistics', case, timings, 'us', args.scale(iterations),
+                                  history=len(monitor.data_history)))
+        monitor.close()
+    return results
+
+
+def bench_processes(args) -> list:
+    results = []
+    for count in args.process_counts:
+        fake = FakePsutil(processes=count, seed=args.seed)
+        with fake.install():
+            monitor = create(fake)
+            for full_scan in (False, True):
+                iterations = max(1, args.scale(200000 // count if not full_scan else 20000 // count))
+                timings = measure(lambda: monitor.get_top_processes(full_scan=full_scan), iterations, args.repeat)
+                results.append(result('processes', f"{'full_scan' if full_scan else 'incremental'}_{count}",
+                                      timings, 'ms', iterations, processes=count, full_scan=full_scan))
+            monitor.close()
+    return results
+
+
+def bench_alerts(args) -> list:
+    samples = list(synthetic_samples(args.scale(3000), interval=CALL_INTERVAL, seed=args.seed))
+    results = []
+    for count in ALERT_RULE_COUNTS:
+        # 기본 규칙을 임계값만 조금씩 바꿔 count개로 복제
+        rules = [{**rule, 'name': f"{rule['name']}_{i}",
+                  **{level: rule[level] + i % 7 for level in ('warning', 'critical') if level in rule}}
+                 for i in range(count) for rule in DEFAULT_RULES[i % len(DEFAULT_RULES):][:1]]
+        engine = AlertEngine(rules)
+        clock = [0.0]
+
+        def evaluate():
+            for sample in samples:
+                clock[0] += CALL_INTERVAL
+                for group in ALERT_GROUPS:
+                    engine.observe(group, sample[group], clock[0], sample['epoch'])
+                engine.annotate(sample)
+
+        timings = [t / len(samples) for t in measure(evaluate, 1, args.repeat)]
+        results.append(result('alerts', f'rules_{count}', timings, 'us', len(samples), rules=count,
+                              transitions=engine.transitions))
+    return results
+
+
+def bench_anomaly(args) -> list:
+    rng = np.random.default_rng(args.seed)
+    count = args.scale(3000)
+    results = []
+    for series in ANOMALY_SERIES_COUNTS:
+        width = series // ANOMALY_COLUMNS
+        # 완만한 사인파 + 잡음, 중간에 시리즈 일부의 수준 변화
+        t = np.arange(count)[:, None] * CALL_INTERVAL
+        values = 50 + 20 * np.sin(t / 30 + rng.uniform(0, 2 * np.pi, series)) + rng.normal(0, 2, (count, series))
+        values[count // 2:, ::7] += 40
+        samples = [{f'column_{c}': row[c * width:(c + 1) * width] for c in range(ANOMALY_COLUMNS)} for row in values]
+        detector = AnomalyDetector({f'column_{c}': width for c in range(ANOMALY_COLUMNS)})
+        clock = [SYNTHETIC_START]
+
+        def update():
+            for sample in samples:
+                clock[0] += CALL_INTERVAL
+                detector.update(int(clock[0] * 1000), sample)
+
+        timings = [t / len(samples) for t in measure(update, 1, args.repeat)]
+        results.append(result('anomaly', f'series_{series}', timings, 'us', len(samples), series=series,
+                              events=detector.detected))
+    return results
+
+
+def bench_report(args) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for label in args.report_sizes:
+            fake = FakePsutil(processes=0, seed=args.seed)
+            with fake.install():
+                monitor = create(fake)
+                fill(monitor, REPORT_SIZES[label], args.seed)
+                system_info = monitor.get_system_info()
+                filename = os.path.join(directory, f'report_{label}.pdf')
+                generate = lambda: ReportGenerator(monitor, system_info).generate_report(filename, parallel=False)  # noqa: E731
+                timings = measure(generate, 1, args.report_repeat)
+                results.append(result('report', label, timings, 's', 1, samples=REPORT_SIZES[label],
+                                      pdf_bytes=os.path.getsize(filename)))
+                monitor.close()
+    return results
+
+
+BENCHMARKS = {
+    'collect': bench_collect,
+    'ingest': bench_ingest,
+    'statistics': bench_statistics,
+    'processes': bench_processes,
+    'alerts': bench_alerts,
+    'anomaly': bench_anomaly,
+    'report': bench_report
+}
+
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now().isoformat(timespec='seconds')
+    }
+
+
+def compare(results: list, path: str):
+    """이전 결과 파일과 benchmark/case별 중앙값 배율 출력 (1보다 크면 느려짐)"""
+    with open(path) as f:
+        previous = {(r['benchmark'], r['case']): r for r in json.load(f)['results']}
+    print(f"\n{path} 대비 (새 / 이전)")
+    for r in results:
+        old = previous.get((r['benchmark'], r['case']))
+        if old is None or old['unit'] != r['unit'] or not old['median']:
+            continue
+        ratio = r['median'] / old['median']
+        print(f"{r['benchmark']:<11} {r['case']:<24} {old['median']:>10.3f} -> {r['median']:>10.3f} {r['unit']:<2} "
+              f"{ratio:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help='쉼표로 구분한 측정 항목')
+    parser.add_argument('--quick', action='store_true',
+                        help='반복 횟수를 줄이고 프로세스 10,000개 / 24시간 리포트 생략 (빠른 확인용)')
+    parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 seed')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일 경로')
+    args = parser.parse_args()
+
+    factor = 0.1 if args.quick else 1.0
+    args.scale = lambda n: max(1, int(n * factor))
+    args.process_counts = PROCESS_COUNTS[:2] if args.quick else PROCESS_COUNTS
+    args.report_sizes = ('5m', '1h') if args.quick else tuple(REPORT_SIZES)
+    args.report_repeat = 1 if args.quick else 3
+
+    results = []
+    print(f"{'항목':<11} {'케이스':<24} {'중앙값':>10} {'최소':>10} {'최대':>10}")
+    for name in args.only.split(','):
+        if name not in BENCHMARKS:
+            parser.error(f"알 수 없는 항목: {name}")
+        for r in BENCHMARKS[name](args):
+            results.append(r)
+            print(f"{r['benchmark']:<11} {r['case']:<24} {r['median']:>8.3f}{r['unit']:<2} "
+                  f"{r['min']:>8.3f}{r['unit']:<2} {r['max']:>8.3f}{r['unit']:<2}", flush=True)
+
+    output = {'suite': 'system-monitor', 'version': SUITE_VERSION, 'seed': args.seed, 'quick': args.quick,
+              'environment': environment(), 'results': results}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(output, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""
+Synthetic Data
+벤치마크용 결정적 합성 데이터 - 가짜 psutil 계층과 collect() 형식 샘플 생성기
+
+같은 seed면 어느 머신에서든 같은 값을 돌려주므로 (GPU가 없어도) 실행 간 결과를 비교할 수 있습니다.
+카운터는 실제 시간이 아니라 호출 횟수에 따라 증가합니다. GPU는 gpu.py의 'fake' 백엔드를 사용합니다.
+"""
+
+import contextlib
+import math
+import random
+from collections import namedtuple
+from datetime import datetime
+from typing import Dict, Any, Iterator, List
+
+import numpy as np
+import psutil
+
+from procfs import cputimes, scpufreq, svmem, sswap, sdiskio, snetio, shwtemp
+
+SYNTHETIC_START = datetime(2024, 1, 1).timestamp()  # 합성 히스토리 시작 시각 (epoch 초)
+FAKE_CORES = 8
+FAKE_MEMORY = 32 * 1024**3
+FAKE_DISKS = ('nvme0n1', 'sda')
+FAKE_MOUNTS = (('/', '/dev/nvme0n1p2'), ('/home', '/dev/nvme0n1p3'), ('/data', '/dev/sda1'))
+FAKE_INTERFACES = ('eth0', 'wlan0')
+FAKE_GPUS = 2
+CALL_INTERVAL = 0.1  # 가짜 카운터가 호출 한 번에 진행하는 시간 (초)
+
+sdiskusage = namedtuple('sdiskusage', 'total used free percent')
+sdiskpart = namedtuple('sdiskpart', 'device mountpoint fstype opts')
+pcputimes = namedtuple('pcputimes', 'user system children_user children_system')
+pmem = namedtuple('pmem', 'rss vms')
+pio = namedtuple('pio', 'read_count write_count read_bytes write_bytes')
+
+
+def load_curve(step: float, period: float, phase: float = 0.0) -> float:
+    """0.1 ~ 0.9 사이를 오가는 부하 곡선"""
+    return 0.5 + 0.4 * math.sin(step / period + phase)
+
+
+class FakeProcess:
+    """psutil.Process 호환 가짜 프로세스 (측정할 때마다 CPU 시간과 I/O가 일정한 속도로 증가)"""
+
+    def __init__(self, pid: int, name: str, cpu_rate: float, rss: int, threads: int, io_rate: int,
+                 created: float):
+        self.pid = pid
+        self._name = name
+        self.cpu_rate = cpu_rate
+        self.rss = rss
+        self.threads = threads
+        self.io_rate = io_rate
+        self.created = created
+        self.alive = True
+        self.measured = 0
+
+    def name(self) -> str:
+        return self._name
+
+    def is_running(self) -> bool:
+        return self.alive
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def cpu_times(self):
+        if not self.alive:
+            raise psutil.NoSuchProcess(self.pid)
+        self.measured += 1
+        busy = self.cpu_rate * self.measured * CALL_INTERVAL
+        return pcputimes(busy * 0.8, busy * 0.2, 0.0, 0.0)
+
+    def memory_info(self):
+        return pmem(self.rss, self.rss * 2)
+
+    def num_threads(self) -> int:
+        return self.threads
+
+    def io_counters(self):
+        total = self.io_rate * self.measured
+        return pio(self.measured, self.measured, total // 2, total - total // 2)
+
+    def create_time(self) -> float:
+        return self.created
+
+
+class FakePsutil:
+    """monitor.py / processes.py가 쓰는 psutil 함수의 결정적 가짜 구현
+
+    SystemMonitor(proc_backend=FakePsutil())로 수집 경로에 넣고, install()로 두 모듈의 psutil을 바꿉니다.
+    pids()를 부를 때마다 가장 오래된 프로세스 churn개가 끝나고 새 프로세스가 생깁니다.
+    """
+
+    name = 'fake'
+    Error = psutil.Error
+    NoSuchProcess = psutil.NoSuchProcess
+    AccessDenied = psutil.AccessDenied
+    ZombieProcess = psutil.ZombieProcess
+
+    def __init__(self, processes: int = 100, cores: int = FAKE_CORES, seed: int = 0, churn: int = 1):
+        self.random = random.Random(seed)
+        self.cores = cores
+        self.churn = churn
+        self.steps = {'cpu': 0, 'memory': 0, 'disk': 0, 'network': 0}
+        self._cpu = [[0.0] * len(cputimes._fields) for _ in range(cores)]
+        self._disks = {name: [0] * len(sdiskio._fields) for name in FAKE_DISKS}
+        self._nics = {name: [0] * len(snetio._fields) for name in FAKE_INTERFACES}
+        self._processes: Dict[int, FakeProcess] = {}
+        self._next_pid = 1000
+        for _ in range(processes):
+            self._spawn()
+
+    # 시스템 전체
+    def cpu_count(self, logical: bool = True) -> int:
+        return self.cores if logical else max(1, self.cores // 2)
+
+    def cpu_times(self, percpu: bool = False):
+        self.steps['cpu'] += 1
+        step = self.steps['cpu']
+        for core, row in enumerate(self._cpu):
+            load = min(0.98, load_curve(step, 40 + 7 * core, core) + self.random.uniform(-0.05, 0.05))
+            busy = CALL_INTERVAL * load
+            row[0] += busy * 0.6   # user
+            row[2] += busy * 0.3   # system
+            row[4] += busy * 0.05  # iowait
+            row[6] += busy * 0.05  # softirq
+            row[3] += CALL_INTERVAL - busy  # idle
+        if percpu:
+            return [cputimes(*row) for row in self._cpu]
+        return cputimes(*(sum(column) for column in zip(*self._cpu)))
+
+    def cpu_freq(self, percpu: bool = False):
+        return scpufreq(2400.0 + 1200.0 * load_curve(self.steps['cpu'], 30), 800.0, 4200.0)
+
+    def sensors_temperatures(self, fahrenheit: bool = False):
+        temperature = 45.0 + 30.0 * load_curve(self.steps['cpu'], 60)
+        return {'coretemp': [shwtemp('Package id 0', temperature, 90.0, 100.0)]}
+
+    def virtual_memory(self):
+        self.steps['memory'] += 1
+        used = int(FAKE_MEMORY * (0.3 + 0.4 * load_curve(self.steps['memory'], 200)))
+        available = FAKE_MEMORY - used
+        return svmem(FAKE_MEMORY, available, used / FAKE_MEMORY * 100, used, available // 2,
+                     available // 8, available // 4, 0)
+
+    def swap_memory(self):
+        total = 8 * 1024**3
+        used = int(total * 0.1)
+        return sswap(total, used, total - used, 10.0)
+
+    def disk_usage(self, path: str):
+        total = 512 * 1024**3
+        used = int(total * (0.4 + 0.1 * (len(path) % 5)))
+        return sdiskusage(total, used, total - used, used / total * 100)
+
+    def disk_partitions(self, all: bool = False):
+        return [sdiskpart(device, mountpoint, 'ext4', 'rw') for mountpoint, device in FAKE_MOUNTS]
+
+    def disk_io_counters(self, perdisk: bool = False):
+        self.steps['disk'] += 1
+        load = load_curve(self.steps['disk'], 25)
+        for index, counters in enumerate(self._disks.values()):
+            ios = int(200 * load) + self.random.randint(0, 20) + index
+            counters[0] += ios // 2                    # read_count
+            counters[1] += ios - ios // 2              # write_count
+            counters[2] += ios // 2 * 65536            # read_bytes
+            counters[3] += (ios - ios // 2) * 32768    # write_bytes
+            counters[4] += ios // 2                    # read_time (ms)
+            counters[5] += (ios - ios // 2) * 2        # write_time (ms)
+            counters[6] += int(1000 * load * CALL_INTERVAL)  # busy_time (ms)
+        if perdisk:
+            return {name: sdiskio(*counters) for name, counters in self._disks.items()}
+        return sdiskio(*(sum(column) for column in zip(*self._disks.values())))
+
+    def is_whole_disk(self, name: str) -> bool:
+        return name in self._disks
+
+    def net_io_counters(self, pernic: bool = False):
+        self.steps['network'] += 1
+        load = load_curve(self.steps['network'], 15)
+        for index, counters in enumerate(self._nics.values()):
+            packets = int(1000 * load) + self.random.randint(0, 50) + index
+            counters[0] += packets * 600   # bytes_sent
+            counters[1] += packets * 1400  # bytes_recv
+            counters[2] += packets
+            counters[3] += packets
+            counters[4] += packets // 5000  # errin
+            counters[6] += packets // 2000  # dropin
+        if pernic:
+            return {name: snetio(*counters) for name, counters in self._nics.items()}
+        return snetio(*(sum(column) for column in zip(*self._nics.values())))
+
+    # 프로세스
+    def _spawn(self):
+        pid = self._next_pid
+        self._next_pid += 1
+        self._processes[pid] = FakeProcess(
+            pid, f"worker-{pid % 97}",
+            cpu_rate=self.random.expovariate(20.0),
+            rss=self.random.randint(4, 2048) * 1024**2,
+            threads=self.random.randint(1, 64),
+            io_rate=self.random.randint(0, 4) * 4096,
+            created=SYNTHETIC_START - self.random.uniform(10, 86400))
+
+    def pids(self) -> List[int]:
+        for pid in list(self._processes)[:self.churn]:
+            self._processes.pop(pid).alive = False
+            self._spawn()
+        return list(self._processes)
+
+    def Process(self, pid: int) -> FakeProcess:
+        process = self._processes.get(pid)
+        if process is None:
+            raise psutil.NoSuchProcess(pid)
+        return process
+
+    @contextlib.contextmanager
+    def install(self):
+        """monitor.py / processes.py의 psutil과 물리 디스크 판별 함수를 이 객체로 바꿈 (with 블록 안에서만)"""
+        import monitor
+        import processes
+        patches = [(monitor, 'psutil', self), (processes, 'psutil', self),
+                   (monitor, 'is_whole_disk', self.is_whole_disk)]
+        saved = [(module, attribute, getattr(module, attribute)) for module, attribute, _ in patches]
+        for module, attribute, value in patches:
+            setattr(module, attribute, value)
+        try:
+            yield self
+        finally:
+            for module, attribute, value in saved:
+                setattr(module, attribute, value)
+
+
+def synthetic_samples(count: int, interval: float = 1.0, start: float = SYNTHETIC_START, seed: int = 0,
+                      cores: int = FAKE_CORES, gpus: int = FAKE_GPUS) -> Iterator[Dict[str, Any]]:
+    """collect() 형식의 결정적 합성 샘플 count개 (느린 주기 + 잡음 + 드문 스파이크)
+
+    장치 이름은 FakePsutil과 같으므로 가짜 계층으로 만든 모니터의 장치별 컬럼에 그대로 들어갑니다.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(count, dtype=np.float64)
+
+    def series(period: float, low: float = 0.0, high: float = 100.0, noise: float = 3.0) -> np.ndarray:
+        values = 0.5 + 0.35 * np.sin(t / period + rng.uniform(0, 2 * np.pi)) + rng.normal(0, noise / 100, count)
+        values[rng.random(count) < 0.0005] += 0.4
+        return low + (high - low) * np.clip(values, 0.0, 1.0)
+
+    cpu = series(600)
+    per_core = np.stack([series(300 + 37 * core) for core in range(cores)], axis=1)
+    temperature = series(900, 35, 95)
+    memory = series(3600, 20, 90, noise=0.5)
+    disk_percent = series(86400, 40, 60, noise=0.01)
+    disk_read, disk_write = series(120, 0, 500), series(150, 0, 300)
+    net_recv, net_sent = series(90, 0, 120), series(110, 0, 40)
+    gpu_load = np.stack([series(400 + 53 * gpu) for gpu in range(gpus)], axis=1)
+    gpu_temp = np.stack([series(800 + 71 * gpu, 30, 85) for gpu in range(gpus)], axis=1)
+    disk_util = np.stack([series(200 + 41 * i) for i in range(len(FAKE_DISKS))], axis=1)
+    nic_share = np.array([0.8, 0.2])[:len(FAKE_INTERFACES)]
+
+    for i in range(count):
+        epoch = start + i * interval
+        disks = [{'name': name, 'read_iops': disk_read[i] * share * 8, 'write_iops': disk_write[i] * share * 16,
+                  'read_speed': disk_read[i] * share, 'write_speed': disk_write[i] * share,
+                  'await': 0.2 + disk_util[i, d] / 50, 'queue_depth': disk_util[i, d] / 40,
+                  'util': disk_util[i, d]}
+                 for d, (name, share) in enumerate(zip(FAKE_DISKS, (0.7, 0.3)))]
+        mounts = [{'name': mountpoint, 'device': device, 'percent': disk_percent[i] + 5 * m,
+                   'used': 200.0, 'free': 300.0, 'total': 512.0}
+                  for m, (mountpoint, device) in enumerate(FAKE_MOUNTS)]
+        interfaces = [{'name': name, 'upload_speed': net_sent[i] * share, 'download_speed': net_recv[i] * share,
+                       'sent_pps': net_sent[i] * share * 700, 'recv_pps': net_recv[i] * share * 700,
+                       'errors': 0.0, 'drops': float(rng.random() < 0.001)}
+                      for name, share in zip(FAKE_INTERFACES, nic_share)]
+        yield {
+            'timestamp': datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S'),
+            'epoch': epoch,
+            'cpu': {'percent': cpu[i], 'per_core': per_core[i].tolist(), 'breakdown': {},
+                    'frequency': 3000.0, 'temperature': temperature[i], 'status': 'normal'},
+            'memory': {'percent': memory[i], 'used': memory[i] * 0.32, 'available': 32 - memory[i] * 0.32,
+                       'total': 32.0, 'swap_percent': 10.0, 'swap_used': 0.8, 'status': 'normal'},
+            'disk': {'percent': disk_percent[i], 'used': 200.0, 'free': 300.0, 'total': 512.0, 'status': 'normal',
+                     'mounts': mounts, 'read_speed': disk_read[i], 'write_speed': disk_write[i], 'devices': disks},
+            'network': {'bytes_sent': 1.0, 'bytes_recv': 2.0, 'upload_speed': net_sent[i],
+                        'download_speed': net_recv[i], 'packets_sent': i, 'packets_recv': i,
+                        'interfaces': interfaces},
+            'gpu': [{'id': gpu, 'name': f'Fake GPU {gpu}', 'load': gpu_load[i, gpu], 'temperature': gpu_temp[i, gpu],
+                     'memory_used': 4096.0, 'memory_total': 16384.0, 'memory_percent': 25.0, 'status': 'normal'}
+                    for gpu in range(gpus)],
+            'processes': []
+        }
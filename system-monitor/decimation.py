@@ -0,0 +1,73 @@
+"""
+Decimation
+그래프 폭에 맞춰 시계열을 줄이면서 스파이크를 보존하는 min/max 버킷 다운샘플링
+"""
+
+from typing import Dict, Tuple
+import numpy as np
+
+
+def bucket_layout(length: int, buckets: int) -> Tuple[int, int]:
+    """(버킷 수, 버킷당 샘플 수)"""
+    size = int(np.ceil(length / buckets))
+    return int(np.ceil(length / size)), size
+
+
+def _reshape(values: np.ndarray, count: int, size: int, fill: float) -> np.ndarray:
+    """버킷 단위 2차원 배열 (마지막 버킷은 fill로 채움)"""
+    padded = np.full(count * size, fill, dtype=np.float64)
+    padded[:len(values)] = values
+    return padded.reshape(count, size)
+
+
+def decimate_minmax(x: np.ndarray, series: Dict[str, np.ndarray], buckets: int,
+                    lower: Dict[str, np.ndarray] = None,
+                    upper: Dict[str, np.ndarray] = None):
+    """모든 시리즈를 같은 버킷으로 나눠 버킷마다 최소/최대 두 점만 남김
+
+    두 점은 실제 발생 순서대로 배치되고 x 좌표는 모든 시리즈가 공유하므로
+    기존 그래프 코드에 그대로 쓸 수 있습니다. lower/upper(롤업 min/max 띠)는
+    각각 버킷 최소/최대로 줄입니다. 반환: (x, series, lower, upper)
+    """
+    lower = lower or {}
+    upper = upper or {}
+    length = len(x)
+    if length <= 2 * buckets:
+        return x, series, lower, upper
+
+    count, size = bucket_layout(length, buckets)
+    grid = _reshape(x, count, size, np.nan)
+    first = grid[:, 0]
+    last = np.nanmax(grid, axis=1)
+    # 버킷 안의 두 위치 (시작, 중앙) - 픽셀 폭 이하의 위치 오차
+    x_out = np.column_stack((first, first + (last - first) / 2)).ravel()
+
+    series_out = {}
+    for name, values in series.items():
+        rows = _reshape(values, count, size, np.nan)
+        finite = np.isfinite(rows)
+        lo_idx = np.argmin(np.where(finite, rows, np.inf), axis=1)
+        hi_idx = np.argmax(np.where(finite, rows, -np.inf), axis=1)
+        index = np.arange(count)
+        lo = rows[index, lo_idx]
+        hi = rows[index, hi_idx]
+        # 모두 NaN인 버킷은 NaN 유지
+        empty = ~finite.any(axis=1)
+        lo[empty] = np.nan
+        hi[empty] = np.nan
+        # 먼저 발생한 값을 앞에 배치
+        min_first = lo_idx <= hi_idx
+        pair = np.where(min_first[:, None], np.column_stack((lo, hi)), np.column_stack((hi, lo)))
+        series_out[name] = pair.ravel()
+
+    lower_out = {name: np.repeat(_bucket_reduce(values, count, size, np.fmin), 2)
+                 for name, values in lower.items()}
+    upper_out = {name: np.repeat(_bucket_reduce(values, count, size, np.fmax), 2)
+                 for name, values in upper.items()}
+    return x_out, series_out, lower_out, upper_out
+
+
+def _bucket_reduce(values: np.ndarray, count: int, size: int, ufunc) -> np.ndarray:
+    """NaN을 무시하는 버킷별 최소/최대"""
+    rows = _reshape(values, count, size, np.nan)
+    return ufunc.reduce(rows, axis=1)
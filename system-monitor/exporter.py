@@ -0,0 +1,258 @@
+"""
+Metrics Exporter
+수집 데이터를 OpenMetrics 텍스트 형식으로 내보내는 /metrics 노출기 (틱당 한 번 렌더링, 모든 스크레이프가 공유)
+"""
+
+import gzip
+import math
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PREFIX = 'system_monitor_'
+SCRAPE_ACTIVE_WINDOW = 120.0  # 마지막 스크레이프 후 이 시간(초) 동안은 모든 그룹을 수집
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+# 상태 평가 값 (stateset 상태 목록)
+STATUSES = ('normal', 'warning', 'critical')
+
+# (그룹, 필드, 메트릭 이름, 종류, 배율, 설명) - 스칼라 필드
+SCALAR_FIELDS = (
+    ('cpu', 'percent', 'cpu_usage_percent', 'gauge', 1, '전체 CPU 사용률'),
+    ('cpu', 'frequency', 'cpu_frequency_mhz', 'gauge', 1, '현재 CPU 주파수'),
+    ('cpu', 'temperature', 'cpu_temperature_celsius', 'gauge', 1, 'CPU 온도'),
+    ('memory', 'percent', 'memory_usage_percent', 'gauge', 1, '메모리 사용률'),
+    ('memory', 'used', 'memory_used_bytes', 'gauge', GB, '사용 중인 메모리'),
+    ('memory', 'available', 'memory_available_bytes', 'gauge', GB, '사용 가능한 메모리'),
+    ('memory', 'total', 'memory_total_bytes', 'gauge', GB, '전체 메모리'),
+    ('memory', 'swap_percent', 'swap_usage_percent', 'gauge', 1, 'Swap 사용률'),
+    ('memory', 'swap_used', 'swap_used_bytes', 'gauge', GB, '사용 중인 Swap'),
+    ('disk', 'percent', 'disk_usage_percent', 'gauge', 1, '디스크 사용률'),
+    ('disk', 'used', 'disk_used_bytes', 'gauge', GB, '사용 중인 디스크 용량'),
+    ('disk', 'free', 'disk_free_bytes', 'gauge', GB, '남은 디스크 용량'),
+    ('disk', 'total', 'disk_total_bytes', 'gauge', GB, '전체 디스크 용량'),
+    ('disk', 'read_speed', 'disk_read_bytes_per_second', 'gauge', MB, '디스크 읽기 속도'),
+    ('disk', 'write_speed', 'disk_write_bytes_per_second', 'gauge', MB, '디스크 쓰기 속도'),
+    ('network', 'upload_speed', 'network_sent_bytes_per_second', 'gauge', MB, '네트워크 업로드 속도'),
+    ('network', 'download_speed', 'network_received_bytes_per_second', 'gauge', MB, '네트워크 다운로드 속도'),
+    ('network', 'bytes_sent', 'network_sent_bytes', 'counter', GB, '누적 송신 바이트'),
+    ('network', 'bytes_recv', 'network_received_bytes', 'counter', GB, '누적 수신 바이트'),
+    ('network', 'packets_sent', 'network_sent_packets', 'counter', 1, '누적 송신 패킷'),
+    ('network', 'packets_recv', 'network_received_packets', 'counter', 1, '누적 수신 패킷'),
+)
+
+# (필드, 메트릭 이름, 배율, 설명) - GPU별 (gpu, name 레이블)
+GPU_FIELDS = (
+    ('load', 'gpu_usage_percent', 1, 'GPU 사용률'),
+    ('temperature', 'gpu_temperature_celsius', 1, 'GPU 온도'),
+    ('memory_used', 'gpu_memory_used_bytes', MB, '사용 중인 GPU 메모리'),
+    ('memory_total', 'gpu_memory_total_bytes', MB, '전체 GPU 메모리'),
+    ('memory_percent', 'gpu_memory_usage_percent', 1, 'GPU 메모리 사용률'),
+)
+
+# (그룹, 목록 키, 레이블, 필드, 메트릭 이름, 배율, 설명) - 디스크 장치 / 마운트 / 네트워크 인터페이스별
+DEVICE_FIELDS = (
+    ('disk', 'devices', 'device', 'read_speed', 'disk_device_read_bytes_per_second', MB, '디스크별 읽기 속도'),
+    ('disk', 'devices', 'device', 'write_speed', 'disk_device_write_bytes_per_second', MB, '디스크별 쓰기 속도'),
+    ('disk', 'devices', 'device', 'read_iops', 'disk_device_read_iops', 1, '디스크별 초당 읽기 횟수'),
+    ('disk', 'devices', 'device', 'write_iops', 'disk_device_write_iops', 1, '디스크별 초당 쓰기 횟수'),
+    ('disk', 'devices', 'device', 'await', 'disk_device_await_seconds', 0.001, '디스크별 I/O 평균 대기 시간'),
+    ('disk', 'devices', 'device', 'queue_depth', 'disk_device_queue_depth', 1, '디스크별 평균 큐 깊이'),
+    ('disk', 'devices', 'device', 'util', 'disk_device_utilization_percent', 1, '디스크별 사용률 (I/O 중인 시간 비율)'),
+    ('disk', 'mounts', 'mountpoint', 'percent', 'filesystem_usage_percent', 1, '마운트별 사용률'),
+    ('disk', 'mounts', 'mountpoint', 'used', 'filesystem_used_bytes', GB, '마운트별 사용 중인 용량'),
+    ('disk', 'mounts', 'mountpoint', 'total', 'filesystem_size_bytes', GB, '마운트별 전체 용량'),
+    ('network', 'interfaces', 'interface', 'upload_speed', 'network_interface_sent_bytes_per_second', MB,
+     '인터페이스별 업로드 속도'),
+    ('network', 'interfaces', 'interface', 'download_speed', 'network_interface_received_bytes_per_second', MB,
+     '인터페이스별 다운로드 속도'),
+    ('network', 'interfaces', 'interface', 'sent_pps', 'network_interface_sent_packets_per_second', 1,
+     '인터페이스별 초당 송신 패킷'),
+    ('network', 'interfaces', 'interface', 'recv_pps', 'network_interface_received_packets_per_second', 1,
+     '인터페이스별 초당 수신 패킷'),
+    ('network', 'interfaces', 'interface', 'errors', 'network_interface_errors_per_second', 1,
+     '인터페이스별 초당 오류'),
+    ('network', 'interfaces', 'interface', 'drops', 'network_interface_drops_per_second', 1,
+     '인터페이스별 초당 드롭'),
+)
+
+# (필드, 메트릭 이름, 배율, 설명) - 상위 프로세스별 (rank, pid, name 레이블)
+PROCESS_FIELDS = (
+    ('cpu_percent', 'process_cpu_percent', 1, '상위 프로세스 CPU 사용률'),
+    ('memory_percent', 'process_memory_percent', 1, '상위 프로세스 메모리 사용률'),
+    ('rss', 'process_resident_memory_bytes', 1, '상위 프로세스 RSS'),
+    ('io_bytes', 'process_io_bytes_per_second', 1, '상위 프로세스 디스크 I/O 속도'),
+    ('threads', 'process_threads', 1, '상위 프로세스 스레드 수'),
+)
+
+# 호스트 info 레이블로 내보내는 시스템 정보 키
+INFO_LABELS = ('hostname', 'os', 'architecture', 'processor', 'gpu_backend', 'proc_backend')
+
+
+def escape_label(value: Any) -> str:
+    """레이블 값 이스케이프 (역슬래시, 큰따옴표, 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Exposition:
+    """메트릭 패밀리(HELP/TYPE + 샘플)를 순서대로 쌓는 텍스트 작성기"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str,
+               samples: Iterable[Tuple[str, Dict[str, Any], Any]]):
+        """samples: (접미사, 레이블, 값) - 샘플이 없는 패밀리는 생략"""
+        samples = list(samples)
+        if not samples:
+            return
+        name = PREFIX + name
+        self.lines.append(f'# TYPE {name} {kind}')
+        self.lines.append(f'# HELP {name} {escape_label(help_text)}')
+        for suffix, labels, value in samples:
+            label_text = ','.join(f'{key}="{escape_label(v)}"' for key, v in labels.items())
+            self.lines.append(f'{name}{suffix}{{{label_text}}} {format_value(value)}' if label_text
+                              else f'{name}{suffix} {format_value(value)}')
+
+    def text(self) -> str:
+        return '\n'.join(self.lines + ['# EOF']) + '\n'
+
+
+def render_exposition(data: Dict[str, Any], system_info: Optional[Dict[str, Any]] = None) -> str:
+    """collect()/collect_all_data() 결과 -> OpenMetrics 텍스트
+
+    그룹에 오류가 있거나 수집되지 않은 값은 내보내지 않습니다.
+    """
+    out = _Exposition()
+
+    if system_info and 'error' not in system_info:
+        out.family('host', 'info', '호스트 정보', [
+            ('_info', {key: system_info[key] for key in INFO_LABELS if system_info.get(key) is not None}, 1)
+        ])
+        for key, name, help_text in (('cpu_count', 'cpu_physical_cores', '물리 코어 수'),
+                                     ('cpu_threads', 'cpu_logical_cores', '논리 코어 수'),
+                                     ('gpu_count', 'gpu_devices', 'GPU 수')):
+            if _number(system_info.get(key)):
+                out.family(name, 'gauge', help_text, [('', {}, system_info[key])])
+
+    if _number(data.get('epoch')):
+        out.family('last_sample_timestamp_seconds', 'gauge', '마지막 수집 시각 (epoch 초)',
+                   [('', {}, data['epoch'])])
+
+    groups = {group: data.get(group) or {} for group in ('cpu', 'memory', 'disk', 'network')}
+    for group, field, name, kind, scale, help_text in SCALAR_FIELDS:
+        values = groups[group]
+        if 'error' in values or not _number(values.get(field)):
+            continue
+        suffix = '_total' if kind == 'counter' else ''
+        value = values[field] * scale if scale != 1 else values[field]
+        out.family(name, kind, help_text, [(suffix, {}, value)])
+
+    cpu = groups['cpu']
+    if 'error' not in cpu:
+        out.family('cpu_core_usage_percent', 'gauge', '코어별 CPU 사용률',
+                   [('', {'core': i}, v) for i, v in enumerate(cpu.get('per_core') or []) if _number(v)])
+        out.family('cpu_mode_percent', 'gauge', 'CPU 시간 분해 (모드별 비율)',
+                   [('', {'mode': mode}, v) for mode, v in (cpu.get('breakdown') or {}).items() if _number(v)])
+
+    for group, key, label, field, name, scale, help_text in DEVICE_FIELDS:
+        items = groups[group].get(key) or [] if 'error' not in groups[group] else []
+        out.family(name, 'gauge', help_text,
+                   [('', {label: item.get('name', '')}, item[field] * scale if scale != 1 else item[field])
+                    for item in items if _number(item.get(field))])
+
+    gpus = [gpu for gpu in data.get('gpu') or [] if 'error' not in gpu]
+    for field, name, scale, help_text in GPU_FIELDS:
+        out.family(name, 'gauge', help_text,
+                   [('', {'gpu': gpu.get('id', i), 'name': gpu.get('name', '')}, gpu[field] * scale)
+                    for i, gpu in enumerate(gpus) if _number(gpu.get(field))])
+
+    processes = [proc for proc in data.get('processes') or [] if 'error' not in proc]
+    for field, name, scale, help_text in PROCESS_FIELDS:
+        out.family(name, 'gauge', help_text,
+                   [('', {'rank': rank, 'pid': proc['pid'], 'name': proc.get('name', '')}, proc[field] * scale)
+                    for rank, proc in enumerate(processes) if _number(proc.get(field))])
+
+    # 상태 평가 (정상/경고/위험) - 구성 요소별 stateset
+    statuses = [({'component': group}, groups[group].get('status'))
+                for group in ('cpu', 'memory', 'disk', 'network')]
+    statuses += [({'component': 'gpu', 'gpu': gpu.get('id', i)}, gpu.get('status')) for i, gpu in enumerate(gpus)]
+    out.family('status', 'stateset', '구성 요소 상태 (정상/경고/위험)',
+               [('', {**labels, PREFIX + 'status': state}, int(status == state))
+                for labels, status in statuses if status in STATUSES for state in STATUSES])
+
+    return out.text()
+
+
+class MetricsExporter:
+    """샘플러 틱 결과를 받아 두고 스크레이프 시 한 번만 렌더링해 공유하는 노출기
+
+    update()는 참조만 바꾸므로 샘플링 루프에 비용이 없고, 텍스트(와 gzip 본문)는
+    새 데이터 이후 첫 스크레이프에서 한 번 만들어 이후 스크레이프가 그대로 사용합니다.
+    스크레이프는 수집기를 실행하지 않습니다.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._data: Optional[Dict[str, Any]] = None
+        self._system_info: Optional[Dict[str, Any]] = None
+        self._version = 0
+        self._rendered_version = -1
+        self._text = b''
+        self._gzip = None
+        self._last_scrape = None
+        self.renders = 0
+        self.scrapes = 0
+        self._lock = threading.Lock()
+
+    def update(self, data: Dict[str, Any], system_info: Optional[Dict[str, Any]] = None):
+        """이번 틱의 수집 결과 등록 (렌더링은 다음 스크레이프에서)"""
+        with self._lock:
+            self._data = data
+            self._system_info = system_info
+            self._version += 1
+
+    def recently_scraped(self, now: float = None) -> bool:
+        """최근 SCRAPE_ACTIVE_WINDOW초 안에 스크레이프가 있었는지 (샘플러의 수집 그룹 결정용)"""
+        now = self.clock() if now is None else now
+        return self._last_scrape is not None and now - self._last_scrape < SCRAPE_ACTIVE_WINDOW
+
+    def scrape(self, accept_gzip: bool = False) -> Tuple[bytes, Dict[str, str]]:
+        """(본문, 헤더) - 마지막 틱 이후 처음 요청이면 렌더링, 아니면 캐시된 본문"""
+        with self._lock:
+            self._last_scrape = self.clock()
+            self.scrapes += 1
+            if self._rendered_version != self._version:
+                text = render_exposition(self._data, self._system_info) if self._data else '# EOF\n'
+                self._text = text.encode('utf-8')
+                self._gzip = None
+                self._rendered_version = self._version
+                self.renders += 1
+
+            headers = {'Content-Type': CONTENT_TYPE, 'Vary': 'Accept-Encoding'}
+            if not accept_gzip:
+                return self._text, headers
+            if self._gzip is None:
+                self._gzip = gzip.compress(self._text, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+            return self._gzip, headers
@@ -0,0 +1,228 @@
+"""
+GPU Backends
+교체 가능한 GPU 수집 백엔드 (NVML / GPUtil / 가짜 백엔드)와 GPU 없음 결과를 캐시하는 수집기
+"""
+
+import math
+import time
+from typing import Dict, Any, List, Optional
+
+DEFAULT_RETRY_INTERVAL = 60.0  # GPU가 없을 때 다시 확인하는 첫 대기 시간 (초)
+MAX_RETRY_INTERVAL = 3600.0  # 재확인 대기 시간 상한 (초)
+
+
+class GPUBackend:
+    """GPU 백엔드 인터페이스
+
+    open()은 장치 수를 반환하고(없으면 0 또는 예외), read()는 장치별
+    {'id', 'name', 'load', 'temperature', 'memory_used', 'memory_total'} 목록을 반환합니다.
+    load는 퍼센트, 메모리는 MB 단위입니다.
+    """
+
+    name = 'base'
+
+    def open(self) -> int:
+        raise NotImplementedError
+
+    def read(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NVMLBackend(GPUBackend):
+    """NVML 라이브러리 핸들을 한 번 열어 재사용 (틱마다 프로세스 생성 없음)"""
+
+    name = 'nvml'
+
+    def __init__(self):
+        self._nvml = None
+        self._devices = []
+
+    def open(self) -> int:
+        import pynvml  # nvidia-ml-py (선택 의존성)
+
+        pynvml.nvmlInit()
+        self._nvml = pynvml
+        self._devices = []
+        for index in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            name = pynvml.nvmlDeviceGetName(handle)
+            if isinstance(name, bytes):
+                name = name.decode('utf-8', 'replace')
+            self._devices.append((index, name, handle))
+        return len(self._devices)
+
+    def read(self) -> List[Dict[str, Any]]:
+        nvml = self._nvml
+        gpus = []
+        for index, name, handle in self._devices:
+            utilization = nvml.nvmlDeviceGetUtilizationRates(handle)
+            memory = nvml.nvmlDeviceGetMemoryInfo(handle)
+            gpus.append({
+                'id': index,
+                'name': name,
+                'load': float(utilization.gpu),
+                'temperature': float(nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU)),
+                'memory_used': memory.used / (1024**2),  # MB
+                'memory_total': memory.total / (1024**2)  # MB
+            })
+        return gpus
+
+    def close(self):
+        if self._nvml is not None:
+            try:
+                self._nvml.nvmlShutdown()
+            except Exception:
+                pass
+        self._nvml = None
+        self._devices = []
+
+
+class GPUtilBackend(GPUBackend):
+    """GPUtil 대체 백엔드 (호출마다 nvidia-smi 실행 - NVML을 쓸 수 없을 때만 사용)"""
+
+    name = 'gputil'
+
+    def open(self) -> int:
+        return len(self.read())
+
+    def read(self) -> List[Dict[str, Any]]:
+        import GPUtil
+
+        return [{
+            'id': gpu.id,
+            'name': gpu.name,
+            'load': gpu.load * 100,  # 퍼센트로 변환
+            'temperature': gpu.temperature,
+            'memory_used': gpu.memoryUsed,  # MB
+            'memory_total': gpu.memoryTotal  # MB
+        } for gpu in GPUtil.getGPUs()]
+
+
+class FakeGPUBackend(GPUBackend):
+    """프로세스 내 가짜 GPU (GPU 없는 머신에서 다중 GPU 경로 확인용)
+
+    호출 횟수에 따라 결정적으로 변하는 값을 반환합니다.
+    """
+
+    name = 'fake'
+
+    def __init__(self, count: int = 2, memory_total: float = 24576.0):
+        self.count = count
+        self.memory_total = memory_total
+        self._calls = 0
+
+    def open(self) -> int:
+        return self.count
+
+    def read(self) -> List[Dict[str, Any]]:
+        self._calls += 1
+        gpus = []
+        for index in range(self.count):
+            phase = self._calls / 20.0 + index * 1.3
+            load = 50 + 45 * math.sin(phase)
+            gpus.append({
+                'id': index,
+                'name': f'Fake GPU {index}',
+                'load': load,
+                'temperature': 40 + load * 0.4,
+                'memory_used': self.memory_total * (0.2 + 0.6 * (load / 100)),
+                'memory_total': self.memory_total
+            })
+        return gpus
+
+
+BACKENDS = {
+    'nvml': NVMLBackend,
+    'gputil': GPUtilBackend,
+    'fake': FakeGPUBackend
+}
+
+AUTO_ORDER = ('nvml', 'gputil')  # 'auto'에서 시도하는 순서
+
+
+def create_backends(spec: str = 'auto') -> List[GPUBackend]:
+    """백엔드 지정 문자열 -> 시도할 백엔드 목록
+
+    'auto' (NVML, 실패 시 GPUtil), 'nvml', 'gputil', 'fake', 'fake:4' (가짜 GPU 4개), 'none'
+    """
+    if spec == 'none':
+        return []
+    if spec == 'auto':
+        return [BACKENDS[name]() for name in AUTO_ORDER]
+    name, _, count = spec.partition(':')
+    if name not in BACKENDS:
+        raise ValueError(f"unknown GPU backend: {spec}")
+    if name == 'fake' and count:
+        return [FakeGPUBackend(int(count))]
+    return [BACKENDS[name]()]
+
+
+class GPUCollector:
+    """사용 가능한 첫 백엔드를 열어 유지하는 GPU 수집기
+
+    GPU가 없거나 읽기에 실패하면 결과를 캐시해 두고 빈 목록을 반환하며,
+    retry_interval부터 두 배씩(최대 MAX_RETRY_INTERVAL) 늘려 가며 다시 확인합니다.
+    """
+
+    def __init__(self, backend='auto', retry_interval: float = DEFAULT_RETRY_INTERVAL,
+                 clock=time.monotonic):
+        """backend: create_backends 지정 문자열 또는 GPUBackend 인스턴스"""
+        self._candidates = [backend] if isinstance(backend, GPUBackend) else create_backends(backend)
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self.backend: Optional[GPUBackend] = None
+        self.device_count = 0
+        self.last_error = None
+        self._backoff = retry_interval
+        self._next_probe = 0.0
+        self.probe()
+
+    @property
+    def backend_name(self) -> str:
+        return self.backend.name if self.backend is not None else 'none'
+
+    def probe(self, now: float = None) -> bool:
+        """백엔드를 순서대로 열어 GPU가 있는 첫 백엔드 선택"""
+        now = self.clock() if now is None else now
+        for backend in self._candidates:
+            try:
+                count = backend.open()
+            except Exception as e:
+                self.last_error = f"{backend.name}: {e}"
+                continue
+            if count > 0:
+                self.backend = backend
+                self.device_count = count
+                self._backoff = self.retry_interval
+                return True
+            backend.close()
+            self.last_error = f"{backend.name}: no GPU found"
+
+        self._next_probe = now + self._backoff
+        self._backoff = min(self._backoff * 2, MAX_RETRY_INTERVAL)
+        return False
+
+    def read(self, now: float = None) -> List[Dict[str, Any]]:
+        """모든 GPU 측정값 (GPU가 없으면 재확인 시각 전까지 바로 빈 목록)"""
+        now = self.clock() if now is None else now
+        if self.backend is None:
+            if now < self._next_probe or not self.probe(now):
+                return []
+
+        try:
+            return self.backend.read()
+        except Exception as e:
+            # 드라이버 오류 등: 핸들을 닫고 대기 후 다시 확인
+            self.last_error = f"{self.backend.name}: {e}"
+            self.close()
+            self._next_probe = now + self._backoff
+            self._backoff = min(self._backoff * 2, MAX_RETRY_INTERVAL)
+            return []
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
+        self.backend = None
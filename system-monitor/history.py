@@ -0,0 +1,150 @@
+"""
+History Store
+사전 할당된 NumPy 링 버퍼 기반의 컬럼형 히스토리 저장소
+"""
+
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+
+class HistoryStore:
+    """고정 용량 컬럼형 링 버퍼
+
+    모든 컬럼은 같은 시간 인덱스를 공유합니다. 값이 없는 샘플은 NaN으로 저장됩니다.
+    각 값을 i와 i + capacity 두 위치에 기록(미러링)하므로 최근 N개 구간은 항상
+    연속된 메모리이며, 조회는 복사 없는 읽기 전용 뷰로 반환됩니다.
+    뷰는 이후 append로 덮어써질 수 있으므로 보관하려면 copy()를 사용하세요.
+    """
+
+    def __init__(self, capacity: int, columns: Dict[str, int]):
+        """columns: 컬럼 이름 -> 폭 (0 = 스칼라, n = n x 시간 2차원 배열)"""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.widths = dict(columns)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)  # epoch ms
+        self._columns = {}
+        for name, width in self.widths.items():
+            shape = (width, 2 * capacity) if width else (2 * capacity,)
+            self._columns[name] = np.full(shape, np.nan, dtype=np.float32)
+        self._head = 0
+        self._count = 0
+        # 추가된 샘플을 함께 기록할 영구 저장소 (append(timestamp_ms, values) 제공)
+        self.sink = None
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def __contains__(self, name: str) -> bool:
+        return name == 'timestamps' or name in self._columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """전체 보관 구간의 읽기 전용 뷰"""
+        return self.view(name)
+
+    def keys(self) -> List[str]:
+        return ['timestamps'] + list(self._columns)
+
+    @property
+    def total_appended(self) -> int:
+        """지금까지 추가된 전체 샘플 수 (덮어쓴 샘플 포함)"""
+        return self._count
+
+    def append(self, timestamp_ms: int, values: Dict[str, Any]):
+        """샘플 하나 추가 (O(1))"""
+        i = self._head
+        j = i + self.capacity
+        self._timestamps[i] = self._timestamps[j] = timestamp_ms
+
+        for name, column in self._columns.items():
+            value = values.get(name)
+            width = self.widths[name]
+            if width:
+                row = np.full(width, np.nan, dtype=np.float32)
+                if value is not None:
+                    n = min(width, len(value))
+                    row[:n] = value[:n]
+                column[:, i] = row
+                column[:, j] = row
+            else:
+                value = np.nan if value is None else value
+                column[i] = column[j] = value
+
+        self._head = (i + 1) % self.capacity
+        self._count += 1
+
+        if self.sink is not None:
+            self.sink.append(timestamp_ms, values)
+
+    def load(self, records: List[np.ndarray]):
+        """레코드 배열(시간순)로 저장소를 채움 - 영구 저장소 복원용, sink에는 기록하지 않음
+
+        records는 'timestamps'와 컬럼 이름을 필드로 가진 구조화 배열 목록이며,
+        없는 컬럼은 NaN으로 채웁니다.
+        """
+        total = sum(len(r) for r in records)
+        skip = max(0, total - self.capacity)
+        n = total - skip
+        pos = 0
+
+        for chunk in records:
+            if skip >= len(chunk):
+                skip -= len(chunk)
+                continue
+            chunk = chunk[skip:]
+            skip = 0
+            end = pos + len(chunk)
+
+            for target in (slice(pos, end), slice(pos + self.capacity, end + self.capacity)):
+                self._timestamps[target] = chunk['timestamps']
+                for name, column in self._columns.items():
+                    if name not in chunk.dtype.names:
+                        column[..., target] = np.nan
+                    elif self.widths[name]:
+                        values = np.atleast_2d(chunk[name].T)
+                        width = min(self.widths[name], values.shape[0])
+                        column[:, target] = np.nan
+                        column[:width, target] = values[:width]
+                    else:
+                        column[target] = chunk[name]
+            pos = end
+
+        self._head = n % self.capacity
+        self._count = n
+
+    def _bounds(self, last: Optional[int] = None):
+        """최근 last개 샘플의 [start, end) 인덱스"""
+        length = len(self)
+        end = self._head + self.capacity if self._count >= self.capacity else self._head
+        if last is not None:
+            length = max(0, min(length, last))
+        return end - length, end
+
+    def view(self, name: str, last: Optional[int] = None) -> np.ndarray:
+        """컬럼의 최근 last개 샘플 뷰 (복사 없음)"""
+        start, end = self._bounds(last)
+        if name == 'timestamps':
+            view = self._timestamps[start:end]
+        else:
+            view = self._columns[name][..., start:end]
+        view.flags.writeable = False
+        return view
+
+    def count_since(self, timestamp_ms: int) -> int:
+        """timestamp_ms 이후(포함) 샘플 수"""
+        timestamps = self.view('timestamps')
+        return len(timestamps) - int(np.searchsorted(timestamps, timestamp_ms, side='left'))
+
+    def window(self, seconds: Optional[float] = None, names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """최근 seconds초 구간의 컬럼별 뷰 (seconds가 None이면 전체)"""
+        last = None
+        if seconds is not None and len(self):
+            newest = int(self._timestamps[self._bounds(1)[0]])
+            last = self.count_since(newest - int(seconds * 1000))
+        names = names or self.keys()
+        return {name: self.view(name, last) for name in names}
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """현재 보관 구간의 독립 복사본"""
+        return {name: np.array(view) for name, view in self.window().items()}
@@ -0,0 +1,201 @@
+"""
+History API
+HTTP 히스토리 조회: 구간을 step 버킷으로 나눈 서버 측 min/max/avg 집계와 응답 캐시
+"""
+
+import gzip
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+
+DEFAULT_RANGE = 300.0  # start를 생략했을 때 조회 구간 (초)
+DEFAULT_BUCKETS = 300  # step을 생략했을 때 버킷 수
+MAX_BUCKETS = 10000  # 요청 하나의 최대 버킷 수
+CACHE_SIZE = 128  # 닫힌 구간 응답 캐시 항목 수 (LRU)
+CLOSED_MAX_AGE = 3600  # 닫힌 구간 응답의 Cache-Control max-age (초)
+GZIP_MIN_SIZE = 1024  # 이보다 작은 응답은 압축하지 않음 (바이트)
+
+
+class HistoryQueryError(ValueError):
+    """잘못된 조회 인자 (HTTP 400)"""
+
+
+def parse_query(args, metrics: Sequence[str], now: float) -> Dict[str, Any]:
+    """요청 인자 -> {'metrics', 'start_ms', 'end_ms', 'step_ms', 'buckets'}
+
+    metrics: 쉼표로 구분한 메트릭 이름 (생략 시 전체), start/end: epoch 초
+    (생략 시 최근 DEFAULT_RANGE초), step: 버킷 크기(초, 생략 시 DEFAULT_BUCKETS개로 나눔)
+    """
+    names = [m for m in (args.get('metrics') or '').split(',') if m] or list(metrics)
+    unknown = [m for m in names if m not in metrics]
+    if unknown:
+        raise HistoryQueryError(f"unknown metrics: {', '.join(unknown)}")
+
+    try:
+        end = float(args['end']) if args.get('end') else now
+        start = float(args['start']) if args.get('start') else end - DEFAULT_RANGE
+        step = float(args['step']) if args.get('step') else (end - start) / DEFAULT_BUCKETS
+    except ValueError:
+        raise HistoryQueryError("start, end and step must be numbers")
+    if not all(math.isfinite(v) for v in (start, end, step)):
+        raise HistoryQueryError("start, end and step must be finite")
+    if end <= start:
+        raise HistoryQueryError("end must be after start")
+
+    start_ms = int(start * 1000)
+    end_ms = int(end * 1000)
+    step_ms = max(1, int(step * 1000))
+    buckets = -(-(end_ms - start_ms) // step_ms)
+    if buckets > MAX_BUCKETS:
+        raise HistoryQueryError(f"too many buckets ({buckets} > {MAX_BUCKETS}); increase step")
+
+    return {'metrics': tuple(dict.fromkeys(names)), 'start_ms': start_ms, 'end_ms': end_ms,
+            'step_ms': step_ms, 'buckets': buckets}
+
+
+def aggregate_buckets(timestamps: np.ndarray, series: Dict[str, Dict[str, np.ndarray]],
+                      start_ms: int, step_ms: int, buckets: int) -> Dict[str, Dict[str, np.ndarray]]:
+    """시간순 샘플을 [start_ms + i * step_ms, ...) 고정 버킷으로 집계
+
+    series: query_history 결과의 메트릭별 {'min', 'max', 'avg'} 배열.
+    버킷 경계를 이진 탐색한 뒤 reduceat으로 한 번에 계산하며, 빈 버킷은 NaN입니다.
+    반환: 메트릭별 {'min', 'max', 'avg'} (길이 buckets)
+    """
+    edges = start_ms + step_ms * np.arange(buckets + 1, dtype=np.int64)
+    bounds = np.searchsorted(timestamps, edges, side='left')
+    first, last = int(bounds[0]), int(bounds[-1])
+    starts = bounds[:-1]
+    filled = bounds[1:] > starts
+    offsets = starts[filled] - first
+
+    result = {}
+    for metric, aggregates in series.items():
+        out = {agg: np.full(buckets, np.nan) for agg in ('min', 'max', 'avg')}
+        if len(offsets):
+            lo = np.asarray(aggregates['min'][first:last], dtype=np.float64)
+            hi = np.asarray(aggregates['max'][first:last], dtype=np.float64)
+            avg = np.asarray(aggregates['avg'][first:last], dtype=np.float64)
+            finite = np.isfinite(avg)
+            out['min'][filled] = np.fmin.reduceat(lo, offsets)
+            out['max'][filled] = np.fmax.reduceat(hi, offsets)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                out['avg'][filled] = (np.add.reduceat(np.where(finite, avg, 0.0), offsets)
+                                      / np.add.reduceat(finite.astype(np.float64), offsets))
+        result[metric] = out
+    return result
+
+
+def _column(values: np.ndarray) -> List[Optional[float]]:
+    return [None if v != v else round(v, 4) for v in values.tolist()]
+
+
+class HistoryAPI:
+    """모니터 히스토리 위의 HTTP 조회 처리기 (Flask와 독립)
+
+    요청 버킷 수를 채우는 가장 거친 롤업 계층에서 집계하므로, 응답 시간은 히스토리
+    길이가 아니라 버킷 수에 비례합니다. 가장 최근 샘플보다 충분히 이전에 끝나는
+    닫힌 구간은 결과가 바뀌지 않으므로 인코딩/압축한 응답을 LRU 캐시에 보관하고,
+    열린 구간은 샘플 수를 포함한 ETag로 변경이 없을 때 304를 반환합니다.
+    """
+
+    def __init__(self, monitor, metrics: Sequence[str], cache_size: int = CACHE_SIZE, clock=time.time):
+        self.monitor = monitor
+        self.metrics = tuple(metrics)
+        self.cache_size = cache_size
+        self.clock = clock
+        self._cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def handle(self, args, if_none_match: Sequence[str] = (),
+               accept_gzip: bool = False) -> Tuple[int, Dict[str, str], bytes]:
+        """요청 하나 처리 -> (HTTP 상태, 헤더, 본문)
+
+        if_none_match: 클라이언트가 보낸 ETag 값들 (따옴표 없이, werkzeug ETags도 가능)
+        """
+        try:
+            query = parse_query(args, self.metrics, self.clock())
+        except HistoryQueryError as e:
+            body = json.dumps({'error': str(e)}).encode('utf-8')
+            return 400, {'Content-Type': 'application/json'}, body
+
+        key = (query['metrics'], query['start_ms'], query['end_ms'], query['step_ms'])
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        closed_tag = digest
+        open_tag = f"{digest}-{self.monitor.data_history.total_appended}"
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+        elif closed_tag in if_none_match:
+            # 닫힌 구간은 다시 계산해도 같은 결과 (캐시에서 밀려난 뒤의 재검증)
+            return 304, self._headers(closed_tag, True), b''
+        elif open_tag in if_none_match:
+            return 304, self._headers(open_tag, False), b''
+        else:
+            self.misses += 1
+            entry = self._build(query, closed_tag, open_tag)
+            if entry['closed']:
+                self._cache[key] = entry
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        headers = self._headers(entry['etag'], entry['closed'])
+        if entry['etag'] in if_none_match:
+            return 304, headers, b''
+
+        headers['Content-Type'] = 'application/json'
+        body = entry['body']
+        if accept_gzip and len(body) >= GZIP_MIN_SIZE:
+            if entry.get('gzip') is None:
+                entry['gzip'] = gzip.compress(body, compresslevel=6)
+            body = entry['gzip']
+            headers['Content-Encoding'] = 'gzip'
+        return 200, headers, body
+
+    def _build(self, query: Dict[str, Any], closed_tag: str, open_tag: str) -> Dict[str, Any]:
+        """조회 + 버킷 집계 + JSON 인코딩"""
+        history = self.monitor.query_history(list(query['metrics']), start=query['start_ms'] / 1000,
+                                             end=query['end_ms'] / 1000, max_points=query['buckets'])
+        buckets = aggregate_buckets(history['timestamps'], history['series'],
+                                    query['start_ms'], query['step_ms'], query['buckets'])
+
+        # 닫힌 구간: 구간 끝 버킷(하위 계층 버킷 전달 지연 포함)이 닫힌 뒤의 샘플이 이미 있음
+        newest = self.monitor.data_history.view('timestamps', 1)
+        settle_ms = 2 * int(history['resolution'] * 1000) + 1000
+        closed = len(newest) > 0 and query['end_ms'] + settle_ms <= int(newest[0])
+
+        payload = {
+            'tier': history['tier'],
+            'resolution': history['resolution'],
+            'start': query['start_ms'] / 1000,
+            'end': query['end_ms'] / 1000,
+            'step': query['step_ms'] / 1000,
+            'closed': closed,
+            'timestamps': (query['start_ms'] + query['step_ms'] * np.arange(query['buckets'])).tolist(),
+            'series': {metric: {agg: _column(values) for agg, values in aggregates.items()}
+                       for metric, aggregates in buckets.items()}
+        }
+        return {
+            'etag': closed_tag if closed else open_tag,
+            'closed': closed,
+            'body': json.dumps(payload, separators=(',', ':')).encode('utf-8'),
+            'gzip': None
+        }
+
+    @staticmethod
+    def _headers(etag: str, closed: bool) -> Dict[str, str]:
+        return {
+            'ETag': f'"{etag}"',
+            'Cache-Control': f'public, max-age={CLOSED_MAX_AGE}' if closed else 'no-cache',
+            'Vary': 'Accept-Encoding'
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 항목 수와 적중/미스 횟수"""
+        return {'entries': len(self._cache), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,213 @@
+"""
+Self Instrumentation
+모니터 자신의 비용 측정 - 단계별 지연 시간 히스토그램, 프로세스 CPU/RSS, 실행 중 켜고 끄는 샘플링 프로파일러
+"""
+
+import bisect
+import os
+import signal
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional
+import psutil
+
+# 지연 시간 히스토그램 버킷 상한 (초) - 1-2-5 간격, 10 µs ~ 10 s (마지막 버킷은 그 이상)
+LATENCY_BUCKETS = tuple(m * 10.0 ** e for e in range(-5, 1) for m in (1, 2, 5)) + (10.0,)
+
+# 보고하는 분위수
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+PROCESS_SAMPLE_INTERVAL = 1.0  # 프로세스 CPU/RSS 재측정 최소 간격 (초)
+PROFILER_INTERVAL = 0.005  # 프로파일러 기본 샘플 간격 (CPU 시간 초)
+PROFILER_MAX_DEPTH = 64  # 샘플 하나에 기록하는 최대 스택 깊이
+
+
+class LatencyHistogram:
+    """고정 로그 버킷 지연 시간 히스토그램 (기록 한 번 O(log 버킷 수), 메모리 일정)"""
+
+    __slots__ = ('counts', 'count', 'total', 'max', 'last')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, p: float) -> float:
+        """버킷 안에서 선형 보간한 분위수 (초, 기록이 없으면 0)"""
+        if self.count == 0:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """호출 수, 합계와 마지막/평균/분위수/최대 지연 (ms), 누적 버킷"""
+        summary = {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'last_ms': self.last * 1000,
+            'avg_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'max_ms': self.max * 1000
+        }
+        for p in LATENCY_QUANTILES:
+            summary[f"p{p * 100:g}_ms"] = self.quantile(p) * 1000
+        summary['buckets'] = self.buckets()
+        return summary
+
+    def buckets(self) -> List[List[Any]]:
+        """[버킷 상한 (초, 마지막은 '+Inf'), 누적 개수] 목록"""
+        cumulative, result = 0, []
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), self.counts):
+            cumulative += count
+            result.append([bound, cumulative])
+        return result
+
+
+class SamplingProfiler:
+    """SIGPROF 기반 샘플링 프로파일러 (프로세스 CPU 시간 interval초마다 메인 스레드 스택 기록)
+
+    대시보드(eventlet)와 헤드리스 모드의 수집 루프는 모두 메인 스레드에서 돌므로 샘플링 루프,
+    전송, 직렬화 비용이 그대로 잡힙니다. 꺼져 있으면 비용이 없고, setitimer가 없는 플랫폼
+    (Windows)에서는 사용할 수 없습니다. start()/stop()은 메인 스레드에서 호출해야 합니다.
+    """
+
+    def __init__(self):
+        self.available = hasattr(signal, 'setitimer') and hasattr(signal, 'SIGPROF')
+        self.running = False
+        self.interval = PROFILER_INTERVAL
+        self.started_at = None
+        self.stacks: Counter = Counter()  # 코드 객체 튜플 (안쪽 -> 바깥쪽) -> 샘플 수
+        self._previous_handler = None
+
+    def start(self, interval: float = PROFILER_INTERVAL):
+        """샘플링 시작 (이전 샘플은 지움)"""
+        if not self.available:
+            raise RuntimeError('이 플랫폼에서는 샘플링 프로파일러를 사용할 수 없습니다')
+        if self.running:
+            self.stop()
+        self.interval = max(0.001, float(interval))
+        self.stacks = Counter()
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.started_at = time.time()
+        self.running = True
+
+    def stop(self):
+        """샘플링 중지 (기록한 샘플은 유지)"""
+        if not self.running:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        self.running = False
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None and len(stack) < PROFILER_MAX_DEPTH:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        self.stacks[tuple(stack)] += 1
+
+    @staticmethod
+    def _label(code) -> str:
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+    def summary(self, limit: int = 15) -> Dict[str, Any]:
+        """상태와 자체(self) / 누적(total) 샘플이 많은 함수 limit개"""
+        stacks = dict(self.stacks)  # 시그널 처리기가 갱신하는 중에도 안전한 복사본
+        own, cumulative = Counter(), Counter()
+        for stack, count in stacks.items():
+            if stack:
+                own[stack[0]] += count
+            for code in set(stack):
+                cumulative[code] += count
+        samples = sum(stacks.values())
+
+        def top(counter):
+            return [{'function': self._label(code), 'samples': count,
+                     'percent': count / samples * 100 if samples else 0.0}
+                    for code, count in counter.most_common(limit)]
+
+        return {
+            'available': self.available,
+            'running': self.running,
+            'interval_ms': self.interval * 1000,
+            'started_at': self.started_at,
+            'samples': samples,
+            'self': top(own),
+            'total': top(cumulative)
+        }
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope용 접힌 스택 텍스트 ('바깥;...;안쪽 샘플 수' 줄 목록)"""
+        stacks = dict(self.stacks)
+        lines = [';'.join(self._label(code) for code in reversed(stack)) + f' {count}'
+                 for stack, count in sorted(stacks.items(), key=lambda item: -item[1])]
+        return '\n'.join(lines) + ('\n' if lines else '')
+
+
+class Instrumentation:
+    """수집 경로 단계별 지연 시간과 모니터 프로세스 자체 사용량
+
+    단계: 수집기 이름(cpu, network, memory, disk_io, disk_usage, gpu, processes, process_scan, system_info),
+    alerts (알림 규칙 평가), ingest (히스토리 저장), anomaly (이상 징후 검출), tick (틱 전체),
+    serialize (프레임 인코딩), emit (Socket.IO 전송)
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.profiler = SamplingProfiler()
+        self.process = psutil.Process()
+        self._cpu_last = None  # (단조 시각, 사용자 + 시스템 CPU 시간)
+        self._usage = {'cpu_percent': 0.0, 'rss_mb': 0.0, 'threads': 0}
+
+    def record(self, stage: str, seconds: float):
+        """단계 한 번의 소요 시간 기록"""
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def process_usage(self) -> Dict[str, Any]:
+        """모니터 프로세스의 CPU 사용률 (%, 코어 하나 기준)과 RSS (MB) - PROCESS_SAMPLE_INTERVAL마다 재측정"""
+        now = time.monotonic()
+        if self._cpu_last is not None and now - self._cpu_last[0] < PROCESS_SAMPLE_INTERVAL:
+            return dict(self._usage)
+        times = os.times()
+        cpu_time = times.user + times.system
+        try:
+            rss = self.process.memory_info().rss
+            threads = self.process.num_threads()
+        except psutil.Error:
+            rss, threads = 0, 0
+        if self._cpu_last is not None:
+            self._usage['cpu_percent'] = (cpu_time - self._cpu_last[1]) / (now - self._cpu_last[0]) * 100
+        self._usage['rss_mb'] = rss / (1024**2)
+        self._usage['threads'] = threads
+        self._cpu_last = (now, cpu_time)
+        return dict(self._usage)
+
+    def snapshot(self, scheduler: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """단계별 지연 시간 요약, 프로세스 사용량, 스케줄러 틱/오버런 통계, 프로파일러 상태"""
+        return {
+            'timestamp': time.time(),
+            'stages': {stage: histogram.summary() for stage, histogram in list(self.histograms.items())},
+            'process': self.process_usage(),
+            'scheduler': scheduler or {},
+            'profiler': self.profiler.summary()
+        }
@@ -4,153 +4,225 @@ System Resource Monitor - Main Application
 실시간 시스템 리소스 모니터링 및 PDF 리포트 생성
 
 사용법:
-    python main.py
+    python main.py                                         # 대시보드, 5분 후 PDF 리포트
+    python main.py --duration 0 --no-browser               # 무제한 대시보드 서버
+    python main.py --headless --duration 0 --report-interval 3600   # 웹 서버 없이 1시간마다 리포트
 
-5분간 모니터링 후 자동으로 PDF 리포트를 생성합니다.
+모니터링은 클라이언트 접속을 기다리지 않고 바로 시작하며, Flask / eventlet은 첫 샘플을
+수집한 뒤에 불러옵니다. SIGTERM(또는 Ctrl+C)을 받으면 히스토리를 디스크에 기록하고
+마지막 구간의 리포트를 만든 뒤 종료합니다.
 """
 
-from flask import Flask, render_template
-from flask_socketio import SocketIO, emit
-from monitor import SystemMonitor
-from report_generator import ReportGenerator
-import threading
 import time
-from datetime import datetime, timedelta
-import webbrowser
-import os
-
-# Flask 앱 설정
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'system-monitor-secret-key-2024'
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
-
-# 전역 변수
-monitor = SystemMonitor()
-monitoring_active = False
-monitoring_thread = None
-MONITORING_DURATION = 300  # 5분 (초 단위)
-
-@app.route('/')
-def index():
-    """메인 페이지"""
-    system_info = monitor.get_system_info()
-    start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    return render_template('dashboard.html',
-                         system_info=system_info,
-                         start_time=start_time)
-
-def monitoring_task():
-    """백그라운드 모니터링 작업"""
-    global monitoring_active
-
-    print("모니터링 시작...")
-    monitor.start_monitoring()
-    start_time = time.time()
-    end_time = start_time + MONITORING_DURATION
-
-    while monitoring_active and time.time() < end_time:
-        # 시스템 데이터 수집
-        data = monitor.collect_all_data()
-
-        # 클라이언트에 데이터 전송
-        socketio.emit('system_data', data)
-
-        # 시간 정보 전송
-        elapsed = time.time() - start_time
-        remaining = max(0, MONITORING_DURATION - elapsed)
-
-        duration_str = str(timedelta(seconds=int(elapsed))).split('.')[0]
-        remaining_str = f"{int(remaining // 60):02d}:{int(remaining % 60):02d}"
-
-        socketio.emit('time_update', {
-            'duration': duration_str,
-            'remaining': remaining_str
-        })
-
-        # 1초 대기
-        socketio.sleep(1)
-
-    # 모니터링 완료
-    if monitoring_active:
-        print("\n모니터링 완료! PDF 리포트 생성 중...")
-
-        # PDF 생성
-        system_info = monitor.get_system_info()
-        report_gen = ReportGenerator(monitor, system_info)
-        pdf_path = report_gen.generate_report()
-
-        # 절대 경로로 변환
-        pdf_abs_path = os.path.abspath(pdf_path)
-
-        print(f"\n✓ PDF 리포트가 생성되었습니다: {pdf_abs_path}")
-
-        # 클라이언트에 완료 알림
-        socketio.emit('monitoring_complete', {
-            'message': f'모니터링 완료! PDF 리포트: {pdf_abs_path}',
-            'pdf_path': pdf_abs_path
-        })
-
-        monitoring_active = False
 
-@socketio.on('connect')
-def handle_connect():
-    """클라이언트 연결"""
-    global monitoring_active, monitoring_thread
+STARTED = time.monotonic()  # 첫 샘플까지의 시간 측정 기준 (다른 모듈을 불러오기 전)
+
+import argparse  # noqa: E402
+import os  # noqa: E402
+import signal  # noqa: E402
+import sys  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+from monitor import SystemMonitor, DEFAULT_COLLECTOR_INTERVALS  # noqa: E402
+from alerts import DEFAULT_RULES, FileSink, WebhookSink, load_rules  # noqa: E402
+from stream import METRIC_GROUPS  # noqa: E402
+from wire import is_local_address  # noqa: E402
+
+# 기본 설정 (명령행 인자로 변경 가능)
+STORAGE_DIR = 'data'  # 시계열 세그먼트 저장 폴더 (재시작 시 복원)
+GPU_BACKEND = 'auto'  # 'auto' (NVML -> GPUtil), 'nvml', 'gputil', 'fake:2' (가짜 GPU 2개), 'none'
+PROC_BACKEND = 'auto'  # 'auto' (Linux면 /proc 직접 읽기), 'procfs', 'psutil'
+MONITORING_DURATION = 300  # 5분 (초 단위, 0 = 무제한)
+REPORT_INTERVAL = 0  # 리포트 회전 주기 (초, 0 = 회전 없음)
+COLLECTOR_INTERVALS = dict(DEFAULT_COLLECTOR_INTERVALS)  # 수집기별 주기 (초)
+# 구독자가 없어도 수집할 그룹 - 히스토리와 리포트가 빈 구간 없이 채워지도록 기본값은 전체
+# (구독은 전송만 거름, ()로 두면 대시보드에서 구독 중인 그룹만 수집, 헤드리스는 항상 전체)
+ALWAYS_COLLECT = METRIC_GROUPS
+HOST = '0.0.0.0'
+PORT = 5000
+PROFILE_DIR = 'reports'  # 헤드리스 모드 프로파일 (SIGUSR2로 켜고 끔) 저장 폴더
+
+# 알림 (alerts.py) - 규칙 파일이 없으면 alerts.DEFAULT_RULES, 상태 전이는 대시보드(alert 이벤트)로도 전송
+ALERT_RULES = None  # JSON 규칙 파일 경로
+ALERT_LOG = None  # 상태 전이를 한 줄씩 추가할 JSON Lines 파일 경로
+ALERT_WEBHOOK = None  # 상태 전이를 POST할 URL
+
+# 원격 에이전트 수신 (agent.py) - 호스트별 히스토리는 data/hosts/<호스트>에 저장
+# 루프백 / Unix 소켓이 아닌 주소로 받으려면 AGENT_TOKEN(--agent-token)이 필요
+AGENT_LISTEN = 'tcp://127.0.0.1:5001'  # 'unix:///tmp/system-monitor.sock'도 가능, None이면 수신 안 함
+AGENT_TOKEN = None  # 지정하면 같은 --token을 보낸 에이전트만 허용
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='시스템 리소스 모니터')
+    parser.add_argument('--headless', action='store_true',
+                        help='웹 서버 없이 수집과 리포트만 수행 (모든 그룹 수집)')
+    parser.add_argument('--duration', type=float, default=MONITORING_DURATION,
+                        help='모니터링 시간 (초, 0 = 무제한)')
+    parser.add_argument('--report-interval', type=float, default=REPORT_INTERVAL,
+                        help='이 주기(초)마다 직전 구간의 PDF 리포트 생성 (0 = 끝날 때만)')
+    parser.add_argument('--host', default=HOST, help='대시보드 서버 주소')
+    parser.add_argument('--port', type=int, default=PORT, help='대시보드 서버 포트')
+    parser.add_argument('--no-browser', action='store_true', help='브라우저를 자동으로 열지 않음')
+    parser.add_argument('--storage-dir', default=STORAGE_DIR, help='시계열 세그먼트 저장 폴더')
+    parser.add_argument('--gpu-backend', default=GPU_BACKEND, help="'auto', 'nvml', 'gputil', 'fake[:N]', 'none'")
+    parser.add_argument('--proc-backend', default=PROC_BACKEND, choices=('auto', 'procfs', 'psutil'),
+                        help='CPU/메모리/디스크/네트워크 수집 경로')
+    parser.add_argument('--agent-listen', default=AGENT_LISTEN,
+                        help="에이전트 수신 주소 (tcp://host:port, unix:///path, 'none' = 수신 안 함)")
+    parser.add_argument('--agent-token', default=AGENT_TOKEN, help='에이전트 공유 토큰')
+    parser.add_argument('--alert-rules', default=ALERT_RULES, help='알림 규칙 JSON 파일 (기본값: 내장 규칙)')
+    parser.add_argument('--alert-log', default=ALERT_LOG, help='알림 상태 전이를 기록할 JSON Lines 파일')
+    parser.add_argument('--alert-webhook', default=ALERT_WEBHOOK, help='알림 상태 전이를 POST할 URL')
+    options = parser.parse_args(argv)
+
+    if options.duration < 0 or options.report_interval < 0:
+        parser.error('--duration과 --report-interval은 0 이상이어야 합니다')
+    options.rules = DEFAULT_RULES
+    if options.alert_rules:
+        try:
+            options.rules = load_rules(options.alert_rules)
+        except (OSError, ValueError) as e:
+            parser.error(f'알림 규칙을 읽을 수 없습니다: {e}')
+    if options.agent_listen == 'none':
+        options.agent_listen = None
+    if options.agent_listen and not options.headless:
+        try:
+            local = is_local_address(options.agent_listen)
+        except ValueError as e:
+            parser.error(f'잘못된 --agent-listen 주소입니다: {e}')
+        if not local and not options.agent_token:
+            parser.error('루프백이 아닌 주소로 에이전트를 받으려면 --agent-token이 필요합니다')
+    options.intervals = COLLECTOR_INTERVALS
+    options.always_collect = ALWAYS_COLLECT
+    return options
+
+
+def startup_ms() -> float:
+    """main.py 실행 시작 후 경과 시간 (ms)"""
+    return (time.monotonic() - STARTED) * 1000
+
+
+def print_report_event(event: str, payload):
+    """헤드리스 모드의 리포트 진행 알림 (완료/실패만 출력)"""
+    if payload['status'] == 'completed':
+        print(f"✓ PDF 리포트가 생성되었습니다: {payload['pdf_path']}")
+    elif payload['status'] == 'failed':
+        print(f"✗ PDF 리포트 생성 실패: {payload['error']}")
+
+
+def print_alert(transition):
+    """헤드리스 모드의 알림 상태 전이 출력"""
+    print(f"[{transition['timestamp']}] {transition['level'].upper():<8} {transition['message']}", flush=True)
+
+
+def print_anomaly(event):
+    """헤드리스 모드의 이상 징후(이상치 / 변화점) 출력"""
+    print(f"[{event['timestamp']}] {event['kind'].upper():<8} {event['message']}", flush=True)
+
+
+def attach_alert_sinks(monitor: SystemMonitor, options: argparse.Namespace):
+    """명령행으로 지정한 알림 파일 / 웹훅 싱크 연결"""
+    if options.alert_log:
+        os.makedirs(os.path.dirname(options.alert_log) or '.', exist_ok=True)
+        monitor.alerts.add_sink(FileSink(options.alert_log))
+    if options.alert_webhook:
+        monitor.alerts.add_sink(WebhookSink(options.alert_webhook))
+
+
+def save_profile(monitor: SystemMonitor) -> str:
+    """프로파일러 샘플을 접힌 스택 파일로 저장"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+    with open(path, 'w') as f:
+        f.write(monitor.instrumentation.profiler.collapsed())
+    return path
+
+
+def toggle_profiler(monitor: SystemMonitor):
+    """SIGUSR2 처리기 - 샘플링 프로파일러를 켜거나, 끄고 결과를 저장"""
+    profiler = monitor.instrumentation.profiler
+    if profiler.running:
+        profiler.stop()
+        print(f"프로파일러 중지: 샘플 {profiler.summary()['samples']}개 -> {save_profile(monitor)}", flush=True)
+    else:
+        profiler.start()
+        print("프로파일러 시작 (다시 SIGUSR2를 보내면 중지)", flush=True)
+
+
+def run_headless(monitor: SystemMonitor, options: argparse.Namespace):
+    """웹 서버 없이 수집 (duration초 후 또는 SIGTERM / Ctrl+C까지)
+
+    SIGUSR2를 받을 때마다 샘플링 프로파일러를 켜고 끕니다 (끌 때 PROFILE_DIR에 접힌 스택 저장).
+    """
+    from report_jobs import ReportJobQueue
+    from runner import MonitoringRun
+
+    report_jobs = ReportJobQueue(print_report_event)
+    run = MonitoringRun(monitor, report_jobs, options.intervals, options.duration, options.report_interval,
+                        METRIC_GROUPS)
+    signal.signal(signal.SIGTERM, lambda *_: run.stop())
+    monitor.alerts.add_sink(print_alert)
+    monitor.anomalies.add_sink(print_anomaly)
+    if hasattr(signal, 'SIGUSR2') and monitor.instrumentation.profiler.available:
+        signal.signal(signal.SIGUSR2, lambda *_: toggle_profiler(monitor))
+
+    first_sample = [True]
+
+    def on_sample(data):
+        if first_sample[0]:
+            first_sample[0] = False
+            print(f"첫 샘플 수집: 시작 후 {startup_ms():.0f}ms", flush=True)
 
-    print(f"클라이언트 연결됨")
-
-    # 모니터링이 아직 시작되지 않았으면 시작
-    if not monitoring_active:
-        monitoring_active = True
-        monitoring_thread = threading.Thread(target=monitoring_task)
-        monitoring_thread.daemon = True
-        monitoring_thread.start()
+    try:
+        completed = run.run(on_sample=on_sample)
+        print("\n모니터링 완료! PDF 리포트 생성 중..." if completed else "\n모니터링이 중단되었습니다.")
+    except KeyboardInterrupt:
+        print("\n모니터링이 중단되었습니다.")
+    if monitor.instrumentation.profiler.running:
+        toggle_profiler(monitor)
 
-@socketio.on('disconnect')
-def handle_disconnect():
-    """클라이언트 연결 해제"""
-    print("클라이언트 연결 해제됨")
+    # 마지막 구간 (회전이 없으면 전체 실행 구간) 리포트
+    job = run.final_report('final')
+    if job is not None:
+        job.wait()
+    report_jobs.shutdown()
 
-def open_browser():
-    """브라우저 자동 열기"""
-    time.sleep(1.5)  # 서버 시작 대기
-    webbrowser.open('http://localhost:5000')
 
 def main():
     """메인 함수"""
+    options = parse_args()
+
     print("=" * 60)
     print("시스템 리소스 모니터 시작")
     print("=" * 60)
     print()
-    print("📊 실시간 대시보드: http://localhost:5000")
-    print("⏱️  모니터링 시간: 5분")
-    print("📄 PDF 리포트: 자동 생성")
-    print()
-    print("브라우저가 자동으로 열립니다...")
-    print("종료하려면 Ctrl+C를 누르세요.")
+    print(f"⏱️  모니터링 시간: {f'{options.duration:g}초' if options.duration else '무제한'}")
+    if options.report_interval:
+        print(f"📄 PDF 리포트: {options.report_interval:g}초마다 + 종료 시")
+    else:
+        print("📄 PDF 리포트: 종료 시 자동 생성")
     print()
 
-    # 브라우저 자동 열기
-    browser_thread = threading.Thread(target=open_browser)
-    browser_thread.daemon = True
-    browser_thread.start()
+    monitor = SystemMonitor(storage_dir=options.storage_dir, gpu_backend=options.gpu_backend,
+                            proc_backend=options.proc_backend, alert_rules=options.rules)
+    attach_alert_sinks(monitor, options)
+    monitor.start_monitoring()
+
+    if options.headless:
+        run_headless(monitor, options)
+        return
+
+    # 첫 샘플은 웹 서버 모듈(Flask / eventlet)을 불러오기 전에 수집
+    monitor.collect_all_data()
+    print(f"첫 샘플 수집: 시작 후 {startup_ms():.0f}ms", flush=True)
+
+    # SIGTERM도 Ctrl+C와 같은 종료 경로 (히스토리 기록 + 리포트)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    import web
+    web.serve(monitor, options)
 
-    try:
-        # Flask 서버 시작
-        socketio.run(app, host='0.0.0.0', port=5000, debug=False)
-    except KeyboardInterrupt:
-        print("\n\n모니터링이 중단되었습니다.")
-        global monitoring_active
-        monitoring_active = False
-
-        # 중단되어도 지금까지의 데이터로 PDF 생성
-        if len(monitor.data_history['timestamps']) > 0:
-            print("지금까지 수집된 데이터로 PDF를 생성합니다...")
-            system_info = monitor.get_system_info()
-            report_gen = ReportGenerator(monitor, system_info)
-            pdf_path = report_gen.generate_report()
-            pdf_abs_path = os.path.abspath(pdf_path)
-            print(f"✓ PDF 리포트가 생성되었습니다: {pdf_abs_path}")
 
 if __name__ == '__main__':
     main()
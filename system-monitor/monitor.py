@@ -4,35 +4,357 @@ System Resource Monitor
 """
 
 import psutil
+import math
+import os
 import platform
 import time
 from datetime import datetime
-from typing import Dict, List, Any
-import GPUtil
-
-class SystemMonitor:
-    """시스템 리소스를 모니터링하는 클래스"""
-
-    def __init__(self):
-        self.data_history = {
-            'timestamps': [],
-            'cpu_percent': [],
-            'cpu_per_core': [],
-            'cpu_temp': [],
-            'memory_percent': [],
-            'memory_used': [],
-            'disk_percent': [],
-            'disk_read': [],
-            'disk_write': [],
-            'network_sent': [],
-            'network_recv': [],
-            'gpu_usage': [],
-            'gpu_temp': [],
-            'top_processes': []
-        }
+from collections import deque
+from typing import Dict, List, Any, Tuple
+from history import HistoryStore
+from stats import MetricStats, summarize_array
+from rollup import RollupStore, DEFAULT_TIERS
+from storage import SegmentStore
+from processes import ProcessTracker, DEFAULT_FULL_SCAN_INTERVAL
+from gpu import GPUCollector
+from instrumentation import Instrumentation
+from alerts import AlertEngine, DEFAULT_RULES, ALERT_GROUPS
+from anomaly import AnomalyDetector
+from procfs import ProcfsSource, CPU_TEMP_SENSORS, is_whole_disk, open_source
+
+# CPU 시간 분해 항목 (플랫폼에 없는 항목은 생략)
+CPU_BREAKDOWN_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+
+# 수집기별 기본 수집 주기 (초, None = 시작 시 한 번)
+DEFAULT_COLLECTOR_INTERVALS = {
+    'cpu': 0.1,
+    'network': 0.1,
+    'memory': 1.0,
+    'disk_io': 1.0,
+    'disk_usage': 5.0,
+    'gpu': 1.0,
+    'processes': 5.0,  # 상위 후보 프로세스만 재측정
+    'process_scan': DEFAULT_FULL_SCAN_INTERVAL,  # 전체 프로세스 재측정
+    'system_info': None
+}
+
+# 수집기 -> 대시보드 메트릭 그룹 (None = 구독과 무관하게 항상 수집)
+COLLECTOR_GROUPS = {
+    'cpu': 'cpu',
+    'network': 'network',
+    'memory': 'memory',
+    'disk_io': 'disk',
+    'disk_usage': 'disk',
+    'gpu': 'gpu',
+    'processes': 'processes',
+    'process_scan': 'processes',
+    'system_info': None
+}
+
+# 히스토리에 저장하는 스칼라 메트릭
+HISTORY_METRICS = (
+    'cpu_percent', 'cpu_temp', 'memory_percent', 'memory_used',
+    'disk_percent', 'disk_read', 'disk_write',
+    'network_sent', 'network_recv', 'gpu_usage', 'gpu_temp'
+)
+
+DEFAULT_HISTORY_CAPACITY = 36000  # 10 Hz 기준 1시간
+RAW_STORAGE_RETENTION = 7 * 86400  # 디스크에 보관하는 원본 샘플 기간 (초)
+PROCESS_HISTORY_SIZE = 720  # 상위 프로세스 목록 보관 개수 (5초 주기 기준 1시간)
+
+# 슬라이딩 윈도우 통계 구간 (초)
+STAT_WINDOWS = {'1m': 60, '5m': 300, '15m': 900}
+
+# 장치별 수집에서 제외하는 가상 장치 (이름 접두어)
+IGNORED_DISK_PREFIXES = ('loop', 'ram', 'zram', 'fd', 'sr')
+IGNORED_NIC_PREFIXES = ('lo', 'veth', 'ifb')
+MAX_DEVICES = 16  # 종류별 장치 수 상한 (히스토리 컬럼 폭)
+
+# 장치 종류 -> (수집 결과 그룹, 장치 목록 키) - 장치 이름 목록은 system_info[종류]
+DEVICE_KINDS = {
+    'disks': ('disk', 'devices'),
+    'mounts': ('disk', 'mounts'),
+    'interfaces': ('network', 'interfaces')
+}
+
+# 장치별 히스토리 컬럼 -> (장치 종류, 더할 필드) - i번째 행은 system_info[종류][i] 장치
+DEVICE_SERIES = {
+    'disk_read_per_device': ('disks', ('read_speed',)),
+    'disk_write_per_device': ('disks', ('write_speed',)),
+    'disk_iops_per_device': ('disks', ('read_iops', 'write_iops')),
+    'disk_await_per_device': ('disks', ('await',)),
+    'disk_queue_per_device': ('disks', ('queue_depth',)),
+    'disk_util_per_device': ('disks', ('util',)),
+    'mount_percent_per_device': ('mounts', ('percent',)),
+    'net_recv_per_device': ('interfaces', ('download_speed',)),
+    'net_sent_per_device': ('interfaces', ('upload_speed',)),
+    'net_packets_per_device': ('interfaces', ('recv_pps', 'sent_pps')),
+    'net_errors_per_device': ('interfaces', ('errors',)),
+    'net_drops_per_device': ('interfaces', ('drops',))
+}
+
+class HostHistory:
+    """호스트 하나의 히스토리 / 롤업 / 누적 통계
+
+    수집 결과(collect() 형식 dict)를 ingest()로 받아 저장하며, 로컬 수집기가 없으므로
+    원격 에이전트가 보낸 샘플의 저장소로도 사용합니다(aggregator.py).
+    """
+
+    def __init__(self, history_capacity: int = DEFAULT_HISTORY_CAPACITY, storage_dir: str = None,
+                 cpu_cores: int = 1, gpu_devices: int = 0, rollup_tiers=DEFAULT_TIERS,
+                 devices: Dict[str, List[str]] = None):
+        """cpu_cores / gpu_devices: 코어별 / GPU별 컬럼 폭, rollup_tiers: 다운샘플링 계층 (빈 값이면 없음)
+
+        devices: DEVICE_KINDS 종류 -> 장치 이름 목록 (system_info의 'disks', 'mounts', 'interfaces')
+        """
+        columns = {name: 0 for name in HISTORY_METRICS}
+        columns['cpu_per_core'] = max(1, cpu_cores or 1)
+        if gpu_devices:
+            # GPU별 사용률/온도 (gpu_usage/gpu_temp는 전체 평균/최고값)
+            columns['gpu_per_device'] = gpu_devices
+            columns['gpu_temp_per_device'] = gpu_devices
+        # 디스크/마운트/인터페이스별 컬럼 (장치가 있는 종류만, 샘플의 장치는 이름으로 행을 찾음)
+        self.devices = {kind: list(names)[:MAX_DEVICES] for kind, names in (devices or {}).items()
+                        if kind in DEVICE_KINDS and names}
+        self._device_index = {kind: {name: i for i, name in enumerate(names)}
+                              for kind, names in self.devices.items()}
+        self._device_series = {kind: [(column, fields) for column, (k, fields) in DEVICE_SERIES.items() if k == kind]
+                               for kind in self.devices}
+        for kind, series in self._device_series.items():
+            for column, _ in series:
+                columns[column] = len(self.devices[kind])
+        self.data_history = HistoryStore(history_capacity, columns)
+        # 모든 컬럼(장치별 행 포함)의 이상치 / 변화점 검출 (샘플마다 벡터 연산 한 번)
+        self.anomalies = AnomalyDetector(columns, {column: self.devices[kind]
+                                                   for column, (kind, _) in DEVICE_SERIES.items()
+                                                   if kind in self.devices})
+        # (epoch ms, 상위 프로세스 목록) - 프로세스 수집 시에만 추가
+        self.process_history = deque(maxlen=PROCESS_HISTORY_SIZE)
+        # 전체 실행 구간 누적 통계 (샘플마다 O(1) 갱신)
+        self.running_stats = {name: MetricStats() for name in HISTORY_METRICS}
+        # 10초 / 1분 / 1시간 다운샘플링 계층
+        self.rollups = RollupStore(self.data_history, HISTORY_METRICS, rollup_tiers)
+        # 디스크 세그먼트 저장소 (storage_dir 지정 시)
+        self.storage = []
+        if storage_dir:
+            self._attach_storage(storage_dir)
         self.start_time = None
+
+    def _attach_storage(self, directory: str):
+        """원본/롤업 히스토리를 디스크 세그먼트에 연결하고 이전 데이터 복원"""
+        targets = [('raw', self.data_history, 3600, RAW_STORAGE_RETENTION)]
+        for tier in self.rollups.tiers:
+            targets.append((tier.name, tier.store, 86400, tier.resolution * tier.store.capacity))
+
+        for name, history, segment_seconds, retention in targets:
+            segments = SegmentStore(os.path.join(directory, name), history.widths,
+                                    segment_seconds=segment_seconds, retention_seconds=retention)
+            # 최근 capacity개 레코드만 mmap에서 바로 링 버퍼로 복사
+            history.load(segments.tail(history.capacity))
+            history.sink = segments
+            self.storage.append(segments)
+
+    def close(self):
+        """진행 중인 롤업 버킷과 디스크 버퍼를 기록하고 파일 닫기"""
+        self.rollups.flush()
+        for segments in self.storage:
+            segments.close()
+
+    def ingest(self, data: Dict[str, Any]):
+        """수집 결과 하나를 히스토리에 추가"""
+        values = {}
+
+        # CPU
+        if 'error' not in data['cpu']:
+            values['cpu_percent'] = data['cpu']['percent']
+            values['cpu_per_core'] = data['cpu']['per_core']
+            values['cpu_temp'] = data['cpu']['temperature']
+
+        # Memory
+        if 'error' not in data['memory']:
+            values['memory_percent'] = data['memory']['percent']
+            values['memory_used'] = data['memory']['used']
+
+        # Disk
+        if 'error' not in data['disk']:
+            values['disk_percent'] = data['disk']['percent']
+            values['disk_read'] = data['disk']['read_speed']
+            values['disk_write'] = data['disk']['write_speed']
+
+        # Network
+        if 'error' not in data['network']:
+            values['network_sent'] = data['network']['upload_speed']
+            values['network_recv'] = data['network']['download_speed']
+
+        # GPU (전체 GPU 평균 사용률 / 최고 온도 + GPU별 값)
+        gpus = [gpu for gpu in data['gpu'] if 'error' not in gpu]
+        if gpus:
+            loads = [gpu['load'] for gpu in gpus]
+            temps = [gpu['temperature'] for gpu in gpus]
+            values['gpu_usage'] = sum(loads) / len(loads)
+            values['gpu_temp'] = max(temps)
+            values['gpu_per_device'] = loads
+            values['gpu_temp_per_device'] = temps
+
+        # 디스크/마운트/인터페이스별 값
+        for kind, index in self._device_index.items():
+            group, key = DEVICE_KINDS[kind]
+            items = data[group].get(key) if 'error' not in data[group] else None
+            if not items:
+                continue
+            rows = {column: [math.nan] * len(index) for column, _ in self._device_series[kind]}
+            for item in items:
+                i = index.get(item.get('name'))
+                if i is None:
+                    continue
+                for column, fields in self._device_series[kind]:
+                    rows[column][i] = sum(item.get(field) or 0 for field in fields)
+            values.update(rows)
+
+        timestamp_ms = int(data['epoch'] * 1000)
+        self.data_history.append(timestamp_ms, values)
+        self.rollups.add_sample(timestamp_ms, values)
+        # 이상치 / 변화점 검출 (새 이벤트는 싱크로 전달)
+        self.anomalies.update(timestamp_ms, values)
+
+        # 누적 통계 갱신
+        for name in HISTORY_METRICS:
+            value = values.get(name)
+            if value is not None and math.isfinite(value):
+                self.running_stats[name].update(value)
+
+        # Processes (새로 수집된 경우에만)
+        processes = data['processes']
+        if processes and (not self.process_history or self.process_history[-1][1] is not processes):
+            self.process_history.append((timestamp_ms, processes))
+
+    def get_statistics(self, window: float = None) -> Dict[str, Any]:
+        """통계 정보 계산
+
+        window가 None이면 전체 실행 구간의 누적 통계를 O(1)로 반환하고,
+        초 단위 window를 주면 히스토리의 해당 구간 뷰에서 계산합니다.
+        """
+        stats = {}
+
+        if window is None:
+            for key, metric_stats in self.running_stats.items():
+                if metric_stats.running.count > 0:
+                    stats[key] = metric_stats.summary()
+            return stats
+
+        views = self.data_history.window(window, list(HISTORY_METRICS))
+        for key, values in views.items():
+            summary = summarize_array(values)
+            if summary is not None:
+                stats[key] = summary
+
+        return stats
+
+    def query_history(self, metrics: List[str] = HISTORY_METRICS, start: float = None,
+                      end: float = None, max_points: int = 300) -> Dict[str, Any]:
+        """구간 [start, end] (epoch 초) 히스토리 조회
+
+        요청한 포인트 수를 채우는 가장 거친 계층(원본/10초/1분/1시간)을 선택하며,
+        결과는 메트릭별 min/max/avg/last 뷰입니다.
+        """
+        end_ms = int((time.time() if end is None else end) * 1000)
+        start_ms = 0 if start is None else int(start * 1000)
+        return self.rollups.query(metrics, start_ms, end_ms, max_points)
+
+    def get_windowed_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """STAT_WINDOWS 구간별 통계 (예: 최근 1/5/15분)"""
+        return {label: self.get_statistics(seconds) for label, seconds in STAT_WINDOWS.items()}
+
+    def start_monitoring(self):
+        """모니터링 시작"""
+        self.start_time = datetime.now()
+
+    def get_monitoring_duration(self) -> str:
+        """모니터링 기간 반환"""
+        if self.start_time:
+            duration = datetime.now() - self.start_time
+            return str(duration).split('.')[0]  # 마이크로초 제거
+        return "0:00:00"
+
+class MetricCollector:
+    """이 머신의 수집기 (CPU/메모리/디스크/네트워크/GPU/상위 프로세스)
+
+    히스토리, 알림 규칙, 이상 징후 검출 없이 collect() 형식 dict만 만듭니다
+    (agent.py - 저장과 평가는 중앙 서버가 담당).
+    """
+
+    def __init__(self, gpu_backend='auto', proc_backend='auto'):
+        """gpu_backend: 'auto', 'nvml', 'gputil', 'fake[:개수]', 'none' 또는 GPUBackend 인스턴스
+        proc_backend: CPU/메모리/디스크 I/O/네트워크/온도 수집 경로 - 'auto' (Linux면 procfs), 'procfs', 'psutil'
+                      또는 psutil 호환 객체
+        """
+        # psutil 모듈 또는 같은 함수를 제공하는 ProcfsSource (파일을 열어 두고 재사용)
+        self.source = open_source(proc_backend)
+        # GPU 백엔드는 한 번 열어 유지 (GPU가 없으면 결과를 캐시하고 재확인 간격을 늘림)
+        self.gpu = GPUCollector(gpu_backend)
+        # 장치별 수집 대상은 시작 시 한 번 정함 (히스토리 컬럼 폭이 고정이므로)
+        self.disk_devices = self._discover_disks()
+        self.mounts = self._discover_mounts()
+        self.interfaces = self._discover_interfaces()
         self.net_io_last = None
         self.disk_io_last = None
+        # 코어별 CPU 시간 스냅샷 (다음 호출과의 차이로 사용률 계산)
+        self.cpu_times_last = self.source.cpu_times(percpu=True)
+        # 프로세스 핸들을 유지하는 상위 프로세스 추적기
+        self.process_tracker = ProcessTracker()
+        # 수집기별 마지막 수집 결과
+        self.latest = {}
+        self.system_info = None
+        # 수집기 / 히스토리 저장 단계별 소요 시간
+        self.instrumentation = Instrumentation()
+
+    def close(self):
+        """GPU 핸들과 procfs 파일 닫기"""
+        self.gpu.close()
+        if isinstance(self.source, ProcfsSource):
+            self.source.close()
+
+    @property
+    def proc_backend_name(self) -> str:
+        return getattr(self.source, 'name', 'psutil')
+
+    def _discover_disks(self) -> List[str]:
+        """장치별로 수집할 물리 디스크 이름 (파티션과 loop/ram 등 가상 장치 제외)"""
+        try:
+            counters = self.source.disk_io_counters(perdisk=True) or {}
+        except Exception:
+            return []
+        return sorted(name for name in counters
+                      if is_whole_disk(name) and not name.startswith(IGNORED_DISK_PREFIXES))[:MAX_DEVICES]
+
+    @staticmethod
+    def _discover_mounts() -> List[Tuple[str, str]]:
+        """장치별로 수집할 (마운트 지점, 장치) 목록 - 같은 장치의 중복 마운트와 loop 장치 제외, '/'가 먼저"""
+        try:
+            partitions = psutil.disk_partitions(all=False)
+        except Exception:
+            return []
+        mounts, seen = [], set()
+        for partition in sorted(partitions, key=lambda p: (p.mountpoint != '/', len(p.mountpoint), p.mountpoint)):
+            if partition.device in seen or os.path.basename(partition.device).startswith(IGNORED_DISK_PREFIXES):
+                continue
+            seen.add(partition.device)
+            mounts.append((partition.mountpoint, partition.device))
+        return mounts[:MAX_DEVICES]
+
+    def _discover_interfaces(self) -> List[str]:
+        """장치별로 수집할 네트워크 인터페이스 이름 (루프백과 veth/ifb 가상 인터페이스 제외)"""
+        try:
+            counters = self.source.net_io_counters(pernic=True) or {}
+        except Exception:
+            return []
+        return sorted(name for name in counters if not name.startswith(IGNORED_NIC_PREFIXES))[:MAX_DEVICES]
+
+    def device_names(self) -> Dict[str, List[str]]:
+        """DEVICE_KINDS 종류별 장치 이름 목록 (히스토리 컬럼의 행 순서)"""
+        return {'disks': list(self.disk_devices),
+                'mounts': [mountpoint for mountpoint, _ in self.mounts],
+                'interfaces': list(self.interfaces)}
 
     def get_system_info(self) -> Dict[str, Any]:
         """시스템 기본 정보 수집"""
@@ -49,6 +371,10 @@ class SystemMonitor:
                 'cpu_threads': psutil.cpu_count(logical=True),
                 'cpu_freq_max': f"{cpu_freq.max:.2f} MHz" if cpu_freq else "N/A",
                 'total_memory': f"{mem.total / (1024**3):.2f} GB",
+                'gpu_count': self.gpu.device_count,
+                'gpu_backend': self.gpu.backend_name,
+                'proc_backend': self.proc_backend_name,
+                **self.device_names(),
                 'hostname': platform.node()
             }
         except Exception as e:
@@ -57,9 +383,8 @@ class SystemMonitor:
     def get_cpu_info(self) -> Dict[str, Any]:
         """CPU 정보 수집"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            cpu_per_core = psutil.cpu_percent(interval=0.1, percpu=True)
-            cpu_freq = psutil.cpu_freq()
+            cpu_percent, cpu_per_core, breakdown = self._compute_cpu_usage()
+            cpu_freq = self.source.cpu_freq()
 
             # CPU 온도 (Linux의 경우)
             cpu_temp = self._get_cpu_temperature()
@@ -67,21 +392,59 @@ class SystemMonitor:
             return {
                 'percent': cpu_percent,
                 'per_core': cpu_per_core,
+                'breakdown': breakdown,
                 'frequency': cpu_freq.current if cpu_freq else 0,
-                'temperature': cpu_temp,
-                'status': self._get_status(cpu_percent)
+                'temperature': cpu_temp
             }
         except Exception as e:
             return {'error': str(e)}
 
+    def _compute_cpu_usage(self):
+        """직전 스냅샷과의 CPU 시간 차이로 전체/코어별 사용률 계산 (대기 없음)"""
+        current = self.source.cpu_times(percpu=True)
+        previous = self.cpu_times_last
+        self.cpu_times_last = current
+
+        # 코어 수가 바뀐 경우 (CPU 핫플러그) 이번 구간은 0으로 처리
+        if len(previous) != len(current):
+            previous = current
+
+        fields = [f for f in CPU_BREAKDOWN_FIELDS if f in current[0]._fields]
+        field_deltas = dict.fromkeys(fields, 0.0)
+        per_core = []
+        total_busy = 0.0
+        total_all = 0.0
+
+        for prev, cur in zip(previous, current):
+            deltas = {f: max(0.0, getattr(cur, f) - getattr(prev, f)) for f in cur._fields}
+            # Linux에서 guest 시간은 user에 이미 포함되어 있음
+            all_delta = sum(deltas.values()) - deltas.get('guest', 0.0) - deltas.get('guest_nice', 0.0)
+            busy_delta = all_delta - deltas['idle'] - deltas.get('iowait', 0.0)
+
+            per_core.append(self._to_percent(busy_delta, all_delta))
+            total_busy += busy_delta
+            total_all += all_delta
+            for f in fields:
+                field_deltas[f] += deltas[f]
+
+        breakdown = {f: self._to_percent(d, total_all) for f, d in field_deltas.items()}
+        return self._to_percent(total_busy, total_all), per_core, breakdown
+
+    @staticmethod
+    def _to_percent(part: float, whole: float) -> float:
+        """비율을 0~100 범위의 퍼센트로 변환"""
+        if whole <= 0:
+            return 0.0
+        return round(min(100.0, max(0.0, part / whole * 100)), 1)
+
     def _get_cpu_temperature(self) -> float:
         """CPU 온도 가져오기"""
         try:
-            if hasattr(psutil, "sensors_temperatures"):
-                temps = psutil.sensors_temperatures()
+            if hasattr(self.source, "sensors_temperatures"):
+                temps = self.source.sensors_temperatures()
                 if temps:
                     # 다양한 센서 이름 시도
-                    for name in ['coretemp', 'cpu_thermal', 'k10temp', 'zenpower']:
+                    for name in CPU_TEMP_SENSORS:
                         if name in temps:
                             return temps[name][0].current
                     # 첫 번째 센서 사용
@@ -96,8 +459,8 @@ class SystemMonitor:
     def get_memory_info(self) -> Dict[str, Any]:
         """메모리 정보 수집"""
         try:
-            mem = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            mem = self.source.virtual_memory()
+            swap = self.source.swap_memory()
 
             return {
                 'percent': mem.percent,
@@ -105,218 +468,307 @@ class SystemMonitor:
                 'available': mem.available / (1024**3),  # GB
                 'total': mem.total / (1024**3),  # GB
                 'swap_percent': swap.percent,
-                'swap_used': swap.used / (1024**3),  # GB
-                'status': self._get_status(mem.percent)
+                'swap_used': swap.used / (1024**3)  # GB
             }
         except Exception as e:
             return {'error': str(e)}
 
-    def get_disk_info(self) -> Dict[str, Any]:
-        """디스크 정보 수집"""
+    def get_disk_usage(self) -> Dict[str, Any]:
+        """디스크 사용량 수집 ('/' + 마운트 지점별)"""
         try:
             disk = psutil.disk_usage('/')
-            disk_io = psutil.disk_io_counters()
+
+            # 마운트 지점별 사용량 (분리된 마운트는 건너뜀)
+            mounts = []
+            for mountpoint, device in self.mounts:
+                try:
+                    usage = psutil.disk_usage(mountpoint)
+                except OSError:
+                    continue
+                mounts.append({
+                    'name': mountpoint,
+                    'device': device,
+                    'percent': usage.percent,
+                    'used': usage.used / (1024**3),  # GB
+                    'free': usage.free / (1024**3),  # GB
+                    'total': usage.total / (1024**3)  # GB
+                })
+
+            return {
+                'percent': disk.percent,
+                'used': disk.used / (1024**3),  # GB
+                'free': disk.free / (1024**3),  # GB
+                'total': disk.total / (1024**3),  # GB
+                'mounts': mounts
+            }
+        except Exception as e:
+            return {'error': str(e)}
+
+    def get_disk_io(self, now: float = None) -> Dict[str, Any]:
+        """디스크 I/O 속도 수집 (now: 단조 시계 기준 틱 시각)"""
+        try:
+            if now is None:
+                now = time.monotonic()
+            # 디스크별 카운터를 한 번 읽어 전체(물리 디스크 합계)와 장치별 값을 함께 계산
+            counters = self.source.disk_io_counters(perdisk=True) or {}
+            read_bytes = write_bytes = 0
+            for name, counter in counters.items():
+                if is_whole_disk(name):
+                    read_bytes += counter.read_bytes
+                    write_bytes += counter.write_bytes
 
             # I/O 속도 계산
             read_speed = 0
             write_speed = 0
+            time_delta = 0
             if self.disk_io_last:
-                time_delta = time.time() - self.disk_io_last['time']
+                time_delta = now - self.disk_io_last['time']
                 if time_delta > 0:
-                    read_speed = (disk_io.read_bytes - self.disk_io_last['read']) / time_delta / (1024**2)  # MB/s
-                    write_speed = (disk_io.write_bytes - self.disk_io_last['write']) / time_delta / (1024**2)  # MB/s
+                    read_speed = (read_bytes - self.disk_io_last['read']) / time_delta / (1024**2)  # MB/s
+                    write_speed = (write_bytes - self.disk_io_last['write']) / time_delta / (1024**2)  # MB/s
+
+            devices = []
+            for name in self.disk_devices:
+                counter = counters.get(name)
+                if counter is None:
+                    continue
+                last = self.disk_io_last['devices'].get(name) if self.disk_io_last else None
+                devices.append(self._disk_device_rates(name, counter, last, time_delta))
 
             self.disk_io_last = {
-                'time': time.time(),
-                'read': disk_io.read_bytes,
-                'write': disk_io.write_bytes
+                'time': now,
+                'read': read_bytes,
+                'write': write_bytes,
+                'devices': counters
             }
 
             return {
-                'percent': disk.percent,
-                'used': disk.used / (1024**3),  # GB
-                'free': disk.free / (1024**3),  # GB
-                'total': disk.total / (1024**3),  # GB
                 'read_speed': read_speed,
                 'write_speed': write_speed,
-                'status': self._get_status(disk.percent)
+                'devices': devices
             }
         except Exception as e:
             return {'error': str(e)}
 
-    def get_network_info(self) -> Dict[str, Any]:
-        """네트워크 정보 수집"""
+    @staticmethod
+    def _disk_device_rates(name: str, current, last, time_delta: float) -> Dict[str, Any]:
+        """디스크 하나의 직전 수집 이후 IOPS, 속도, 평균 대기 시간, 큐 깊이, 사용률
+
+        await (ms) = 읽기/쓰기 시간 증가분 / 완료된 I/O 수, queue_depth = 읽기/쓰기 시간 증가분 / 경과 시간
+        util (%) = 장치가 I/O 중이던 시간(busy_time, Linux) / 경과 시간
+        """
+        if last is None or time_delta <= 0:
+            return {'name': name, 'read_iops': 0.0, 'write_iops': 0.0, 'read_speed': 0.0, 'write_speed': 0.0,
+                    'await': 0.0, 'queue_depth': 0.0, 'util': 0.0}
+
+        def delta(field: str) -> int:
+            return max(0, getattr(current, field, 0) - getattr(last, field, 0))
+
+        ios = delta('read_count') + delta('write_count')
+        io_ms = delta('read_time') + delta('write_time')
+        elapsed_ms = time_delta * 1000
+
+        return {
+            'name': name,
+            'read_iops': delta('read_count') / time_delta,
+            'write_iops': delta('write_count') / time_delta,
+            'read_speed': delta('read_bytes') / time_delta / (1024**2),  # MB/s
+            'write_speed': delta('write_bytes') / time_delta / (1024**2),  # MB/s
+            'await': io_ms / ios if ios else 0.0,  # ms
+            'queue_depth': io_ms / elapsed_ms,
+            'util': min(100.0, delta('busy_time') / elapsed_ms * 100)
+        }
+
+    def get_disk_info(self, now: float = None) -> Dict[str, Any]:
+        """디스크 정보 수집"""
+        return self._merge_disk(self.get_disk_usage(), self.get_disk_io(now))
+
+    @staticmethod
+    def _merge_disk(usage: Dict[str, Any], io: Dict[str, Any]) -> Dict[str, Any]:
+        """디스크 사용량과 I/O 결과 병합"""
+        if 'error' in usage:
+            return usage
+        if 'error' in io:
+            return io
+        return {**usage, **io}
+
+    def get_network_info(self, now: float = None) -> Dict[str, Any]:
+        """네트워크 정보 수집 (now: 단조 시계 기준 틱 시각)"""
         try:
-            net_io = psutil.net_io_counters()
+            if now is None:
+                now = time.monotonic()
+            # 인터페이스별 카운터를 한 번 읽어 전체(모든 인터페이스 합계)와 인터페이스별 값을 함께 계산
+            counters = self.source.net_io_counters(pernic=True) or {}
+            bytes_sent = sum(counter.bytes_sent for counter in counters.values())
+            bytes_recv = sum(counter.bytes_recv for counter in counters.values())
 
             # 네트워크 속도 계산
             upload_speed = 0
             download_speed = 0
+            time_delta = 0
             if self.net_io_last:
-                time_delta = time.time() - self.net_io_last['time']
+                time_delta = now - self.net_io_last['time']
                 if time_delta > 0:
-                    upload_speed = (net_io.bytes_sent - self.net_io_last['sent']) / time_delta / (1024**2)  # MB/s
-                    download_speed = (net_io.bytes_recv - self.net_io_last['recv']) / time_delta / (1024**2)  # MB/s
+                    upload_speed = (bytes_sent - self.net_io_last['sent']) / time_delta / (1024**2)  # MB/s
+                    download_speed = (bytes_recv - self.net_io_last['recv']) / time_delta / (1024**2)  # MB/s
+
+            interfaces = []
+            for name in self.interfaces:
+                counter = counters.get(name)
+                if counter is None:
+                    continue
+                last = self.net_io_last['interfaces'].get(name) if self.net_io_last else None
+                interfaces.append(self._interface_rates(name, counter, last, time_delta))
 
             self.net_io_last = {
-                'time': time.time(),
-                'sent': net_io.bytes_sent,
-                'recv': net_io.bytes_recv
+                'time': now,
+                'sent': bytes_sent,
+                'recv': bytes_recv,
+                'interfaces': counters
             }
 
             return {
-                'bytes_sent': net_io.bytes_sent / (1024**3),  # GB
-                'bytes_recv': net_io.bytes_recv / (1024**3),  # GB
+                'bytes_sent': bytes_sent / (1024**3),  # GB
+                'bytes_recv': bytes_recv / (1024**3),  # GB
                 'upload_speed': upload_speed,
                 'download_speed': download_speed,
-                'packets_sent': net_io.packets_sent,
-                'packets_recv': net_io.packets_recv
+                'packets_sent': sum(counter.packets_sent for counter in counters.values()),
+                'packets_recv': sum(counter.packets_recv for counter in counters.values()),
+                'interfaces': interfaces
             }
         except Exception as e:
             return {'error': str(e)}
 
-    def get_gpu_info(self) -> List[Dict[str, Any]]:
-        """GPU 정보 수집"""
-        try:
-            gpus = GPUtil.getGPUs()
-            gpu_list = []
-            for gpu in gpus:
-                gpu_list.append({
-                    'id': gpu.id,
-                    'name': gpu.name,
-                    'load': gpu.load * 100,  # 퍼센트로 변환
-                    'temperature': gpu.temperature,
-                    'memory_used': gpu.memoryUsed,  # MB
-                    'memory_total': gpu.memoryTotal,  # MB
-                    'memory_percent': (gpu.memoryUsed / gpu.memoryTotal * 100) if gpu.memoryTotal > 0 else 0,
-                    'status': self._get_status(gpu.load * 100)
-                })
-            return gpu_list
-        except Exception as e:
-            return [{'error': str(e)}]
+    @staticmethod
+    def _interface_rates(name: str, current, last, time_delta: float) -> Dict[str, Any]:
+        """인터페이스 하나의 직전 수집 이후 속도 (MB/s), 패킷/오류/드롭 수 (초당)"""
+        if last is None or time_delta <= 0:
+            return {'name': name, 'upload_speed': 0.0, 'download_speed': 0.0, 'sent_pps': 0.0, 'recv_pps': 0.0,
+                    'errors': 0.0, 'drops': 0.0}
+
+        def rate(field: str) -> float:
+            return max(0, getattr(current, field) - getattr(last, field)) / time_delta
+
+        return {
+            'name': name,
+            'upload_speed': rate('bytes_sent') / (1024**2),  # MB/s
+            'download_speed': rate('bytes_recv') / (1024**2),  # MB/s
+            'sent_pps': rate('packets_sent'),
+            'recv_pps': rate('packets_recv'),
+            'errors': rate('errin') + rate('errout'),
+            'drops': rate('dropin') + rate('dropout')
+        }
 
-    def get_top_processes(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """상위 프로세스 정보 수집"""
+    def get_gpu_info(self, now: float = None) -> List[Dict[str, Any]]:
+        """GPU 정보 수집 (모든 GPU, GPU가 없으면 빈 목록)"""
+        gpu_list = []
+        for gpu in self.gpu.read(now):
+            gpu_list.append({
+                **gpu,
+                'memory_percent': (gpu['memory_used'] / gpu['memory_total'] * 100) if gpu['memory_total'] > 0 else 0
+            })
+        return gpu_list
+
+    def get_top_processes(self, now: float = None, full_scan: bool = False) -> List[Dict[str, Any]]:
+        """상위 프로세스 정보 수집 (full_scan=False면 후보와 새 프로세스만 재측정)"""
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    pinfo = proc.info
-                    processes.append({
-                        'pid': pinfo['pid'],
-                        'name': pinfo['name'],
-                        'cpu_percent': pinfo['cpu_percent'] or 0,
-                        'memory_percent': pinfo['memory_percent'] or 0
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-
-            # CPU 사용률 기준으로 정렬
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-            return processes[:limit]
+            return self.process_tracker.update(now, full_scan)
         except Exception as e:
             return [{'error': str(e)}]
 
-    def _get_status(self, percent: float) -> str:
-        """상태 평가 (정상/경고/위험)"""
-        if percent < 60:
-            return 'normal'
-        elif percent < 80:
-            return 'warning'
-        else:
-            return 'critical'
-
-    def collect_all_data(self) -> Dict[str, Any]:
-        """모든 시스템 데이터 수집"""
-        timestamp = datetime.now()
-
-        data = {
-            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            'cpu': self.get_cpu_info(),
-            'memory': self.get_memory_info(),
-            'disk': self.get_disk_info(),
-            'network': self.get_network_info(),
-            'gpu': self.get_gpu_info(),
-            'processes': self.get_top_processes()
+    def sample(self, groups: List[str], now: float = None, wall_time: float = None) -> Dict[str, Any]:
+        """지정한 수집기만 실행하고 나머지는 마지막 결과로 채워 데이터 구성
+
+        now는 단조 시계 기준 틱 시각(속도 계산용), wall_time은 같은 틱의
+        epoch 시각(타임스탬프용)으로, 한 틱의 모든 수집기가 공유합니다.
+        """
+        if now is None:
+            now = time.monotonic()
+        if wall_time is None:
+            wall_time = time.time()
+
+        record = self.instrumentation.record
+        for group in groups:
+            started = time.perf_counter()
+            if group == 'cpu':
+                self.latest['cpu'] = self.get_cpu_info()
+            elif group == 'memory':
+                self.latest['memory'] = self.get_memory_info()
+            elif group == 'disk_usage':
+                self.latest['disk_usage'] = self.get_disk_usage()
+            elif group == 'disk_io':
+                self.latest['disk_io'] = self.get_disk_io(now)
+            elif group == 'network':
+                self.latest['network'] = self.get_network_info(now)
+            elif group == 'gpu':
+                self.latest['gpu'] = self.get_gpu_info(now)
+            elif group == 'processes' or (group == 'process_scan' and 'processes' not in groups):
+                self.latest['processes'] = self.get_top_processes(now, full_scan='process_scan' in groups)
+            elif group == 'system_info':
+                self.system_info = self.get_system_info()
+            else:
+                continue
+            record(group, time.perf_counter() - started)
+
+        return {
+            'timestamp': datetime.fromtimestamp(wall_time).strftime('%Y-%m-%d %H:%M:%S'),
+            'epoch': wall_time,
+            'cpu': self.latest.get('cpu', {'error': 'not collected'}),
+            'memory': self.latest.get('memory', {'error': 'not collected'}),
+            'disk': self._merge_disk(self.latest.get('disk_usage', {'error': 'not collected'}),
+                                     self.latest.get('disk_io', {'error': 'not collected'})),
+            'network': self.latest.get('network', {'error': 'not collected'}),
+            'gpu': self.latest.get('gpu', []),
+            'processes': self.latest.get('processes', [])
         }
 
-        # 히스토리에 저장
-        self._add_to_history(data)
-
-        return data
-
-    def _add_to_history(self, data: Dict[str, Any]):
-        """데이터 히스토리에 추가"""
-        self.data_history['timestamps'].append(data['timestamp'])
-
-        # CPU
-        if 'error' not in data['cpu']:
-            self.data_history['cpu_percent'].append(data['cpu']['percent'])
-            self.data_history['cpu_per_core'].append(data['cpu']['per_core'])
-            self.data_history['cpu_temp'].append(data['cpu']['temperature'])
-
-        # Memory
-        if 'error' not in data['memory']:
-            self.data_history['memory_percent'].append(data['memory']['percent'])
-            self.data_history['memory_used'].append(data['memory']['used'])
-
-        # Disk
-        if 'error' not in data['disk']:
-            self.data_history['disk_percent'].append(data['disk']['percent'])
-            self.data_history['disk_read'].append(data['disk']['read_speed'])
-            self.data_history['disk_write'].append(data['disk']['write_speed'])
-
-        # Network
-        if 'error' not in data['network']:
-            self.data_history['network_sent'].append(data['network']['upload_speed'])
-            self.data_history['network_recv'].append(data['network']['download_speed'])
-
-        # GPU
-        if data['gpu'] and 'error' not in data['gpu'][0]:
-            gpu_loads = [gpu['load'] for gpu in data['gpu']]
-            gpu_temps = [gpu['temperature'] for gpu in data['gpu']]
-            self.data_history['gpu_usage'].append(gpu_loads[0] if gpu_loads else 0)
-            self.data_history['gpu_temp'].append(gpu_temps[0] if gpu_temps else 0)
 
-        # Processes
-        self.data_history['top_processes'].append(data['processes'])
+class SystemMonitor(MetricCollector, HostHistory):
+    """시스템 리소스를 모니터링하는 클래스 (수집기 + 히스토리 + 알림 규칙 + 이상 징후 검출)"""
 
-    def get_statistics(self) -> Dict[str, Any]:
-        """통계 정보 계산"""
-        stats = {}
-
-        for key, values in self.data_history.items():
-            if key in ['timestamps', 'cpu_per_core', 'top_processes']:
-                continue
+    def __init__(self, history_capacity: int = DEFAULT_HISTORY_CAPACITY, storage_dir: str = None,
+                 gpu_backend='auto', rollup_tiers=DEFAULT_TIERS, proc_backend='auto', alert_rules=DEFAULT_RULES):
+        """gpu_backend / proc_backend: MetricCollector 참고
+        alert_rules: 구성 요소 상태와 알림을 정하는 규칙 (AlertRule 또는 설정 dict 목록, alerts.py)
+        """
+        MetricCollector.__init__(self, gpu_backend, proc_backend)
+        HostHistory.__init__(self, history_capacity, storage_dir, cpu_cores=psutil.cpu_count(logical=True),
+                             gpu_devices=self.gpu.device_count, rollup_tiers=rollup_tiers,
+                             devices=self.device_names())
+        # 새 수집 결과마다 평가하는 알림 규칙 (구성 요소 상태도 여기서 정함)
+        self.alerts = AlertEngine(alert_rules)
 
-            if values and len(values) > 0:
-                # GPU는 리스트일 수 있음
-                if isinstance(values[0], list):
-                    flat_values = [v for sublist in values for v in sublist if isinstance(v, (int, float))]
-                    if flat_values:
-                        stats[key] = {
-                            'avg': sum(flat_values) / len(flat_values),
-                            'min': min(flat_values),
-                            'max': max(flat_values)
-                        }
-                else:
-                    numeric_values = [v for v in values if isinstance(v, (int, float))]
-                    if numeric_values:
-                        stats[key] = {
-                            'avg': sum(numeric_values) / len(numeric_values),
-                            'min': min(numeric_values),
-                            'max': max(numeric_values)
-                        }
+    def close(self):
+        """히스토리를 기록하고 GPU 핸들과 procfs 파일 닫기"""
+        HostHistory.close(self)
+        MetricCollector.close(self)
 
-        return stats
-
-    def start_monitoring(self):
-        """모니터링 시작"""
-        self.start_time = datetime.now()
+    def collect_all_data(self, now: float = None, wall_time: float = None) -> Dict[str, Any]:
+        """모든 시스템 데이터 수집"""
+        return self.collect(list(DEFAULT_COLLECTOR_INTERVALS), now, wall_time)
+
+    def collect(self, groups: List[str], now: float = None, wall_time: float = None) -> Dict[str, Any]:
+        """sample()로 수집한 뒤 알림 규칙을 평가하고 히스토리에 저장"""
+        if now is None:
+            now = time.monotonic()
+        if wall_time is None:
+            wall_time = time.time()
+        data = self.sample(groups, now, wall_time)
+
+        # 이번 틱에 수집한 결과만 알림 규칙으로 평가 (규칙별 상수 시간)
+        record = self.instrumentation.record
+        started = time.perf_counter()
+        for group in groups:
+            component = COLLECTOR_GROUPS.get(group)
+            if component in ALERT_GROUPS and group in self.latest:
+                self.alerts.observe(component, self.latest[group], now, wall_time)
+        self.alerts.annotate(data)
+        record('alerts', time.perf_counter() - started)
+
+        # 히스토리에 저장 (이상 징후 검출은 따로 기록)
+        started = time.perf_counter()
+        self.ingest(data)
+        record('ingest', time.perf_counter() - started - self.anomalies.elapsed)
+        record('anomaly', self.anomalies.elapsed)
 
-    def get_monitoring_duration(self) -> str:
-        """모니터링 기간 반환"""
-        if self.start_time:
-            duration = datetime.now() - self.start_time
-            return str(duration).split('.')[0]  # 마이크로초 제거
-        return "0:00:00"
+        return data
@@ -0,0 +1,172 @@
+"""
+Process Tracker
+프로세스 핸들을 틱 사이에 유지하며 상위 N개만 갱신하는 증분 프로세스 추적기
+"""
+
+import heapq
+import time
+from typing import Dict, Any, List, Optional
+import psutil
+
+# 정렬 기준 (이름 -> 샘플 필드)
+SORT_KEYS = {
+    'cpu': 'cpu_percent',
+    'rss': 'rss',
+    'io': 'io_bytes',
+    'threads': 'threads'
+}
+
+CANDIDATE_FACTOR = 4  # 전체 스캔 사이에 매 틱 갱신하는 후보 수 (limit 배수)
+DEFAULT_FULL_SCAN_INTERVAL = 30.0  # 전체 프로세스 재측정 주기 (초)
+
+
+class TrackedProcess:
+    """추적 중인 프로세스 하나 (psutil 핸들 + 이전 측정값)"""
+
+    __slots__ = ('handle', 'pid', 'name', 'cpu_time', 'io_total', 'measured_at', 'sample')
+
+    def __init__(self, handle: psutil.Process, name: str):
+        self.handle = handle
+        self.pid = handle.pid
+        self.name = name
+        self.cpu_time = None
+        self.io_total = None
+        self.measured_at = None
+        self.sample = None
+
+
+class ProcessTracker:
+    """상위 N개 프로세스 추적기
+
+    매 틱에는 PID 목록만 비교해 새로 생긴/종료된 프로세스를 반영하고, 전체 스캔에서
+    고른 후보(limit x CANDIDATE_FACTOR개)와 새 프로세스만 다시 측정합니다.
+    전체 프로세스 재측정은 full_scan=True일 때(별도 느린 주기)만 수행합니다.
+    CPU/IO 사용량은 이전 측정과의 차이로 계산하며, 처음 본 프로세스는
+    생성 이후 평균을 사용하므로 0%로 표시되지 않습니다.
+    """
+
+    def __init__(self, limit: int = 5, sort_by: str = 'cpu', clock=time.monotonic):
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"unknown sort key: {sort_by}")
+        self.limit = limit
+        self.sort_by = sort_by
+        self.clock = clock
+        self.total_memory = psutil.virtual_memory().total
+        self._tracked: Dict[int, TrackedProcess] = {}
+        self._candidates = set()
+        self._scanned = False
+
+    def __len__(self) -> int:
+        return len(self._tracked)
+
+    def set_sort(self, sort_by: str):
+        """정렬 기준 변경 (마지막 측정값으로 후보 다시 선택)"""
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"unknown sort key: {sort_by}")
+        self.sort_by = sort_by
+        self._select_candidates()
+
+    def update(self, now: float = None, full_scan: bool = False) -> List[Dict[str, Any]]:
+        """프로세스 목록 변화를 반영하고 상위 limit개 반환"""
+        if now is None:
+            now = self.clock()
+        # 첫 호출은 모든 프로세스의 기준값이 필요하므로 전체 스캔
+        full_scan = full_scan or not self._scanned
+
+        pids = set(psutil.pids())
+        for pid in self._tracked.keys() - pids:
+            self._forget(pid)
+        for pid in pids - self._tracked.keys():
+            self._track(pid)
+
+        if full_scan:
+            targets = list(self._tracked.values())
+        else:
+            targets = [self._tracked[pid] for pid in self._candidates if pid in self._tracked]
+
+        for tracked in targets:
+            # 전체 스캔에서는 PID 재사용도 확인 (생성 시각 비교)
+            if full_scan and not tracked.handle.is_running():
+                self._forget(tracked.pid)
+                if self._track(tracked.pid) is None:
+                    continue
+                tracked = self._tracked[tracked.pid]
+            self._measure(tracked, now)
+
+        if full_scan:
+            self._scanned = True
+            self._select_candidates()
+
+        return self.top()
+
+    def top(self, limit: int = None, sort_by: str = None) -> List[Dict[str, Any]]:
+        """마지막 측정값 기준 상위 프로세스 (힙 선택, 재측정 없음)"""
+        key = SORT_KEYS[sort_by or self.sort_by]
+        samples = [t.sample for t in self._tracked.values() if t.sample is not None]
+        return heapq.nlargest(limit or self.limit, samples, key=lambda s: s[key])
+
+    def _select_candidates(self):
+        samples = self.top(self.limit * CANDIDATE_FACTOR)
+        self._candidates = {s['pid'] for s in samples}
+
+    def _track(self, pid: int) -> Optional[TrackedProcess]:
+        """새 PID의 핸들 생성 (다음 틱까지 매 틱 갱신하도록 후보에 추가)"""
+        try:
+            handle = psutil.Process(pid)
+            tracked = TrackedProcess(handle, handle.name())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        self._tracked[pid] = tracked
+        self._candidates.add(pid)
+        return tracked
+
+    def _forget(self, pid: int):
+        self._tracked.pop(pid, None)
+        self._candidates.discard(pid)
+
+    def _measure(self, tracked: TrackedProcess, now: float):
+        """프로세스 하나 측정 (oneshot으로 /proc 읽기 최소화)"""
+        handle = tracked.handle
+        try:
+            with handle.oneshot():
+                times = handle.cpu_times()
+                rss = handle.memory_info().rss
+                threads = handle.num_threads()
+                try:
+                    io = handle.io_counters()
+                    io_total = io.read_bytes + io.write_bytes
+                except (psutil.AccessDenied, AttributeError):
+                    io_total = None
+                created = handle.create_time() if tracked.measured_at is None else None
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self._forget(tracked.pid)
+            return
+        except psutil.AccessDenied:
+            return
+
+        cpu_time = times.user + times.system
+        if tracked.measured_at is None:
+            # 처음 본 프로세스: 생성 이후 평균 (벽시계 기준 경과 시간)
+            elapsed = max(time.time() - created, 1e-3)
+            cpu_percent = cpu_time / elapsed * 100
+            io_rate = io_total / elapsed if io_total is not None else 0.0
+        else:
+            elapsed = max(now - tracked.measured_at, 1e-3)
+            cpu_percent = max(0.0, cpu_time - tracked.cpu_time) / elapsed * 100
+            if io_total is not None and tracked.io_total is not None:
+                io_rate = max(0, io_total - tracked.io_total) / elapsed
+            else:
+                io_rate = 0.0
+
+        tracked.cpu_time = cpu_time
+        tracked.io_total = io_total
+        tracked.measured_at = now
+        tracked.sample = {
+            'pid': tracked.pid,
+            'name': tracked.name,
+            'cpu_percent': cpu_percent,
+            'memory_percent': rss / self.total_memory * 100 if self.total_memory else 0,
+            'rss': rss,
+            'io_bytes': io_rate,  # bytes/s
+            'threads': threads
+        }
@@ -0,0 +1,298 @@
+"""
+Linux procfs Source
+/proc, /sys 파일을 한 번 열어 두고 틱마다 pread로 다시 읽는 Linux 전용 빠른 수집 경로
+
+ProcfsSource는 SystemMonitor가 사용하는 psutil 함수(cpu_times, cpu_freq, virtual_memory,
+swap_memory, disk_io_counters, net_io_counters, sensors_temperatures)와 같은 이름과 필드의
+결과를 돌려주므로 psutil 모듈 대신 그대로 끼워 쓸 수 있습니다. 호출마다 파일을 열고 닫지 않고,
+재사용 버퍼에 읽은 뒤 필요한 필드만 파싱합니다.
+"""
+
+import glob
+import os
+import re
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+# psutil과 같은 필드 이름 (SystemMonitor가 읽는 필드 위주)
+cputimes = namedtuple('cputimes', 'user nice system idle iowait irq softirq steal guest guest_nice')
+scpufreq = namedtuple('scpufreq', 'current min max')
+svmem = namedtuple('svmem', 'total available percent used free buffers cached shared')
+sswap = namedtuple('sswap', 'total used free percent')
+sdiskio = namedtuple('sdiskio', 'read_count write_count read_bytes write_bytes read_time write_time busy_time')
+snetio = namedtuple('snetio', 'bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout')
+shwtemp = namedtuple('shwtemp', 'label current high critical')
+
+# CPU 온도로 우선 사용하는 센서 이름 (없으면 첫 번째 센서)
+CPU_TEMP_SENSORS = ('coretemp', 'cpu_thermal', 'k10temp', 'zenpower')
+
+DISK_SECTOR_SIZE = 512  # /proc/diskstats의 섹터 단위 (장치 섹터 크기와 무관)
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+# /proc/meminfo에서 찾는 줄 (앞의 줄바꿈으로 'SwapCached:' 등과 구분)
+MEMINFO_FIELDS = tuple(b'\n' + key + b':' for key in (
+    b'MemTotal', b'MemFree', b'MemAvailable', b'Buffers', b'Cached', b'SReclaimable', b'Shmem',
+    b'SwapTotal', b'SwapFree'))
+
+
+class ProcFile:
+    """열어 둔 procfs/sysfs 파일 하나 - 오프셋 0부터 pread로 재사용 버퍼에 다시 읽음
+
+    버퍼가 가득 차면(파일이 더 큼) 두 배로 늘려 다시 읽으므로, 한 번 커진 뒤에는
+    틱마다 파일 열기나 버퍼 할당 없이 시스템 호출 하나로 읽습니다.
+    """
+
+    def __init__(self, path: str, size: int = 4096):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+        self._buffer = bytearray(size)
+
+    def read(self) -> bytes:
+        while True:
+            size = os.preadv(self.fd, [self._buffer], 0)
+            if size < len(self._buffer):
+                return bytes(memoryview(self._buffer)[:size])
+            self._buffer = bytearray(len(self._buffer) * 2)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+_whole_disks: Dict[str, bool] = {}
+
+
+def is_whole_disk(name: str) -> bool:
+    """파티션이 아닌 장치인지 (/sys/block에 있는 장치, psutil의 디스크 합계와 같은 기준)
+
+    /sys/block이 없는 플랫폼에서는 모든 이름을 장치로 취급합니다.
+    """
+    whole = _whole_disks.get(name)
+    if whole is None:
+        whole = _whole_disks[name] = (not os.path.isdir('/sys/block') or
+                                      os.path.exists('/sys/block/' + name.replace('/', '!')))
+    return whole
+
+
+def _cpu_temperature_file() -> Optional[tuple]:
+    """psutil.sensors_temperatures()와 같은 순서로 CPU 온도 센서 선택 -> (이름, 경로) 또는 None
+
+    센서 장치별 첫 번째 temp*_input을 모은 뒤 CPU_TEMP_SENSORS 순서로, 없으면 첫 장치를 고릅니다.
+    hwmon이 없으면 thermal_zone*/temp를 사용합니다.
+    """
+    sensors = {}
+    bases = glob.glob('/sys/class/hwmon/hwmon*/temp*_*') + glob.glob('/sys/class/hwmon/hwmon*/device/temp*_*')
+    for base in sorted({path.split('_')[0] for path in bases}):
+        try:
+            with open(os.path.join(os.path.dirname(base), 'name')) as f:
+                name = f.read().strip()
+        except OSError:
+            continue
+        if os.path.exists(base + '_input'):
+            sensors.setdefault(name, base + '_input')
+
+    if not bases:
+        for zone in sorted(glob.glob('/sys/class/thermal/thermal_zone*')):
+            try:
+                with open(os.path.join(zone, 'type')) as f:
+                    name = f.read().strip()
+            except OSError:
+                continue
+            sensors.setdefault(name, os.path.join(zone, 'temp'))
+
+    for name in CPU_TEMP_SENSORS:
+        if name in sensors:
+            return name, sensors[name]
+    return next(iter(sensors.items()), None)
+
+
+class ProcfsSource:
+    """psutil 호환 Linux 수집 경로 (파일을 열어 둔 채 재사용)
+
+    /proc/stat, /proc/meminfo, /proc/diskstats, /proc/net/dev, CPU 주파수 파일과
+    선택한 온도 센서 파일을 생성 시 열어 두며, /proc/stat과 /proc/meminfo가 없으면 OSError를 냅니다.
+    """
+
+    name = 'procfs'
+
+    def __init__(self, procfs: str = '/proc'):
+        self._files: List[ProcFile] = []
+        self._stat = self._open(os.path.join(procfs, 'stat'))
+        self._meminfo = self._open(os.path.join(procfs, 'meminfo'))
+        self._diskstats = self._open_optional(os.path.join(procfs, 'diskstats'))
+        self._net_dev = self._open_optional(os.path.join(procfs, 'net', 'dev'))
+
+        # CPU 주파수: cpufreq의 scaling_cur_freq (정책별, kHz), 없으면 /proc/cpuinfo의 'cpu MHz'
+        paths = (glob.glob('/sys/devices/system/cpu/cpufreq/policy[0-9]*') or
+                 glob.glob('/sys/devices/system/cpu/cpu[0-9]*/cpufreq'))
+        paths.sort(key=lambda path: int(re.search(r'[0-9]+', path).group()))
+        self._freq_files = [f for f in (self._open_optional(os.path.join(p, 'scaling_cur_freq')) for p in paths) if f]
+        self._freq_range = (0.0, 0.0)
+        if self._freq_files:
+            self._freq_range = (self._read_khz_average(paths, 'scaling_min_freq'),
+                                self._read_khz_average(paths, 'scaling_max_freq'))
+            self._cpuinfo = None
+        else:
+            self._cpuinfo = self._open_optional(os.path.join(procfs, 'cpuinfo'), size=65536)
+
+        sensor = _cpu_temperature_file()
+        self._temp_name = sensor[0] if sensor else None
+        self._temp = self._open_optional(sensor[1], size=64) if sensor else None
+
+        header = self._stat.read().split(b'\n', 1)[0].split()
+        self._cpu_fields = min(len(header) - 1, len(cputimes._fields))
+
+    def _open(self, path: str, size: int = 4096) -> ProcFile:
+        proc_file = ProcFile(path, size)
+        self._files.append(proc_file)
+        return proc_file
+
+    def _open_optional(self, path: str, size: int = 4096) -> Optional[ProcFile]:
+        try:
+            return self._open(path, size)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_khz_average(paths: List[str], filename: str) -> float:
+        values = []
+        for path in paths:
+            try:
+                with open(os.path.join(path, filename)) as f:
+                    values.append(int(f.read()) / 1000)
+            except (OSError, ValueError):
+                pass
+        return sum(values) / len(values) if values else 0.0
+
+    def close(self):
+        for proc_file in self._files:
+            proc_file.close()
+        self._files = []
+
+    def cpu_times(self, percpu: bool = True) -> List[cputimes]:
+        """코어별 CPU 시간 (초) - psutil.cpu_times(percpu=True)와 같은 필드"""
+        data = self._stat.read()
+        count = self._cpu_fields
+        # 'cpu ' 합계 줄 다음의 'cpuN' 줄만 파싱 (뒤따르는 intr/ctxt 등은 건너뜀)
+        end = data.find(b'\nintr')
+        lines = (data[:end] if end >= 0 else data).split(b'\n')
+        padding = [0.0] * (len(cputimes._fields) - count)
+        if not percpu:
+            return cputimes._make([int(v) / CLOCK_TICKS for v in lines[0].split()[1:count + 1]] + padding)
+        return [cputimes._make([int(v) / CLOCK_TICKS for v in line.split()[1:count + 1]] + padding)
+                for line in lines[1:] if line.startswith(b'cpu')]
+
+    def cpu_freq(self) -> Optional[scpufreq]:
+        """평균 현재 주파수 (MHz) - psutil.cpu_freq()와 같은 필드, 알 수 없으면 None"""
+        if self._freq_files:
+            values = [int(f.read()) / 1000 for f in self._freq_files]
+        elif self._cpuinfo is not None:
+            values = [float(line.split(b':', 1)[1]) for line in self._cpuinfo.read().split(b'\n')
+                      if line.startswith(b'cpu MHz')]
+        else:
+            return None
+        if not values:
+            return None
+        return scpufreq(sum(values) / len(values), *self._freq_range)
+
+    def _meminfo_values(self) -> Dict[bytes, int]:
+        """필요한 줄만 찾아 바이트 단위로 변환 (전체 줄을 나누지 않음)"""
+        data = b'\n' + self._meminfo.read()
+        values = {}
+        for field in MEMINFO_FIELDS:
+            start = data.find(field)
+            if start >= 0:
+                start += len(field)
+                values[field[1:-1]] = int(data[start:data.find(b'\n', start)].split()[0]) * 1024
+        return values
+
+    def virtual_memory(self) -> svmem:
+        """psutil.virtual_memory()와 같은 계산 (free 명령과 일치)"""
+        mem = self._meminfo_values()
+        total = mem[b'MemTotal']
+        free = mem[b'MemFree']
+        buffers = mem.get(b'Buffers', 0)
+        cached = mem.get(b'Cached', 0) + mem.get(b'SReclaimable', 0)
+        used = total - free - cached - buffers
+        if used < 0:
+            used = total - free
+        available = mem.get(b'MemAvailable') or free + buffers + cached
+        available = max(0, available) if available <= total else free
+        percent = round((total - available) / total * 100, 1) if total else 0.0
+        return svmem(total, available, percent, used, free, buffers, cached, mem.get(b'Shmem', 0))
+
+    def swap_memory(self) -> sswap:
+        mem = self._meminfo_values()
+        total = mem.get(b'SwapTotal', 0)
+        free = mem.get(b'SwapFree', 0)
+        used = total - free
+        return sswap(total, used, free, round(used / total * 100, 1) if total else 0.0)
+
+    def disk_io_counters(self, perdisk: bool = False):
+        """psutil.disk_io_counters()와 같은 필드
+
+        perdisk=False면 파티션을 뺀 전체 디스크 합계, True면 장치 이름 -> 카운터 dict (파티션 포함)
+        """
+        if self._diskstats is None:
+            raise OSError('/proc/diskstats not available')
+        disks = {}
+        for line in self._diskstats.read().split(b'\n'):
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            # major minor name reads reads_merged sectors_read read_ms writes writes_merged sectors_written
+            # write_ms in_flight io_ms ...
+            disks[fields[2].decode()] = sdiskio(int(fields[3]), int(fields[7]),
+                                                int(fields[5]) * DISK_SECTOR_SIZE, int(fields[9]) * DISK_SECTOR_SIZE,
+                                                int(fields[6]), int(fields[10]), int(fields[12]))
+        if perdisk:
+            return disks
+        totals = [sum(column) for column in zip(*(c for name, c in disks.items() if is_whole_disk(name)))]
+        return sdiskio._make(totals or [0] * len(sdiskio._fields))
+
+    def net_io_counters(self, pernic: bool = False):
+        """psutil.net_io_counters()와 같은 필드 - pernic=False면 모든 인터페이스 합계, True면 이름 -> 카운터"""
+        if self._net_dev is None:
+            raise OSError('/proc/net/dev not available')
+        nics = {}
+        for line in self._net_dev.read().split(b'\n')[2:]:
+            name, _, rest = line.rpartition(b':')
+            fields = rest.split()
+            if len(fields) < 12:
+                continue
+            # 수신: bytes packets errs drop ... / 송신: 9번째 열부터 bytes packets errs drop
+            nics[name.strip().decode()] = snetio(int(fields[8]), int(fields[0]), int(fields[9]), int(fields[1]),
+                                                 int(fields[2]), int(fields[10]), int(fields[3]), int(fields[11]))
+        if pernic:
+            return nics
+        totals = [sum(column) for column in zip(*nics.values())]
+        return snetio._make(totals or [0] * len(snetio._fields))
+
+    def sensors_temperatures(self) -> Dict[str, List[shwtemp]]:
+        """선택한 CPU 온도 센서 하나만 psutil.sensors_temperatures() 형식으로 반환 (없으면 빈 dict)"""
+        if self._temp is None:
+            return {}
+        return {self._temp_name: [shwtemp('', int(self._temp.read()) / 1000.0, None, None)]}
+
+
+def open_source(backend='auto'):
+    """수집 경로 지정 -> psutil 모듈, ProcfsSource 또는 지정한 객체
+
+    'auto' (Linux에서 /proc을 열 수 있으면 procfs, 아니면 psutil), 'procfs', 'psutil',
+    또는 psutil과 같은 함수를 제공하는 객체 (벤치마크의 가짜 psutil 등, 그대로 사용)
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend == 'psutil':
+        import psutil
+        return psutil
+    if backend not in ('auto', 'procfs'):
+        raise ValueError(f"unknown proc backend: {backend}")
+    try:
+        return ProcfsSource()
+    except (OSError, ValueError, AttributeError):
+        if backend == 'procfs':
+            raise
+        import psutil
+        return psutil
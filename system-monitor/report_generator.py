@@ -3,70 +3,365 @@ PDF Report Generator
 모니터링 데이터를 기반으로 PDF 리포트 생성
 """
 
-import matplotlib
-matplotlib.use('Agg')  # GUI 없이 사용
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional, Sequence, Tuple
 import numpy as np
+from monitor import HISTORY_METRICS, DEVICE_SERIES
+from decimation import decimate_minmax
+
+REPORT_MAX_POINTS = 2000  # 그래프당 목표 포인트 수 (다운샘플링 계층 선택 기준)
+PLOT_WIDTH_PX = 1100  # 페이지 폭 (11in x 100dpi) - 그래프는 이 버킷 수로 줄여 그림
+# 장치별 그래프용 (원본 계층에서만 복사)
+DEVICE_COLUMNS = ('gpu_per_device', 'gpu_temp_per_device') + tuple(DEVICE_SERIES)
+DEVICE_COLORS = ('#10b981', '#3b82f6', '#f59e0b', '#ef4444', '#8b5cf6', '#ec4899', '#14b8a6', '#64748b')
+
+# 리포트 페이지 순서 (페이지 이름 -> ReportGenerator 메서드)
+REPORT_PAGES = (
+    ('title', '_create_title_page'),              # 페이지 1: 표지 및 요약
+    ('cpu_memory', '_create_cpu_memory_page'),    # 페이지 2: CPU 및 메모리
+    ('gpu_disk', '_create_gpu_disk_page'),        # 페이지 3: GPU 및 디스크
+    ('network', '_create_network_page'),          # 페이지 4: 네트워크
+    ('disk_devices', '_create_disk_devices_page'),        # 페이지 5: 디스크 장치 / 마운트별
+    ('network_devices', '_create_network_devices_page'),  # 페이지 6: 네트워크 인터페이스별
+    ('statistics', '_create_statistics_page'),    # 페이지 7: 통계 요약
+    ('anomalies', '_create_anomalies_page'),      # 페이지 8: 이상 징후 (이상치 / 변화점)
+)
+
+# 이상 징후 종류 -> (색, 선 모양, 범례) - 그래프의 세로선
+ANOMALY_STYLES = {
+    'anomaly': ('#dc2626', ':', '이상치'),
+    'change': ('#ea580c', '--', '변화점')
+}
+ANOMALY_TABLE_ROWS = 25  # 이상 징후 페이지 표에 넣는 최근 이벤트 수
+
+REPORT_METADATA = {
+    'Title': '시스템 리소스 모니터링 리포트',
+    'Author': 'System Monitor',
+    'Subject': '시스템 리소스 모니터링 결과',
+    'Keywords': 'System Monitoring Performance'
+}
+
+_plt = None
+
+
+def _pyplot():
+    """matplotlib은 처음 그릴 때 불러옴 (대시보드 시작 시 로딩 비용 제거)"""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # GUI 없이 사용
+        import matplotlib.pyplot as pyplot
+        _plt = pyplot
+    return _plt
+
+
+def _pdf_writer():
+    """페이지 병합용 pypdf PdfWriter 클래스 (설치되지 않았으면 None)"""
+    try:
+        from pypdf import PdfWriter
+        return PdfWriter
+    except ImportError:
+        return None
+
+
+def render_pages(snapshot: 'ReportSnapshot', filename: str, pages: Sequence[str],
+                 plot_width: Optional[int] = PLOT_WIDTH_PX) -> str:
+    """지정한 페이지만 PDF로 렌더링 (작업 프로세스에서 실행)"""
+    _pyplot()
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    generator = ReportGenerator.from_snapshot(snapshot, plot_width)
+    methods = dict(REPORT_PAGES)
+    with PdfPages(filename) as pdf:
+        for page in pages:
+            getattr(generator, methods[page])(pdf)
+
+        # 메타데이터
+        d = pdf.infodict()
+        d.update(REPORT_METADATA)
+        d['CreationDate'] = datetime.now()
+    return filename
+
+
+def merge_pages(page_files: Sequence[str], filename: str) -> str:
+    """페이지별 PDF를 순서대로 하나로 병합하고 임시 파일 삭제"""
+    writer = _pdf_writer()()
+    for path in page_files:
+        writer.append(path)
+    writer.add_metadata({f'/{key}': value for key, value in REPORT_METADATA.items()})
+    with open(filename, 'wb') as f:
+        writer.write(f)
+    for path in page_files:
+        os.remove(path)
+    return filename
+
+class ReportSnapshot:
+    """리포트 생성에 필요한 데이터의 불변 스냅샷
+
+    조회한 계층의 배열을 복사해 두므로 이후 샘플링과 무관하며,
+    작은 NumPy 버퍼로만 구성되어 다른 프로세스로 바로 전달할 수 있습니다.
+    """
+
+    def __init__(self, system_info: Dict[str, Any], start_time: datetime, end_time: datetime,
+                 history: Dict[str, Any], stats: Dict[str, Any] = None,
+                 total_samples: int = None, sampling_interval: float = 0.0,
+                 devices: Dict[str, np.ndarray] = None, anomalies: Sequence[Dict[str, Any]] = ()):
+        """history: query_history 형식 조회 결과, stats가 None이면 조회 결과로 통계 계산
+
+        devices: 장치별 컬럼 이름 -> (장치 수 x 시간) 배열 (timestamps와 같은 구간)
+        anomalies: 구간 안의 이상 징후 이벤트 (AnomalyDetector.events() 형식)
+        """
+        self.system_info = dict(system_info)
+        self.start_time = start_time
+        self.end_time = end_time
+
+        self.tier = history['tier']
+        self.timestamps = _frozen_copy(history['timestamps'])
+        # 원본 계층은 min/max/avg가 같은 값이므로 avg만 복사
+        aggregates = ('avg',) if self.tier == 'raw' else ('min', 'max', 'avg')
+        self.series = {
+            metric: {agg: _frozen_copy(series[agg]) for agg in aggregates}
+            for metric, series in history['series'].items()
+        }
+
+        self.devices = {name: _frozen_copy(values) for name, values in (devices or {}).items()}
+        self.anomalies = [dict(event) for event in anomalies]
+
+        self.total_samples = len(self.timestamps) if total_samples is None else total_samples
+        self.sampling_interval = sampling_interval
+        self.stats = self._series_statistics() if stats is None else stats
+
+    @classmethod
+    def capture(cls, monitor, system_info: Dict[str, Any], start: float = None) -> 'ReportSnapshot':
+        """모니터의 현재 히스토리로 스냅샷 생성
+
+        start: 리포트 구간 시작 (epoch 초, 기본값은 모니터링 시작 시각)
+        """
+        custom_period = start is not None
+        if start is None and monitor.start_time:
+            start = monitor.start_time.timestamp()
+
+        # 리포트 구간 전체를 덮는 가장 거친 해상도 계층에서 조회
+        history = monitor.query_history(HISTORY_METRICS, start=start, max_points=REPORT_MAX_POINTS)
+        raw_timestamps = monitor.data_history['timestamps']
+        sampling_interval = float(np.median(np.diff(raw_timestamps))) / 1000.0 if len(raw_timestamps) > 1 else 0.0
+
+        # 장치별 값은 원본 계층에만 있으므로 원본 구간을 조회한 경우에만 함께 복사
+        devices = {}
+        if history['tier'] == 'raw' and len(history['timestamps']):
+            lo = int(np.searchsorted(raw_timestamps, history['timestamps'][0], side='left'))
+            hi = lo + len(history['timestamps'])
+            devices = {name: monitor.data_history[name][:, lo:hi]
+                       for name in DEVICE_COLUMNS if name in monitor.data_history}
+
+        return cls(system_info,
+                   datetime.fromtimestamp(start) if start is not None else datetime.now(),
+                   datetime.now(),
+                   history,
+                   # 이번 실행 구간은 누적 통계, 지정한 구간(이전 실행 포함)은 조회 결과로 계산
+                   stats=None if custom_period else monitor.get_statistics(),
+                   total_samples=monitor.data_history.total_appended,
+                   sampling_interval=sampling_interval,
+                   devices=devices,
+                   anomalies=monitor.anomalies.events(since=start))
+
+    def _series_statistics(self) -> Dict[str, Any]:
+        """조회한 계층의 버킷 값으로 구간 통계 계산"""
+        stats = {}
+        for metric, series in self.series.items():
+            avg = series['avg'][np.isfinite(series['avg'])]
+            if avg.size == 0:
+                continue
+            stats[metric] = {
+                'avg': float(avg.mean(dtype=np.float64)),
+                'min': float(np.nanmin(series.get('min', series['avg']))),
+                'max': float(np.nanmax(series.get('max', series['avg']))),
+                'p95': float(np.percentile(avg, 95))
+            }
+        return stats
+
+
+def _frozen_copy(values: np.ndarray) -> np.ndarray:
+    """읽기 전용 복사본"""
+    copy = np.array(values)
+    copy.flags.writeable = False
+    return copy
+
 
 class ReportGenerator:
     """PDF 리포트 생성 클래스"""
 
-    def __init__(self, monitor, system_info: Dict[str, Any]):
-        self.monitor = monitor
-        self.system_info = system_info
-        self.data_history = monitor.data_history
-        self.stats = monitor.get_statistics()
-
-    def generate_report(self, filename: str = None) -> str:
-        """PDF 리포트 생성"""
+    def __init__(self, monitor, system_info: Dict[str, Any], start: float = None):
+        """start: 리포트 구간 시작 (epoch 초, 기본값은 모니터링 시작 시각)"""
+        self._load(ReportSnapshot.capture(monitor, system_info, start))
+
+    @classmethod
+    def from_snapshot(cls, snapshot: ReportSnapshot, plot_width: int = PLOT_WIDTH_PX) -> 'ReportGenerator':
+        """스냅샷으로 생성 (모니터 없이 다른 프로세스에서 사용)
+
+        plot_width: 그래프 데이터를 줄일 버킷 수 (None이면 전체 데이터를 그림)
+        """
+        generator = cls.__new__(cls)
+        generator._load(snapshot, plot_width)
+        return generator
+
+    def _load(self, snapshot: ReportSnapshot, plot_width: int = PLOT_WIDTH_PX):
+        self.snapshot = snapshot
+        self.plot_width = plot_width
+        self.system_info = snapshot.system_info
+        self.start_time = snapshot.start_time
+        self.end_time = snapshot.end_time
+        self.tier = snapshot.tier
+
+        # 그래프용 데이터는 페이지 폭에 맞춰 줄임 (통계는 스냅샷 전체 데이터 기준)
+        series = {metric: series['avg'] for metric, series in snapshot.series.items()}
+        for name, rows in snapshot.devices.items():
+            for index, row in enumerate(rows):
+                series[f"{name}.{index}"] = row
+        timestamps, values, lower, upper = decimate_minmax(
+            snapshot.timestamps,
+            series,
+            plot_width or len(snapshot.timestamps),
+            {metric: series['min'] for metric, series in snapshot.series.items() if 'min' in series},
+            {metric: series['max'] for metric, series in snapshot.series.items() if 'max' in series})
+        self.data_history = dict(values)
+        self.data_history['timestamps'] = timestamps
+        self.bands = {metric: (lower[metric], upper[metric]) for metric in lower}
+        # 장치별 컬럼 이름 -> 장치 순서의 줄인 시리즈 목록
+        self.devices = {name: [values[f"{name}.{index}"] for index in range(len(rows))]
+                        for name, rows in snapshot.devices.items()}
+        self.total_samples = snapshot.total_samples
+        self.stats = snapshot.stats
+        self.anomalies = snapshot.anomalies
+
+    def generate_report(self, filename: str = None, executor=None,
+                        on_progress: Callable[[int, int], None] = None, parallel: bool = True) -> str:
+        """PDF 리포트 생성
+
+        페이지마다 별도 작업 프로세스에서 렌더링한 뒤 하나의 PDF로 병합하므로
+        전체 시간은 가장 느린 페이지에 맞춰집니다. executor를 주면 그 프로세스 풀을,
+        없으면 임시 풀을 사용합니다. pypdf가 없거나 parallel=False면 순서대로 렌더링합니다.
+        on_progress(완료 페이지 수, 전체 페이지 수)로 진행 상황을 알립니다.
+        """
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"reports/system_monitor_report_{timestamp}.pdf"
 
         # 디렉토리 생성
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-
-        # PDF 생성
-        with PdfPages(filename) as pdf:
-            # 페이지 1: 표지 및 요약
-            self._create_title_page(pdf)
-
-            # 페이지 2: CPU 및 메모리
-            self._create_cpu_memory_page(pdf)
-
-            # 페이지 3: GPU 및 디스크
-            self._create_gpu_disk_page(pdf)
-
-            # 페이지 4: 네트워크
-            self._create_network_page(pdf)
-
-            # 페이지 5: 통계 요약
-            self._create_statistics_page(pdf)
-
-            # 메타데이터
-            d = pdf.infodict()
-            d['Title'] = '시스템 리소스 모니터링 리포트'
-            d['Author'] = 'System Monitor'
-            d['Subject'] = '시스템 리소스 모니터링 결과'
-            d['Keywords'] = 'System Monitoring Performance'
-            d['CreationDate'] = datetime.now()
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+        pages = [page for page, _ in REPORT_PAGES]
+        if not parallel or _pdf_writer() is None:
+            if executor is not None:
+                executor.submit(render_pages, self.snapshot, filename, pages, self.plot_width).result()
+            else:
+                render_pages(self.snapshot, filename, pages, self.plot_width)
+            if on_progress:
+                on_progress(len(pages), len(pages))
+            return filename
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=min(len(pages), os.cpu_count() or 1))
+        try:
+            page_files = [f"{filename}.{index}.{page}.part" for index, page in enumerate(pages)]
+            futures = [executor.submit(render_pages, self.snapshot, path, [page], self.plot_width)
+                       for path, page in zip(page_files, pages)]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if on_progress:
+                    on_progress(done, len(pages))
+            executor.submit(merge_pages, page_files, filename).result()
+        finally:
+            if own_executor:
+                executor.shutdown()
 
         return filename
 
+    def _elapsed_seconds(self) -> np.ndarray:
+        """첫 샘플 기준 경과 시간 (초)"""
+        timestamps = self.data_history['timestamps']
+        if len(timestamps) == 0:
+            return np.array([], dtype=np.float64)
+        return (timestamps - timestamps[0]) / 1000.0
+
+    def _plot_band(self, ax, timestamps, metric: str, color: str):
+        """롤업 계층인 경우 버킷별 최소~최대 범위 표시 (스파이크 보존)"""
+        if metric not in self.bands:
+            return
+        lower, upper = self.bands[metric]
+        ax.fill_between(timestamps, lower, upper,
+                        alpha=0.15, color=color, linewidth=0)
+
+    def _mark_anomalies(self, ax, metrics: Sequence[str]):
+        """metrics 컬럼(장치별 컬럼 포함)의 이상 징후를 세로선으로 표시 (종류마다 범례 한 번)"""
+        timestamps = self.data_history['timestamps']
+        if len(timestamps) == 0:
+            return
+        labeled = set()
+        for event in self.anomalies:
+            if event['metric'] not in metrics:
+                continue
+            color, linestyle, label = ANOMALY_STYLES[event['kind']]
+            ax.axvline(event['epoch'] - timestamps[0] / 1000.0, color=color, linestyle=linestyle, linewidth=1,
+                       alpha=0.8, label=None if event['kind'] in labeled else label)
+            labeled.add(event['kind'])
+
+    def _plot_devices(self, ax, timestamps: np.ndarray, name: str, label: str, names: Sequence[str] = (),
+                      min_devices: int = 2, linestyle: str = '-') -> bool:
+        """장치가 min_devices개 이상이면 장치별 라인을 그리고 True 반환
+
+        범례는 names(system_info의 장치 이름 목록)가 있으면 '이름 label', 없으면 'label 번호'
+        """
+        rows = self.devices.get(name, [])
+        if len(rows) < min_devices or not any(self._has_values(row) for row in rows):
+            return False
+        for index, row in enumerate(rows):
+            ax.plot(timestamps, row, color=DEVICE_COLORS[index % len(DEVICE_COLORS)], linestyle=linestyle,
+                    linewidth=1.2,
+                    label=f'{names[index]} {label}'.strip() if index < len(names) else f'{label} {index}')
+        return True
+
+    def _device_panel(self, ax, timestamps: np.ndarray, kind: str, title: str, ylabel: str,
+                      columns: Sequence[Tuple[str, str, str]], ylim: Tuple[float, float] = None):
+        """장치별 그래프 한 칸 (kind: system_info의 장치 목록 키, columns: (컬럼, 범례 접미어, 선 모양))"""
+        names = self.system_info.get(kind) or []
+        drawn = False
+        for name, label, linestyle in columns:
+            drawn |= self._plot_devices(ax, timestamps, name, label, names, min_devices=1, linestyle=linestyle)
+        ax.set_title(title, fontweight='bold')
+        if not drawn:
+            ax.text(0.5, 0.5, '장치별 데이터 없음', ha='center', va='center')
+            return
+        ax.set_xlabel('시간 (초)')
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+        if ylim is not None:
+            ax.set_ylim(*ylim)
+        self._mark_anomalies(ax, [name for name, _, _ in columns])
+        ax.legend(fontsize='small', ncol=2 if len(names) * len(columns) > 8 else 1)
+
+    @staticmethod
+    def _has_values(values: np.ndarray, nonzero: bool = False) -> bool:
+        """유효한(NaN이 아닌) 값이 있는지 확인"""
+        finite = values[np.isfinite(values)]
+        if nonzero:
+            return bool(np.any(finite))
+        return finite.size > 0
+
     def _create_title_page(self, pdf):
         """표지 페이지 생성"""
+        plt = _pyplot()
         fig = plt.figure(figsize=(11, 8.5))
         fig.suptitle('시스템 리소스 모니터링 리포트', fontsize=24, fontweight='bold', y=0.85)
 
         # 시스템 정보 텍스트
         info_text = f"""
-모니터링 시작: {self.monitor.start_time.strftime('%Y-%m-%d %H:%M:%S')}
-모니터링 종료: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-모니터링 기간: {self.monitor.get_monitoring_duration()}
+모니터링 시작: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}
+모니터링 종료: {self.end_time.strftime('%Y-%m-%d %H:%M:%S')}
+모니터링 기간: {str(self.end_time - self.start_time).split('.')[0]}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -77,14 +372,17 @@ class ReportGenerator:
 CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_info.get('cpu_threads', 'N/A')} 스레드
 최대 주파수: {self.system_info.get('cpu_freq_max', 'N/A')}
 총 메모리: {self.system_info.get('total_memory', 'N/A')}
+GPU: {self.system_info.get('gpu_count', 0)}개 ({self.system_info.get('gpu_backend', 'N/A')})
 호스트명: {self.system_info.get('hostname', 'N/A')}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 리포트 요약:
 
-총 데이터 포인트: {len(self.data_history['timestamps'])}개
-샘플링 간격: 1초
+총 데이터 포인트: {self.total_samples}개
+그래프 해상도: {self.tier}
+샘플링 간격: {self.snapshot.sampling_interval:.2f}초
+이상 징후: 이상치 {self._count_anomalies('anomaly')}건 / 변화점 {self._count_anomalies('change')}건
 """
 
         # 통계 요약 추가
@@ -106,16 +404,18 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
 
     def _create_cpu_memory_page(self, pdf):
         """CPU 및 메모리 페이지 생성"""
+        plt = _pyplot()
         fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
         fig.suptitle('CPU 및 메모리 모니터링', fontsize=16, fontweight='bold')
 
-        timestamps = range(len(self.data_history['timestamps']))
+        timestamps = self._elapsed_seconds()
 
         # CPU 사용률 그래프
-        if self.data_history['cpu_percent']:
+        if self._has_values(self.data_history['cpu_percent']):
             ax = axes[0, 0]
             ax.plot(timestamps, self.data_history['cpu_percent'],
                    color='#667eea', linewidth=1.5, label='CPU')
+            self._plot_band(ax, timestamps, 'cpu_percent', '#667eea')
             ax.fill_between(timestamps, self.data_history['cpu_percent'],
                            alpha=0.3, color='#667eea')
             ax.set_title('CPU 사용률 (%)', fontweight='bold')
@@ -130,19 +430,22 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
                           color='green', linestyle='--', linewidth=1, label='평균')
                 ax.axhline(y=self.stats['cpu_percent']['max'],
                           color='red', linestyle='--', linewidth=1, label='최대')
+            self._mark_anomalies(ax, ('cpu_percent', 'cpu_per_core'))
             ax.legend()
 
         # CPU 온도 그래프
-        if self.data_history['cpu_temp'] and any(self.data_history['cpu_temp']):
+        if self._has_values(self.data_history['cpu_temp'], nonzero=True):
             ax = axes[0, 1]
             ax.plot(timestamps, self.data_history['cpu_temp'],
                    color='#f59e0b', linewidth=1.5, label='Temperature')
+            self._plot_band(ax, timestamps, 'cpu_temp', '#f59e0b')
             ax.fill_between(timestamps, self.data_history['cpu_temp'],
                            alpha=0.3, color='#f59e0b')
             ax.set_title('CPU 온도 (°C)', fontweight='bold')
             ax.set_xlabel('시간 (초)')
             ax.set_ylabel('온도 (°C)')
             ax.grid(True, alpha=0.3)
+            self._mark_anomalies(ax, ('cpu_temp',))
             ax.legend()
         else:
             ax = axes[0, 1]
@@ -150,10 +453,11 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             ax.set_title('CPU 온도 (°C)', fontweight='bold')
 
         # 메모리 사용률 그래프
-        if self.data_history['memory_percent']:
+        if self._has_values(self.data_history['memory_percent']):
             ax = axes[1, 0]
             ax.plot(timestamps, self.data_history['memory_percent'],
                    color='#764ba2', linewidth=1.5, label='Memory')
+            self._plot_band(ax, timestamps, 'memory_percent', '#764ba2')
             ax.fill_between(timestamps, self.data_history['memory_percent'],
                            alpha=0.3, color='#764ba2')
             ax.set_title('메모리 사용률 (%)', fontweight='bold')
@@ -165,19 +469,22 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             if 'memory_percent' in self.stats:
                 ax.axhline(y=self.stats['memory_percent']['avg'],
                           color='green', linestyle='--', linewidth=1, label='평균')
+            self._mark_anomalies(ax, ('memory_percent',))
             ax.legend()
 
         # 메모리 사용량 (GB) 그래프
-        if self.data_history['memory_used']:
+        if self._has_values(self.data_history['memory_used']):
             ax = axes[1, 1]
             ax.plot(timestamps, self.data_history['memory_used'],
                    color='#8b5cf6', linewidth=1.5, label='Used')
+            self._plot_band(ax, timestamps, 'memory_used', '#8b5cf6')
             ax.fill_between(timestamps, self.data_history['memory_used'],
                            alpha=0.3, color='#8b5cf6')
             ax.set_title('메모리 사용량 (GB)', fontweight='bold')
             ax.set_xlabel('시간 (초)')
             ax.set_ylabel('사용량 (GB)')
             ax.grid(True, alpha=0.3)
+            self._mark_anomalies(ax, ('memory_used',))
             ax.legend()
 
         plt.tight_layout()
@@ -186,16 +493,27 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
 
     def _create_gpu_disk_page(self, pdf):
         """GPU 및 디스크 페이지 생성"""
+        plt = _pyplot()
         fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
         fig.suptitle('GPU 및 디스크 모니터링', fontsize=16, fontweight='bold')
 
-        timestamps = range(len(self.data_history['timestamps']))
+        timestamps = self._elapsed_seconds()
 
         # GPU 사용률 그래프
-        if self.data_history['gpu_usage'] and any(self.data_history['gpu_usage']):
+        if self._plot_devices(axes[0, 0], timestamps, 'gpu_per_device', 'GPU'):
+            ax = axes[0, 0]
+            ax.set_title('GPU별 사용률 (%)', fontweight='bold')
+            ax.set_xlabel('시간 (초)')
+            ax.set_ylabel('사용률 (%)')
+            ax.grid(True, alpha=0.3)
+            ax.set_ylim(0, 100)
+            self._mark_anomalies(ax, ('gpu_usage', 'gpu_per_device'))
+            ax.legend()
+        elif self._has_values(self.data_history['gpu_usage'], nonzero=True):
             ax = axes[0, 0]
             ax.plot(timestamps, self.data_history['gpu_usage'],
                    color='#10b981', linewidth=1.5, label='GPU')
+            self._plot_band(ax, timestamps, 'gpu_usage', '#10b981')
             ax.fill_between(timestamps, self.data_history['gpu_usage'],
                            alpha=0.3, color='#10b981')
             ax.set_title('GPU 사용률 (%)', fontweight='bold')
@@ -203,6 +521,7 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             ax.set_ylabel('사용률 (%)')
             ax.grid(True, alpha=0.3)
             ax.set_ylim(0, 100)
+            self._mark_anomalies(ax, ('gpu_usage', 'gpu_per_device'))
             ax.legend()
         else:
             ax = axes[0, 0]
@@ -210,16 +529,26 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             ax.set_title('GPU 사용률 (%)', fontweight='bold')
 
         # GPU 온도 그래프
-        if self.data_history['gpu_temp'] and any(self.data_history['gpu_temp']):
+        if self._plot_devices(axes[0, 1], timestamps, 'gpu_temp_per_device', 'GPU'):
+            ax = axes[0, 1]
+            ax.set_title('GPU별 온도 (°C)', fontweight='bold')
+            ax.set_xlabel('시간 (초)')
+            ax.set_ylabel('온도 (°C)')
+            ax.grid(True, alpha=0.3)
+            self._mark_anomalies(ax, ('gpu_temp', 'gpu_temp_per_device'))
+            ax.legend()
+        elif self._has_values(self.data_history['gpu_temp'], nonzero=True):
             ax = axes[0, 1]
             ax.plot(timestamps, self.data_history['gpu_temp'],
                    color='#ef4444', linewidth=1.5, label='GPU Temp')
+            self._plot_band(ax, timestamps, 'gpu_temp', '#ef4444')
             ax.fill_between(timestamps, self.data_history['gpu_temp'],
                            alpha=0.3, color='#ef4444')
             ax.set_title('GPU 온도 (°C)', fontweight='bold')
             ax.set_xlabel('시간 (초)')
             ax.set_ylabel('온도 (°C)')
             ax.grid(True, alpha=0.3)
+            self._mark_anomalies(ax, ('gpu_temp', 'gpu_temp_per_device'))
             ax.legend()
         else:
             ax = axes[0, 1]
@@ -227,10 +556,11 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             ax.set_title('GPU 온도 (°C)', fontweight='bold')
 
         # 디스크 사용률 그래프
-        if self.data_history['disk_percent']:
+        if self._has_values(self.data_history['disk_percent']):
             ax = axes[1, 0]
             ax.plot(timestamps, self.data_history['disk_percent'],
                    color='#f59e0b', linewidth=1.5, label='Disk')
+            self._plot_band(ax, timestamps, 'disk_percent', '#f59e0b')
             ax.fill_between(timestamps, self.data_history['disk_percent'],
                            alpha=0.3, color='#f59e0b')
             ax.set_title('디스크 사용률 (%)', fontweight='bold')
@@ -238,19 +568,23 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             ax.set_ylabel('사용률 (%)')
             ax.grid(True, alpha=0.3)
             ax.set_ylim(0, 100)
+            self._mark_anomalies(ax, ('disk_percent',))
             ax.legend()
 
         # 디스크 I/O 그래프
-        if self.data_history['disk_read'] and self.data_history['disk_write']:
+        if self._has_values(self.data_history['disk_read']) and self._has_values(self.data_history['disk_write']):
             ax = axes[1, 1]
             ax.plot(timestamps, self.data_history['disk_read'],
                    color='#3b82f6', linewidth=1.5, label='Read')
+            self._plot_band(ax, timestamps, 'disk_read', '#3b82f6')
             ax.plot(timestamps, self.data_history['disk_write'],
                    color='#ef4444', linewidth=1.5, label='Write')
+            self._plot_band(ax, timestamps, 'disk_write', '#ef4444')
             ax.set_title('디스크 I/O 속도 (MB/s)', fontweight='bold')
             ax.set_xlabel('시간 (초)')
             ax.set_ylabel('속도 (MB/s)')
             ax.grid(True, alpha=0.3)
+            self._mark_anomalies(ax, ('disk_read', 'disk_write'))
             ax.legend()
 
         plt.tight_layout()
@@ -259,18 +593,21 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
 
     def _create_network_page(self, pdf):
         """네트워크 페이지 생성"""
+        plt = _pyplot()
         fig, axes = plt.subplots(2, 1, figsize=(11, 8.5))
         fig.suptitle('네트워크 모니터링', fontsize=16, fontweight='bold')
 
-        timestamps = range(len(self.data_history['timestamps']))
+        timestamps = self._elapsed_seconds()
 
         # 네트워크 속도 그래프
-        if self.data_history['network_recv'] and self.data_history['network_sent']:
+        if self._has_values(self.data_history['network_recv']) and self._has_values(self.data_history['network_sent']):
             ax = axes[0]
             ax.plot(timestamps, self.data_history['network_recv'],
                    color='#3b82f6', linewidth=1.5, label='Download')
+            self._plot_band(ax, timestamps, 'network_recv', '#3b82f6')
             ax.plot(timestamps, self.data_history['network_sent'],
                    color='#ef4444', linewidth=1.5, label='Upload')
+            self._plot_band(ax, timestamps, 'network_sent', '#ef4444')
             ax.fill_between(timestamps, self.data_history['network_recv'],
                            alpha=0.2, color='#3b82f6')
             ax.fill_between(timestamps, self.data_history['network_sent'],
@@ -279,14 +616,16 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             ax.set_xlabel('시간 (초)')
             ax.set_ylabel('속도 (MB/s)')
             ax.grid(True, alpha=0.3)
+            self._mark_anomalies(ax, ('network_recv', 'network_sent'))
             ax.legend()
 
             # 통계 텍스트
-            if self.data_history['network_recv']:
-                avg_down = np.mean(self.data_history['network_recv'])
-                max_down = np.max(self.data_history['network_recv'])
-                avg_up = np.mean(self.data_history['network_sent'])
-                max_up = np.max(self.data_history['network_sent'])
+            # 줄인 그래프 데이터가 아닌 전체 데이터 통계 사용
+            if 'network_recv' in self.stats and 'network_sent' in self.stats:
+                avg_down = self.stats['network_recv']['avg']
+                max_down = self.stats['network_recv']['max']
+                avg_up = self.stats['network_sent']['avg']
+                max_up = self.stats['network_sent']['max']
 
                 stats_text = f"""
 네트워크 통계:
@@ -309,8 +648,53 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
         pdf.savefig(fig, bbox_inches='tight')
         plt.close()
 
+    def _create_disk_devices_page(self, pdf):
+        """디스크 장치 / 마운트별 페이지 생성 (장치별 값은 원본 해상도 구간에서만 표시)"""
+        plt = _pyplot()
+        fig, axes = plt.subplots(3, 2, figsize=(11, 8.5))
+        fig.suptitle('디스크 장치별 모니터링', fontsize=16, fontweight='bold')
+
+        timestamps = self._elapsed_seconds()
+        self._device_panel(axes[0, 0], timestamps, 'disks', '디스크별 사용률 (%)', '사용률 (%)',
+                           [('disk_util_per_device', '', '-')], ylim=(0, 100))
+        self._device_panel(axes[0, 1], timestamps, 'disks', '디스크별 IOPS', 'IOPS',
+                           [('disk_iops_per_device', '', '-')])
+        self._device_panel(axes[1, 0], timestamps, 'disks', '디스크별 평균 대기 시간 (ms)', 'await (ms)',
+                           [('disk_await_per_device', '', '-')])
+        self._device_panel(axes[1, 1], timestamps, 'disks', '디스크별 큐 깊이', '큐 깊이',
+                           [('disk_queue_per_device', '', '-')])
+        self._device_panel(axes[2, 0], timestamps, 'disks', '디스크별 I/O 속도 (MB/s)', '속도 (MB/s)',
+                           [('disk_read_per_device', 'Read', '-'), ('disk_write_per_device', 'Write', '--')])
+        self._device_panel(axes[2, 1], timestamps, 'mounts', '마운트별 사용률 (%)', '사용률 (%)',
+                           [('mount_percent_per_device', '', '-')], ylim=(0, 100))
+
+        plt.tight_layout()
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
+    def _create_network_devices_page(self, pdf):
+        """네트워크 인터페이스별 페이지 생성 (장치별 값은 원본 해상도 구간에서만 표시)"""
+        plt = _pyplot()
+        fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
+        fig.suptitle('네트워크 인터페이스별 모니터링', fontsize=16, fontweight='bold')
+
+        timestamps = self._elapsed_seconds()
+        self._device_panel(axes[0, 0], timestamps, 'interfaces', '인터페이스별 전송 속도 (MB/s)', '속도 (MB/s)',
+                           [('net_recv_per_device', 'Download', '-'), ('net_sent_per_device', 'Upload', '--')])
+        self._device_panel(axes[0, 1], timestamps, 'interfaces', '인터페이스별 패킷 (개/s)', '패킷 (개/s)',
+                           [('net_packets_per_device', '', '-')])
+        self._device_panel(axes[1, 0], timestamps, 'interfaces', '인터페이스별 오류 (개/s)', '오류 (개/s)',
+                           [('net_errors_per_device', '', '-')])
+        self._device_panel(axes[1, 1], timestamps, 'interfaces', '인터페이스별 드롭 (개/s)', '드롭 (개/s)',
+                           [('net_drops_per_device', '', '-')])
+
+        plt.tight_layout()
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
+
     def _create_statistics_page(self, pdf):
         """통계 요약 페이지 생성"""
+        plt = _pyplot()
         fig = plt.figure(figsize=(11, 8.5))
         fig.suptitle('통계 요약', fontsize=16, fontweight='bold')
 
@@ -322,7 +706,8 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             stats_text += f"CPU:\n"
             stats_text += f"  평균 사용률: {self.stats['cpu_percent']['avg']:.2f}%\n"
             stats_text += f"  최소 사용률: {self.stats['cpu_percent']['min']:.2f}%\n"
-            stats_text += f"  최대 사용률: {self.stats['cpu_percent']['max']:.2f}%\n\n"
+            stats_text += f"  최대 사용률: {self.stats['cpu_percent']['max']:.2f}%\n"
+            stats_text += f"  95 백분위: {self.stats['cpu_percent']['p95']:.2f}%\n\n"
 
         if 'cpu_temp' in self.stats:
             stats_text += f"CPU 온도:\n"
@@ -335,21 +720,24 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
             stats_text += f"메모리:\n"
             stats_text += f"  평균 사용률: {self.stats['memory_percent']['avg']:.2f}%\n"
             stats_text += f"  최소 사용률: {self.stats['memory_percent']['min']:.2f}%\n"
-            stats_text += f"  최대 사용률: {self.stats['memory_percent']['max']:.2f}%\n\n"
+            stats_text += f"  최대 사용률: {self.stats['memory_percent']['max']:.2f}%\n"
+            stats_text += f"  95 백분위: {self.stats['memory_percent']['p95']:.2f}%\n\n"
 
         # GPU 통계
         if 'gpu_usage' in self.stats:
             stats_text += f"GPU:\n"
             stats_text += f"  평균 사용률: {self.stats['gpu_usage']['avg']:.2f}%\n"
             stats_text += f"  최소 사용률: {self.stats['gpu_usage']['min']:.2f}%\n"
-            stats_text += f"  최대 사용률: {self.stats['gpu_usage']['max']:.2f}%\n\n"
+            stats_text += f"  최대 사용률: {self.stats['gpu_usage']['max']:.2f}%\n"
+            stats_text += f"  95 백분위: {self.stats['gpu_usage']['p95']:.2f}%\n\n"
 
         # 디스크 통계
         if 'disk_percent' in self.stats:
             stats_text += f"디스크:\n"
             stats_text += f"  평균 사용률: {self.stats['disk_percent']['avg']:.2f}%\n"
             stats_text += f"  최소 사용률: {self.stats['disk_percent']['min']:.2f}%\n"
-            stats_text += f"  최대 사용률: {self.stats['disk_percent']['max']:.2f}%\n\n"
+            stats_text += f"  최대 사용률: {self.stats['disk_percent']['max']:.2f}%\n"
+            stats_text += f"  95 백분위: {self.stats['disk_percent']['p95']:.2f}%\n\n"
 
         # 네트워크 통계
         if 'network_recv' in self.stats:
@@ -372,3 +760,55 @@ CPU 코어: {self.system_info.get('cpu_count', 'N/A')} 코어 / {self.system_inf
         plt.axis('off')
         pdf.savefig(fig, bbox_inches='tight')
         plt.close()
+
+    def _count_anomalies(self, kind: str) -> int:
+        return sum(1 for event in self.anomalies if event['kind'] == kind)
+
+    def _create_anomalies_page(self, pdf):
+        """이상 징후 페이지 생성 - 메트릭별 건수와 최근 이벤트 표"""
+        plt = _pyplot()
+        fig = plt.figure(figsize=(11, 8.5))
+        fig.suptitle('이상 징후 (이상치 / 변화점)', fontsize=16, fontweight='bold')
+
+        if not self.anomalies:
+            plt.text(0.5, 0.5, '검출된 이상 징후 없음', ha='center', va='center', fontsize=14)
+            plt.axis('off')
+            pdf.savefig(fig, bbox_inches='tight')
+            plt.close()
+            return
+
+        # 메트릭(장치) x 종류별 건수 (많은 순 상위 10개)
+        counts = {}
+        for event in self.anomalies:
+            counts.setdefault(event['label'], {kind: 0 for kind in ANOMALY_STYLES})[event['kind']] += 1
+        top = sorted(counts.items(), key=lambda item: -sum(item[1].values()))[:10]
+        ax = fig.add_axes([0.3, 0.62, 0.65, 0.28])
+        positions = np.arange(len(top))
+        left = np.zeros(len(top))
+        for kind, (color, _, label) in ANOMALY_STYLES.items():
+            values = np.array([kinds[kind] for _, kinds in top])
+            ax.barh(positions, values, left=left, color=color, alpha=0.8, label=label)
+            left += values
+        ax.set_yticks(positions)
+        ax.set_yticklabels([subject for subject, _ in top])
+        ax.invert_yaxis()
+        ax.set_xlabel('건수')
+        ax.set_title('메트릭별 이상 징후', fontweight='bold')
+        ax.grid(True, axis='x', alpha=0.3)
+        ax.legend()
+
+        # 최근 이벤트 표
+        events = self.anomalies[-ANOMALY_TABLE_ROWS:][::-1]
+        ax = fig.add_axes([0.05, 0.02, 0.9, 0.52])
+        ax.axis('off')
+        table = ax.table(cellText=[[event['timestamp'], ANOMALY_STYLES[event['kind']][2], event['message']]
+                                   for event in events],
+                         colLabels=['시각', '종류', '내용'], colWidths=[0.2, 0.1, 0.7], loc='upper center',
+                         cellLoc='left')
+        table.auto_set_font_size(False)
+        table.set_fontsize(8)
+        table.scale(1, 1.05)
+        ax.set_title(f'최근 이벤트 {len(events)}건 (전체 {len(self.anomalies)}건)', fontweight='bold')
+
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close()
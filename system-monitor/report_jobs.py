@@ -0,0 +1,127 @@
+"""
+Report Jobs
+샘플링 루프와 분리된 프로세스 풀에서 PDF 리포트를 생성하는 작업 큐
+"""
+
+import itertools
+import os
+import queue
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Any, Optional
+
+from report_generator import REPORT_PAGES, ReportGenerator, ReportSnapshot
+
+
+class ReportJob:
+    """리포트 생성 요청 하나"""
+
+    def __init__(self, job_id: int, key: str, snapshot: ReportSnapshot,
+                 filename: Optional[str], on_done: Optional[Callable[['ReportJob'], None]]):
+        self.id = job_id
+        self.key = key
+        self.snapshot = snapshot
+        self.filename = filename
+        self.on_done = on_done
+        self.status = 'queued'
+        self.pdf_path = None
+        self.error = None
+        self.done = threading.Event()
+
+    def wait(self, timeout: float = None) -> Optional[str]:
+        """완료까지 대기 후 PDF 경로 반환 (실패 시 None)"""
+        self.done.wait(timeout)
+        return self.pdf_path
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'key': self.key,
+            'status': self.status,
+            'pdf_path': self.pdf_path,
+            'error': self.error
+        }
+
+
+class ReportJobQueue:
+    """리포트 작업을 순서대로 프로세스 풀에 보내는 큐
+
+    같은 key의 작업이 대기/실행 중이면 새로 만들지 않고 기존 작업을 반환합니다.
+    진행 상황은 on_event('report_progress', {...})로 알립니다.
+    리포트 페이지는 풀의 작업 프로세스들에서 나눠 렌더링됩니다.
+    """
+
+    def __init__(self, on_event: Callable[[str, Dict[str, Any]], None], max_workers: int = None):
+        self.on_event = on_event
+        self.max_workers = max_workers or min(len(REPORT_PAGES), os.cpu_count() or 1)
+        self._executor = None
+        self._queue = queue.Queue()
+        self._active: Dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._dispatcher = None
+
+    def submit(self, key: str, snapshot: ReportSnapshot, filename: Optional[str] = None,
+               on_done: Optional[Callable[[ReportJob], None]] = None) -> ReportJob:
+        """리포트 작업 등록 (중복 요청은 기존 작업 반환)"""
+        with self._lock:
+            existing = self._active.get(key)
+            if existing is not None:
+                return existing
+
+            job = ReportJob(next(self._ids), key, snapshot, filename, on_done)
+            self._active[key] = job
+            self._ensure_dispatcher()
+
+        self._queue.put(job)
+        self._notify(job, 0)
+        return job
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self):
+        """큐의 작업을 하나씩 프로세스 풀에서 실행 (샘플링 스레드는 차단하지 않음)"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            job.status = 'running'
+            self._notify(job, 10)
+            try:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                generator = ReportGenerator.from_snapshot(job.snapshot)
+                filename = generator.generate_report(
+                    job.filename, executor=self._executor,
+                    on_progress=lambda done, total: self._notify(job, 10 + 80 * done // total))
+                job.pdf_path = os.path.abspath(filename)
+                job.status = 'completed'
+            except Exception as e:
+                traceback.print_exc()
+                job.status = 'failed'
+                job.error = str(e)
+            finally:
+                job.snapshot = None  # 완료된 스냅샷 메모리 해제
+                with self._lock:
+                    self._active.pop(job.key, None)
+
+            self._notify(job, 100)
+            if job.on_done is not None:
+                job.on_done(job)
+            job.done.set()
+
+    def _notify(self, job: ReportJob, progress: int):
+        self.on_event('report_progress', {**job.to_dict(), 'progress': progress})
+
+    def shutdown(self):
+        """대기 중인 작업을 마친 뒤 작업 프로세스 종료"""
+        self._queue.put(None)
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,165 @@
+"""
+Rollup Tiers
+원본 샘플을 10초 / 1분 / 1시간 버킷으로 다운샘플링하는 다중 해상도 저장소
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+from history import HistoryStore
+
+# 버킷 집계 항목 (스파이크가 사라지지 않도록 최소/최대 유지)
+AGGREGATES = ('min', 'max', 'avg', 'last')
+
+# (이름, 버킷 크기(초), 보관 버킷 수)
+DEFAULT_TIERS = (
+    ('10s', 10, 8640),    # 1일
+    ('1m', 60, 10080),    # 7일
+    ('1h', 3600, 2160),   # 90일
+)
+
+
+class RollupTier:
+    """고정 크기 버킷 하나의 해상도 계층
+
+    진행 중인 버킷은 메트릭 벡터 단위로 누적하고, 버킷이 닫히면
+    min/max/avg/last를 링 버퍼에 기록한 뒤 다음(더 거친) 계층에 전달합니다.
+    """
+
+    def __init__(self, name: str, resolution: float, retention: int, metrics: Sequence[str]):
+        self.name = name
+        self.resolution = resolution
+        self.metrics = list(metrics)
+        self.bucket_ms = int(resolution * 1000)
+        self.store = HistoryStore(retention, {
+            f"{metric}.{agg}": 0 for metric in self.metrics for agg in AGGREGATES
+        })
+        self.next_tier: Optional['RollupTier'] = None
+        self._bucket_start = None
+        self._reset()
+
+    def _reset(self):
+        size = len(self.metrics)
+        self._min = np.full(size, np.nan)
+        self._max = np.full(size, np.nan)
+        self._sum = np.zeros(size)
+        self._count = np.zeros(size)
+        self._last = np.full(size, np.nan)
+
+    def add(self, timestamp_ms: int, mins: np.ndarray, maxs: np.ndarray,
+            sums: np.ndarray, counts: np.ndarray, lasts: np.ndarray):
+        """샘플(또는 하위 계층 버킷) 하나를 현재 버킷에 누적"""
+        bucket_start = timestamp_ms - timestamp_ms % self.bucket_ms
+        if self._bucket_start is not None and bucket_start != self._bucket_start:
+            self.flush()
+        self._bucket_start = bucket_start
+
+        self._min = np.fmin(self._min, mins)
+        self._max = np.fmax(self._max, maxs)
+        self._sum += sums
+        self._count += counts
+        self._last = np.where(np.isfinite(lasts), lasts, self._last)
+
+    def flush(self):
+        """진행 중인 버킷을 닫아 기록하고 다음 계층으로 전달"""
+        if self._bucket_start is None:
+            return
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = np.where(self._count > 0, self._sum / self._count, np.nan)
+
+        values = {}
+        for i, metric in enumerate(self.metrics):
+            values[f"{metric}.min"] = self._min[i]
+            values[f"{metric}.max"] = self._max[i]
+            values[f"{metric}.avg"] = avg[i]
+            values[f"{metric}.last"] = self._last[i]
+        self.store.append(self._bucket_start, values)
+
+        if self.next_tier is not None:
+            self.next_tier.add(self._bucket_start, self._min, self._max,
+                               self._sum, self._count, self._last)
+
+        self._bucket_start = None
+        self._reset()
+
+
+class RollupStore:
+    """원본 히스토리 위에 쌓이는 다운샘플링 계층 모음"""
+
+    def __init__(self, raw: HistoryStore, metrics: Sequence[str],
+                 tiers: Sequence[Tuple[str, float, int]] = DEFAULT_TIERS):
+        self.raw = raw
+        self.metrics = list(metrics)
+        self.tiers = [RollupTier(name, resolution, retention, self.metrics)
+                      for name, resolution, retention in tiers]
+        for finer, coarser in zip(self.tiers, self.tiers[1:]):
+            finer.next_tier = coarser
+
+    def add_sample(self, timestamp_ms: int, values: Dict[str, Any]):
+        """원본 샘플 하나를 가장 세밀한 계층에 반영 (O(메트릭 수))"""
+        if not self.tiers:
+            return
+        vector = np.array([np.nan if values.get(m) is None else values[m] for m in self.metrics],
+                          dtype=np.float64)
+        finite = np.isfinite(vector)
+        self.tiers[0].add(timestamp_ms, vector, vector,
+                          np.where(finite, vector, 0.0), finite.astype(np.float64), vector)
+
+    def flush(self):
+        """진행 중인 모든 버킷을 닫아 기록 (종료 시 사용)"""
+        for tier in self.tiers:
+            tier.flush()
+
+    def _sources(self) -> List[Tuple[str, float, HistoryStore]]:
+        """세밀한 순서의 (이름, 해상도, 저장소) 목록 (원본 포함)"""
+        return [('raw', 0.0, self.raw)] + [(t.name, t.resolution, t.store) for t in self.tiers]
+
+    def select_tier(self, start_ms: int, end_ms: int, max_points: int) -> Tuple[str, float, HistoryStore]:
+        """구간을 덮으면서 max_points개 이상을 주는 가장 거친 계층 선택
+
+        그런 계층이 없으면 구간을 덮는 계층 중 가장 세밀한 것을,
+        구간 시작을 덮는 계층이 없으면 가장 오래된 데이터를 가진 계층을 고릅니다.
+        """
+        candidates = []
+        for name, resolution, store in self._sources():
+            timestamps = store.view('timestamps')
+            if len(timestamps) == 0:
+                continue
+            lo = np.searchsorted(timestamps, start_ms, side='left')
+            hi = np.searchsorted(timestamps, end_ms, side='right')
+            # 덮어쓴 적이 없는 저장소는 처음부터의 데이터를 모두 가짐
+            covers = timestamps[0] <= start_ms or store.total_appended <= store.capacity
+            candidates.append((name, resolution, store, hi - lo, covers, timestamps[0]))
+
+        if not candidates:
+            return self._sources()[0]
+
+        covering = [c for c in candidates if c[4]]
+        for candidate in reversed(covering):
+            if candidate[3] >= max_points:
+                return candidate[:3]
+        if covering:
+            return covering[0][:3]
+        return min(candidates, key=lambda c: c[5])[:3]
+
+    def query(self, metrics: Sequence[str], start_ms: int, end_ms: int, max_points: int) -> Dict[str, Any]:
+        """구간 [start_ms, end_ms]의 메트릭별 min/max/avg/last 뷰 반환"""
+        name, resolution, store = self.select_tier(start_ms, end_ms, max_points)
+        timestamps = store.view('timestamps')
+        lo = int(np.searchsorted(timestamps, start_ms, side='left'))
+        hi = int(np.searchsorted(timestamps, end_ms, side='right'))
+
+        series = {}
+        for metric in metrics:
+            if name == 'raw':
+                values = store.view(metric)[lo:hi]
+                series[metric] = {agg: values for agg in AGGREGATES}
+            else:
+                series[metric] = {agg: store.view(f"{metric}.{agg}")[lo:hi] for agg in AGGREGATES}
+
+        return {
+            'tier': name,
+            'resolution': resolution,
+            'timestamps': timestamps[lo:hi],
+            'series': series
+        }
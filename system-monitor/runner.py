@@ -0,0 +1,127 @@
+"""
+Monitoring Runner
+고정 주기 수집 루프, 주기적 리포트 회전, 종료 시 저장을 담당하는 실행기 (대시보드 / 헤드리스 공용)
+"""
+
+import time
+from typing import Callable, Dict, Any, Iterable, Optional
+
+from monitor import COLLECTOR_GROUPS
+from report_generator import ReportSnapshot
+from scheduler import FixedRateScheduler
+
+
+class MonitoringRun:
+    """모니터 하나의 수집 루프 (duration초 후 또는 stop()까지, duration이 0이면 무제한)
+
+    데드라인이 된 수집기 중 active_groups()가 돌려준 그룹(과 always_collect)에 속한 것만 실행합니다.
+    report_interval을 주면 그 주기마다 직전 구간의 리포트를 작업 큐에 넣고(회전),
+    final_report()는 마지막 회전 이후 구간(회전이 없으면 전체 실행 구간)으로 만듭니다.
+    루프가 끝나면 항상 monitor.close()로 롤업 버킷과 디스크 버퍼를 기록합니다.
+    """
+
+    def __init__(self, monitor, report_jobs, intervals: Dict[str, Optional[float]], duration: float = 0,
+                 report_interval: float = 0, always_collect: Iterable[str] = (), sleep=time.sleep):
+        self.monitor = monitor
+        self.report_jobs = report_jobs
+        self.intervals = dict(intervals)
+        self.duration = duration
+        self.report_interval = report_interval
+        self.always_collect = frozenset(always_collect)
+        self.sleep = sleep
+        self.scheduler: Optional[FixedRateScheduler] = None
+        self.latest: Optional[Dict[str, Any]] = None
+        self.running = False
+        self.rotated = 0
+        self._period_start = None  # 현재 리포트 회전 구간 시작 (epoch 초)
+
+    def run(self, active_groups: Callable[[], Iterable[str]] = frozenset,
+            on_sample: Callable[[Dict[str, Any]], None] = None,
+            on_emit: Callable[[Dict[str, Any], float], None] = None, emit_interval: float = None) -> bool:
+        """수집 루프 실행 - duration을 다 채웠으면 True, stop()으로 멈췄으면 False
+
+        on_sample(data): 수집한 틱마다, on_emit(data, now): emit_interval마다 마지막 수집 결과로 호출
+        """
+        tasks = dict(self.intervals)
+        if on_emit is not None:
+            tasks['emit'] = emit_interval
+        if self.report_interval:
+            tasks['report'] = self.report_interval
+        scheduler = self.scheduler = FixedRateScheduler(tasks, sleep=self.sleep)
+        self.running = True
+        if self.monitor.start_time is None:
+            self.monitor.start_monitoring()
+
+        record = self.monitor.instrumentation.record
+
+        def on_tick(due, now, wall_time):
+            started = time.perf_counter()
+            active = frozenset(active_groups()).union(self.always_collect)
+            collectors = [name for name in due if name in self.intervals and
+                          (COLLECTOR_GROUPS.get(name) is None or COLLECTOR_GROUPS[name] in active)]
+            if collectors:
+                self.latest = self.monitor.collect(collectors, now, wall_time)
+                if on_sample is not None:
+                    on_sample(self.latest)
+
+            if 'report' in due:
+                # 첫 틱(시작 시각)은 구간 시작만 기록
+                if self._period_start is not None:
+                    self.rotate()
+                self._period_start = wall_time
+
+            if 'emit' in due and self.latest is not None:
+                on_emit(self.latest, now)
+            record('tick', time.perf_counter() - started)
+
+        try:
+            scheduler.run(on_tick, lambda: self.running and (not self.duration or scheduler.elapsed() < self.duration))
+        finally:
+            completed = self.running
+            self.running = False
+            # 디스크 버퍼 기록
+            self.monitor.close()
+
+        stats = scheduler.get_stats()
+        print(f"틱 {stats['ticks']}회, 평균 지연 {stats['avg_lateness'] * 1000:.1f}ms, "
+              f"최대 지연 {stats['max_lateness'] * 1000:.1f}ms, 오버런 {stats['overruns']}회")
+        slowest = sorted(self.monitor.instrumentation.histograms.items(), key=lambda item: -item[1].quantile(0.95))
+        if slowest:
+            print("단계별 p95: " + ', '.join(f"{stage} {histogram.quantile(0.95) * 1000:.2f}ms"
+                                             for stage, histogram in slowest[:5]))
+        return completed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스케줄러 틱/지연/오버런 통계 (루프 시작 전이면 빈 dict)"""
+        return self.scheduler.get_stats() if self.scheduler is not None else {}
+
+    def instrumentation(self) -> Dict[str, Any]:
+        """모니터의 단계별 지연 시간 + 스케줄러 통계 (/api/instrumentation 응답)"""
+        return self.monitor.instrumentation.snapshot(self.get_stats())
+
+    def stop(self):
+        """다음 틱에서 루프 종료 (시그널 처리기에서 호출 가능)"""
+        self.running = False
+
+    def elapsed(self) -> float:
+        return self.scheduler.elapsed() if self.scheduler is not None else 0.0
+
+    def remaining(self) -> Optional[float]:
+        """남은 시간 (초, 무제한이면 None)"""
+        return max(0.0, self.duration - self.elapsed()) if self.duration else None
+
+    def _submit(self, key: str, start: Optional[float], on_done=None):
+        system_info = self.monitor.system_info or self.monitor.get_system_info()
+        snapshot = ReportSnapshot.capture(self.monitor, system_info, start)
+        return self.report_jobs.submit(key, snapshot, on_done=on_done)
+
+    def rotate(self):
+        """직전 회전 구간 (구간 시작 ~ 지금)의 리포트 작업 등록 (구간마다 별도 작업)"""
+        self.rotated += 1
+        return self._submit(f'rotation:{int(self._period_start)}', self._period_start)
+
+    def final_report(self, key: str, on_done=None):
+        """마지막 리포트 작업 등록 (수집된 데이터가 없으면 None)"""
+        if len(self.monitor.data_history) == 0:
+            return None
+        return self._submit(key, self._period_start if self.report_interval else None, on_done)
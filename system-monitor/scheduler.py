@@ -0,0 +1,105 @@
+"""
+Fixed-Rate Scheduler
+단조 시계 데드라인 기반의 고정 주기 스케줄러
+"""
+
+import math
+import time
+from typing import Callable, Dict, List, Optional, Any
+
+
+class FixedRateScheduler:
+    """작업별 주기를 단조 시계 데드라인으로 관리하는 스케줄러
+
+    각 작업의 데드라인은 시작 시각 + 주기의 배수로 계산하므로
+    수집에 걸린 시간이 누적되어 주기가 밀리지 않습니다.
+    주기가 None인 작업은 시작 시 한 번만 실행됩니다.
+    """
+
+    def __init__(self, intervals: Dict[str, Optional[float]],
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Any] = time.sleep,
+                 tolerance: float = 0.001):
+        self.intervals = dict(intervals)
+        self.clock = clock
+        self.sleep = sleep
+        # 데드라인 차이가 이 값 이하인 작업은 같은 틱에서 실행
+        self.tolerance = tolerance
+        self.deadlines: Dict[str, float] = {}
+        self.periods: Dict[str, int] = {}
+        self.start_time = None
+        self.stats = {
+            'ticks': 0,
+            'overruns': 0,
+            'skipped_periods': 0,
+            'last_lateness': 0.0,
+            'max_lateness': 0.0,
+            'total_lateness': 0.0,
+            'last_duration': 0.0
+        }
+
+    def elapsed(self) -> float:
+        """스케줄러 시작 후 경과 시간 (초)"""
+        if self.start_time is None:
+            return 0.0
+        return self.clock() - self.start_time
+
+    def run(self, on_tick: Callable[[List[str], float, float], None],
+            should_continue: Callable[[], bool]):
+        """데드라인이 된 작업 목록으로 on_tick(due, now, wall_time)을 반복 호출"""
+        self.start_time = self.clock()
+        self.deadlines = {name: self.start_time for name in self.intervals}
+        self.periods = {name: 0 for name in self.intervals}
+
+        while self.deadlines and should_continue():
+            deadline = min(self.deadlines.values())
+            now = self.clock()
+            if deadline > now:
+                self.sleep(deadline - now)
+                now = self.clock()
+
+            # 틱 시작 지연 기록
+            lateness = max(0.0, now - deadline)
+            self.stats['ticks'] += 1
+            self.stats['last_lateness'] = lateness
+            self.stats['max_lateness'] = max(self.stats['max_lateness'], lateness)
+            self.stats['total_lateness'] += lateness
+
+            due = [name for name, d in self.deadlines.items() if d <= now + self.tolerance]
+            # 틱마다 하나의 타임스탬프를 모든 수집기가 공유
+            on_tick(due, now, time.time())
+
+            finished = self.clock()
+            self.stats['last_duration'] = finished - now
+            self._reschedule(due, finished)
+
+    def _reschedule(self, due: List[str], finished: float):
+        """실행한 작업의 다음 데드라인 계산 및 오버런 기록"""
+        overrun = False
+        for name in due:
+            interval = self.intervals[name]
+            if interval is None:
+                del self.deadlines[name]
+                continue
+
+            # 데드라인을 누적 합이 아닌 시작 시각 + 주기 배수로 계산해 오차 누적 방지
+            period = self.periods[name] + 1
+            next_deadline = self.start_time + period * interval
+            if next_deadline <= finished:
+                # 작업이 다음 주기를 넘겼음: 놓친 주기는 건너뛰고 위상 유지
+                missed = math.floor((finished - next_deadline) / interval) + 1
+                period += missed
+                next_deadline = self.start_time + period * interval
+                self.stats['skipped_periods'] += missed
+                overrun = True
+            self.periods[name] = period
+            self.deadlines[name] = next_deadline
+
+        if overrun:
+            self.stats['overruns'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """틱 지연/오버런 통계 반환"""
+        stats = dict(self.stats)
+        stats['avg_lateness'] = stats['total_lateness'] / stats['ticks'] if stats['ticks'] else 0.0
+        return stats
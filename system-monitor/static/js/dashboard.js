@@ -1,24 +1,22 @@
 // Socket.IO 연결
 const socket = io();
 
-// 차트 데이터 저장
-const chartData = {
-    cpu: { x: [], y: [] },
-    memory: { x: [], y: [] },
-    gpu: { x: [], y: [] },
-    disk: { x: [], y: [] },
-    network: { upload: [], download: [], x: [] }
-};
-
-// 통계 데이터
+// 통계 데이터 (전체 구간 평균/최대 - 값 목록 없이 고정 크기)
 const stats = {
-    cpu: { values: [], sum: 0, max: 0 },
-    memory: { values: [], sum: 0, max: 0 },
-    gpu: { values: [], sum: 0, max: 0 }
+    cpu: { count: 0, sum: 0, max: 0 },
+    memory: { count: 0, sum: 0, max: 0 },
+    gpu: { count: 0, sum: 0, max: 0 }
 };
 
+function addStat(key, value) {
+    const stat = stats[key];
+    stat.count += 1;
+    stat.sum += value;
+    stat.max = Math.max(stat.max, value);
+}
+
 // 최대 데이터 포인트 수
-const MAX_POINTS = 300; // 5분 = 300초
+const MAX_POINTS = 300; // 차트별 표시 창 (1 Hz 기준 5분)
 
 // 차트 레이아웃 설정
 const commonLayout = {
@@ -142,6 +140,8 @@ function getStatusClass(status) {
     }
 }
 
+const STATUS_RANK = { normal: 0, warning: 1, critical: 2 };
+
 function getStatusText(status) {
     switch(status) {
         case 'normal': return '정상';
@@ -151,182 +151,701 @@ function getStatusText(status) {
     }
 }
 
-// 데이터 업데이트
-function updateData(data) {
-    const timestamp = new Date().toLocaleTimeString();
+// 렌더링 대기 중인 포인트 (차트별 x와 트레이스별 y 목록)
+// 프레임마다 쌓아 두었다가 다음 애니메이션 프레임에 extendTraces로 한 번에 반영
+const CHART_TRACES = { cpuChart: 1, memChart: 1, gpuChart: 1, diskChart: 1, netChart: 2 };
+const pending = {};
+for (const chartId in CHART_TRACES) {
+    pending[chartId] = { x: [], y: Array.from({ length: CHART_TRACES[chartId] }, () => []) };
+}
 
-    // CPU 업데이트
-    if (data.cpu && !data.cpu.error) {
-        chartData.cpu.x.push(timestamp);
-        chartData.cpu.y.push(data.cpu.percent);
+let latestData = null;  // DOM에 반영할 마지막 상태
+let latestProcesses = null;  // 프로세스 테이블에 반영할 마지막 목록
+let pendingBackfill = null;  // 차트 앞에 붙일 백필 포인트
+let renderScheduled = false;
+let firstEpoch = Infinity;  // 차트에 들어간 가장 오래된 포인트 (epoch ms, 백필 경계)
+const gpuNames = [];  // GPU별 트레이스 이름
+
+function pushPoint(chartId, x, values) {
+    const buffer = pending[chartId];
+    // 새로 나타난 트레이스(GPU별)는 버퍼 앞부분을 빈 값으로 채움
+    while (buffer.y.length < values.length) {
+        buffer.y.push(buffer.x.map(() => null));
+    }
+    buffer.x.push(x);
+    buffer.y.forEach((ys, i) => ys.push(i < values.length ? values[i] : null));
 
-        // 통계 업데이트
-        stats.cpu.values.push(data.cpu.percent);
-        stats.cpu.sum += data.cpu.percent;
-        stats.cpu.max = Math.max(stats.cpu.max, data.cpu.percent);
+    // 숨겨진 탭에서 렌더링이 멈춰 있어도 표시 창 이상은 보관하지 않음 (분할 상환 O(1))
+    if (buffer.x.length > 2 * MAX_POINTS) {
+        buffer.x = buffer.x.slice(-MAX_POINTS);
+        buffer.y = buffer.y.map(ys => ys.slice(-MAX_POINTS));
+    }
+}
 
-        // UI 업데이트
-        document.getElementById('cpuCurrent').textContent = data.cpu.percent.toFixed(1) + '%';
-        document.getElementById('cpuAvg').textContent = (stats.cpu.sum / stats.cpu.values.length).toFixed(1) + '%';
-        document.getElementById('cpuMax').textContent = stats.cpu.max.toFixed(1) + '%';
-        document.getElementById('cpuTemp').textContent = data.cpu.temperature.toFixed(1) + '°C';
+function scheduleRender() {
+    if (!renderScheduled) {
+        renderScheduled = true;
+        requestAnimationFrame(render);
+    }
+}
 
-        const cpuStatusBadge = document.getElementById('cpuStatus');
-        cpuStatusBadge.className = 'status-badge ' + getStatusClass(data.cpu.status);
-        cpuStatusBadge.textContent = getStatusText(data.cpu.status);
+// 애니메이션 프레임 하나에서 차트와 DOM을 한 번에 갱신
+// 숨겨진 탭에서는 requestAnimationFrame이 호출되지 않으므로 렌더링이 멈추고,
+// 다시 보이면 쌓인 포인트를 차트마다 extendTraces 한 번으로 따라잡음
+function render() {
+    renderScheduled = false;
+    if (document.hidden) {
+        return;
+    }
+    if (pendingBackfill) {
+        prependBackfill(pendingBackfill);
+        pendingBackfill = null;
+    }
+    for (const chartId in pending) {
+        flushChart(chartId);
+    }
+    for (const chartId in anomalyMarks) {
+        if (dirtyMarks.has(chartId) || marksExpired(chartId)) {
+            renderAnomalyMarks(chartId);
+        }
+    }
+    dirtyMarks.clear();
+    if (latestData) {
+        renderDom(latestData);
+        latestData = null;
+    }
+    if (latestProcesses) {
+        updateProcessTable(latestProcesses);
+        latestProcesses = null;
+    }
+}
 
-        updateChart('cpuChart', chartData.cpu.x, chartData.cpu.y);
+document.addEventListener('visibilitychange', function() {
+    if (!document.hidden) {
+        scheduleRender();
     }
+});
 
-    // Memory 업데이트
-    if (data.memory && !data.memory.error) {
-        chartData.memory.x.push(timestamp);
-        chartData.memory.y.push(data.memory.percent);
+// GPU 요약 (여러 GPU는 평균 사용률 / 최고 온도 / 메모리 합계 / 가장 나쁜 GPU 상태)
+function summarizeGpus(gpus) {
+    return {
+        load: gpus.reduce((sum, gpu) => sum + gpu.load, 0) / gpus.length,
+        temperature: Math.max(...gpus.map(gpu => gpu.temperature)),
+        memoryUsed: gpus.reduce((sum, gpu) => sum + gpu.memory_used, 0),
+        memoryTotal: gpus.reduce((sum, gpu) => sum + gpu.memory_total, 0),
+        status: gpus.reduce((a, b) => (STATUS_RANK[b.status] > STATUS_RANK[a.status] ? b : a)).status
+    };
+}
+
+// 데이터 업데이트 (포인트와 통계만 기록하고 화면 갱신은 다음 애니메이션 프레임에)
+function updateData(data) {
+    // 수집 시각 기준 (백필 데이터와 같은 시간축)
+    const timestamp = new Date(data.epoch * 1000);
+    firstEpoch = Math.min(firstEpoch, timestamp.getTime());
 
-        stats.memory.values.push(data.memory.percent);
-        stats.memory.sum += data.memory.percent;
-        stats.memory.max = Math.max(stats.memory.max, data.memory.percent);
+    if (data.cpu && !data.cpu.error) {
+        pushPoint('cpuChart', timestamp, [data.cpu.percent]);
+        addStat('cpu', data.cpu.percent);
+    }
 
-        document.getElementById('memCurrent').textContent = data.memory.percent.toFixed(1) + '%';
-        document.getElementById('memUsed').textContent = data.memory.used.toFixed(2) + ' GB';
-        document.getElementById('memAvail').textContent = data.memory.available.toFixed(2) + ' GB';
+    if (data.memory && !data.memory.error) {
+        pushPoint('memChart', timestamp, [data.memory.percent]);
+        addStat('memory', data.memory.percent);
+    }
 
-        const memStatusBadge = document.getElementById('memStatus');
-        memStatusBadge.className = 'status-badge ' + getStatusClass(data.memory.status);
-        memStatusBadge.textContent = getStatusText(data.memory.status);
+    const gpus = (data.gpu || []).filter(gpu => !gpu.error);
+    data.gpuSummary = gpus.length > 0 ? summarizeGpus(gpus) : null;
+    if (data.gpuSummary) {
+        const values = [data.gpuSummary.load];
+        if (gpus.length > 1) {
+            gpus.forEach((gpu, i) => {
+                gpuNames[i] = `GPU ${gpu.id}`;
+                values.push(gpu.load);
+            });
+        }
+        pushPoint('gpuChart', timestamp, values);
+        addStat('gpu', data.gpuSummary.load);
+    }
 
-        updateChart('memChart', chartData.memory.x, chartData.memory.y);
+    if (data.disk && !data.disk.error) {
+        pushPoint('diskChart', timestamp, [data.disk.percent]);
     }
 
-    // GPU 업데이트
-    if (data.gpu && data.gpu.length > 0 && !data.gpu[0].error) {
-        const gpu = data.gpu[0];
-        chartData.gpu.x.push(timestamp);
-        chartData.gpu.y.push(gpu.load);
+    if (data.network && !data.network.error) {
+        pushPoint('netChart', timestamp, [data.network.download_speed, data.network.upload_speed]);
+    }
 
-        stats.gpu.values.push(gpu.load);
-        stats.gpu.sum += gpu.load;
-        stats.gpu.max = Math.max(stats.gpu.max, gpu.load);
+    if (data.processes && data.processes.length > 0) {
+        latestProcesses = data.processes;
+    }
 
-        document.getElementById('gpuCurrent').textContent = gpu.load.toFixed(1) + '%';
-        document.getElementById('gpuTemp').textContent = gpu.temperature.toFixed(1) + '°C';
-        document.getElementById('gpuMem').textContent = gpu.memory_used.toFixed(0) + ' / ' + gpu.memory_total.toFixed(0) + ' MB';
+    latestData = data;
+    scheduleRender();
+}
 
-        const gpuStatusBadge = document.getElementById('gpuStatus');
-        gpuStatusBadge.className = 'status-badge ' + getStatusClass(gpu.status);
-        gpuStatusBadge.textContent = getStatusText(gpu.status);
+// 값이 바뀐 요소만 갱신 (요소는 한 번만 조회)
+const elements = new Map();
 
-        updateChart('gpuChart', chartData.gpu.x, chartData.gpu.y);
-    } else {
-        document.getElementById('gpuCurrent').textContent = 'N/A';
-        document.getElementById('gpuTemp').textContent = 'N/A';
-        document.getElementById('gpuMem').textContent = 'N/A';
+function setText(id, text) {
+    let element = elements.get(id);
+    if (!element) {
+        element = document.getElementById(id);
+        elements.set(id, element);
+    }
+    if (element.textContent !== text) {
+        element.textContent = text;
     }
+}
 
-    // Disk 업데이트
-    if (data.disk && !data.disk.error) {
-        chartData.disk.x.push(timestamp);
-        chartData.disk.y.push(data.disk.percent);
+function setStatus(id, status) {
+    setText(id, getStatusText(status));
+    const className = 'status-badge ' + getStatusClass(status);
+    const element = elements.get(id);
+    if (element.className !== className) {
+        element.className = className;
+    }
+}
 
-        document.getElementById('diskCurrent').textContent = data.disk.percent.toFixed(1) + '%';
-        document.getElementById('diskRead').textContent = data.disk.read_speed.toFixed(2) + ' MB/s';
-        document.getElementById('diskWrite').textContent = data.disk.write_speed.toFixed(2) + ' MB/s';
+function formatAverage(stat) {
+    return (stat.count > 0 ? stat.sum / stat.count : 0).toFixed(1) + '%';
+}
 
-        const diskStatusBadge = document.getElementById('diskStatus');
-        diskStatusBadge.className = 'status-badge ' + getStatusClass(data.disk.status);
-        diskStatusBadge.textContent = getStatusText(data.disk.status);
+// 카드 수치 갱신
+function renderDom(data) {
+    if (data.cpu && !data.cpu.error) {
+        setText('cpuCurrent', data.cpu.percent.toFixed(1) + '%');
+        setText('cpuAvg', formatAverage(stats.cpu));
+        setText('cpuMax', stats.cpu.max.toFixed(1) + '%');
+        setText('cpuTemp', data.cpu.temperature.toFixed(1) + '°C');
+        setStatus('cpuStatus', data.cpu.status);
+    }
 
-        updateChart('diskChart', chartData.disk.x, chartData.disk.y);
+    if (data.memory && !data.memory.error) {
+        setText('memCurrent', data.memory.percent.toFixed(1) + '%');
+        setText('memUsed', data.memory.used.toFixed(2) + ' GB');
+        setText('memAvail', data.memory.available.toFixed(2) + ' GB');
+        setStatus('memStatus', data.memory.status);
+    }
+
+    const gpu = data.gpuSummary;
+    if (gpu) {
+        setText('gpuCurrent', gpu.load.toFixed(1) + '%');
+        setText('gpuTemp', gpu.temperature.toFixed(1) + '°C');
+        setText('gpuMem', gpu.memoryUsed.toFixed(0) + ' / ' + gpu.memoryTotal.toFixed(0) + ' MB');
+        setStatus('gpuStatus', gpu.status);
+    } else {
+        setText('gpuCurrent', 'N/A');
+        setText('gpuTemp', 'N/A');
+        setText('gpuMem', 'N/A');
+    }
+
+    if (data.disk && !data.disk.error) {
+        setText('diskCurrent', data.disk.percent.toFixed(1) + '%');
+        setText('diskRead', data.disk.read_speed.toFixed(2) + ' MB/s');
+        setText('diskWrite', data.disk.write_speed.toFixed(2) + ' MB/s');
+        setStatus('diskStatus', data.disk.status);
     }
 
-    // Network 업데이트
     if (data.network && !data.network.error) {
-        chartData.network.x.push(timestamp);
-        chartData.network.download.push(data.network.download_speed);
-        chartData.network.upload.push(data.network.upload_speed);
+        setText('netDown', data.network.download_speed.toFixed(2) + ' MB/s');
+        setText('netUp', data.network.upload_speed.toFixed(2) + ' MB/s');
+        setStatus('netStatus', data.network.status);
+    }
 
-        document.getElementById('netDown').textContent = data.network.download_speed.toFixed(2) + ' MB/s';
-        document.getElementById('netUp').textContent = data.network.upload_speed.toFixed(2) + ' MB/s';
+    renderDeviceTables(data);
 
-        updateNetworkChart(chartData.network.x, chartData.network.download, chartData.network.upload);
+    if (data.time) {
+        updateTime(data.time.duration, data.time.remaining);
     }
+}
 
-    // Processes 업데이트
-    if (data.processes && data.processes.length > 0) {
-        updateProcessTable(data.processes);
+// 쌓인 포인트를 차트 끝에 추가 (표시 창을 넘는 앞부분은 Plotly가 잘라냄)
+function flushChart(chartId) {
+    const buffer = pending[chartId];
+    if (buffer.x.length === 0) {
+        return;
+    }
+    const chart = document.getElementById(chartId);
+    // 새로 나타난 GPU별 트레이스 추가 (0번은 평균)
+    for (let i = chart.data.length; i < buffer.y.length; i++) {
+        Plotly.addTraces(chartId, {
+            x: [], y: [], type: 'scatter', mode: 'lines',
+            name: gpuNames[i - 1], line: { width: 1 }
+        });
     }
 
-    // 데이터 포인트 제한
-    limitDataPoints();
-}
+    const traces = chart.data.map((_, i) => i);
+    Plotly.extendTraces(chartId, {
+        x: traces.map(() => buffer.x),
+        y: traces.map(i => buffer.y[i] || buffer.x.map(() => null))
+    }, traces, MAX_POINTS);
 
-// 차트 업데이트 (단일 라인)
-function updateChart(chartId, x, y) {
-    Plotly.update(chartId, {
-        x: [x],
-        y: [y]
-    }, {}, [0]);
+    buffer.x = [];
+    buffer.y = buffer.y.map(() => []);
 }
 
-// 네트워크 차트 업데이트 (두 라인)
-function updateNetworkChart(x, download, upload) {
-    Plotly.update('netChart', {
-        x: [x, x],
-        y: [download, upload]
-    }, {}, [0, 1]);
+// 테이블 행 갱신 (행과 셀을 재사용하고 바뀐 셀만 갱신, 남는 행은 숨김)
+// tableRows: tbody id -> 행 목록, toValues(item): 셀 텍스트 배열
+const tableRows = new Map();
+
+function updateTableRows(tbodyId, items, toValues) {
+    let rows = tableRows.get(tbodyId);
+    const tbody = document.getElementById(tbodyId);
+    if (!rows) {
+        rows = [];
+        tableRows.set(tbodyId, rows);
+        tbody.textContent = '';  // '데이터 로딩 중...' 안내 행 제거
+    }
+
+    items.forEach((item, i) => {
+        if (i === rows.length) {
+            const row = tbody.insertRow();
+            rows.push({ row: row, cells: [] });
+        }
+        const entry = rows[i];
+        entry.row.hidden = false;
+        toValues(item).forEach((text, j) => {
+            const cell = entry.cells[j] || (entry.cells[j] = entry.row.insertCell());
+            if (cell.textContent !== text) {
+                cell.textContent = text;
+            }
+        });
+    });
+    for (let i = items.length; i < rows.length; i++) {
+        rows[i].row.hidden = true;
+    }
 }
 
 // 프로세스 테이블 업데이트
 function updateProcessTable(processes) {
-    const tbody = document.getElementById('processTable');
-    tbody.innerHTML = '';
-
-    processes.forEach(proc => {
-        const row = tbody.insertRow();
-        row.innerHTML = `
-            <td>${proc.pid}</td>
-            <td>${proc.name}</td>
-            <td>${proc.cpu_percent.toFixed(1)}%</td>
-            <td>${proc.memory_percent.toFixed(1)}%</td>
-        `;
-    });
+    updateTableRows('processTable', processes, proc => [
+        String(proc.pid),
+        proc.name,
+        proc.cpu_percent.toFixed(1) + '%',
+        proc.memory_percent.toFixed(1) + '%',
+        ((proc.io_bytes || 0) / 1024 / 1024).toFixed(2) + ' MB/s',
+        String(proc.threads || 0)
+    ]);
 }
 
-// 데이터 포인트 제한
-function limitDataPoints() {
-    for (let key in chartData) {
-        if (key === 'network') {
-            if (chartData[key].x.length > MAX_POINTS) {
-                chartData[key].x.shift();
-                chartData[key].download.shift();
-                chartData[key].upload.shift();
-            }
-        } else {
-            if (chartData[key].x.length > MAX_POINTS) {
-                chartData[key].x.shift();
-                chartData[key].y.shift();
-            }
-        }
+// 디스크 장치 / 마운트 / 네트워크 인터페이스 테이블 (목록이 없으면 카드를 숨김)
+function setVisible(id, visible) {
+    const card = document.getElementById(id);
+    const display = visible ? '' : 'none';
+    if (card.style.display !== display) {
+        card.style.display = display;
+    }
+}
+
+function renderDeviceTables(data) {
+    if (data.disk && !data.disk.error) {
+        const devices = data.disk.devices || [];
+        const mounts = data.disk.mounts || [];
+        setVisible('diskDevicesCard', devices.length > 0 || mounts.length > 0);
+        updateTableRows('diskDeviceTable', devices, disk => [
+            disk.name,
+            disk.read_speed.toFixed(2) + ' MB/s',
+            disk.write_speed.toFixed(2) + ' MB/s',
+            (disk.read_iops + disk.write_iops).toFixed(0),
+            disk.await.toFixed(2),
+            disk.queue_depth.toFixed(2),
+            disk.util.toFixed(1) + '%'
+        ]);
+        updateTableRows('mountTable', mounts, mount => [
+            mount.name,
+            mount.device,
+            mount.percent.toFixed(1) + '%',
+            mount.used.toFixed(2) + ' GB',
+            mount.total.toFixed(2) + ' GB'
+        ]);
+    }
+
+    if (data.network && !data.network.error) {
+        const interfaces = data.network.interfaces || [];
+        setVisible('interfacesCard', interfaces.length > 0);
+        updateTableRows('interfaceTable', interfaces, nic => [
+            nic.name,
+            nic.download_speed.toFixed(2) + ' MB/s',
+            nic.upload_speed.toFixed(2) + ' MB/s',
+            nic.recv_pps.toFixed(0),
+            nic.sent_pps.toFixed(0),
+            nic.errors.toFixed(1),
+            nic.drops.toFixed(1)
+        ]);
     }
 }
 
 // 시간 업데이트
 function updateTime(duration, remaining) {
-    document.getElementById('duration').textContent = duration;
-    document.getElementById('remaining').textContent = remaining;
+    setText('duration', duration);
+    setText('remaining', remaining);
+}
+
+// 보고 있는 호스트 ('local', 'fleet' 또는 에이전트 호스트)
+let currentHost = 'local';
+let switchingHost = false;  // stream_hello 응답 전까지 이전 호스트의 프레임은 무시
+
+// 프레임 스트림 시작 (연결/재연결 또는 호스트 변경 시)
+function startStream() {
+    // 이전 상태는 버리고 키프레임부터 다시 받음
+    frameStates.clear();
+    switchingHost = true;
+    const encoding = window.MessagePack ? 'msgpack' : 'json';
+    const rate = Number(document.getElementById('updateRate').value);
+    socket.emit('stream_hello', {
+        encoding: encoding,
+        groups: METRIC_GROUPS,
+        max_rate: rate,
+        host: currentHost
+    }, function(settings) {
+        switchingHost = false;
+        if (settings && settings.system_info) {
+            updateSystemInfo(settings.system_info);
+        }
+        setAlerts((settings && settings.alerts) || []);
+        // 차트 창 크기만큼의 최근 히스토리 요청 (모니터링 도중 접속/새로고침/호스트 변경)
+        const host = currentHost;
+        socket.emit('request_backfill', { seconds: MAX_POINTS / rate, max_points: MAX_POINTS, host: host },
+            function(result) {
+                if (host === currentHost && result && result.anomalies) {
+                    result.anomalies.forEach(addAnomaly);
+                }
+            });
+    });
 }
 
 // Socket 이벤트 리스너
 socket.on('connect', function() {
     console.log('서버에 연결되었습니다.');
+    startStream();
+});
+
+// 활성 알림 (stream_hello 응답으로 시작해 구독 그룹의 alert 이벤트로 갱신, 로컬 호스트만)
+const activeAlerts = new Map();  // '규칙|장치' -> 마지막 상태 전이
+
+function alertKey(transition) {
+    return transition.rule + '|' + (transition.device === null ? '' : transition.device);
+}
+
+function setAlerts(alerts) {
+    activeAlerts.clear();
+    alerts.forEach(transition => activeAlerts.set(alertKey(transition), transition));
+    renderAlerts();
+}
+
+function renderAlerts() {
+    const alerts = Array.from(activeAlerts.values())
+        .sort((a, b) => STATUS_RANK[b.level] - STATUS_RANK[a.level] || b.epoch - a.epoch);
+    setVisible('alertsCard', alerts.length > 0);
+    updateTableRows('alertTable', alerts, transition => [
+        getStatusText(transition.level),
+        transition.message,
+        transition.timestamp
+    ]);
+}
+
+socket.on('alert', function(transition) {
+    if (transition.host !== currentHost) {
+        return;
+    }
+    if (transition.level === 'normal') {
+        activeAlerts.delete(alertKey(transition));
+    } else {
+        activeAlerts.set(alertKey(transition), transition);
+    }
+    renderAlerts();
+});
+
+// 이상 징후 표시 - 그룹 차트에 세로선 (이상치는 빨간 점선, 변화점은 주황 파선)과 위쪽 기호
+// (기호에 마우스를 올리면 내용), 백필 응답으로 시작해 anomaly 이벤트로 추가
+const ANOMALY_CHARTS = { cpu: 'cpuChart', memory: 'memChart', gpu: 'gpuChart', disk: 'diskChart', network: 'netChart' };
+const ANOMALY_STYLES = {
+    anomaly: { color: '#ef4444', dash: 'dot', symbol: '!' },
+    change: { color: '#f59e0b', dash: 'dash', symbol: 'Δ' }
+};
+const MAX_ANOMALY_MARKS = 20;  // 차트별 표시 개수
+let anomalyMarks = {};  // 차트 -> 이벤트 목록 (시간순)
+const dirtyMarks = new Set();  // 다음 애니메이션 프레임에 다시 그릴 차트
+
+function addAnomaly(event) {
+    const chartId = ANOMALY_CHARTS[event.group];
+    if (!chartId) {
+        return;
+    }
+    const marks = anomalyMarks[chartId] || (anomalyMarks[chartId] = []);
+    if (marks.some(mark => mark.epoch === event.epoch && mark.metric === event.metric && mark.device === event.device)) {
+        return;
+    }
+    marks.push(event);
+    marks.sort((a, b) => a.epoch - b.epoch);
+    if (marks.length > MAX_ANOMALY_MARKS) {
+        marks.splice(0, marks.length - MAX_ANOMALY_MARKS);
+    }
+    dirtyMarks.add(chartId);
+    scheduleRender();
+}
+
+// 차트의 첫 포인트 (epoch ms, 포인트가 없으면 null)
+function chartStart(chartId) {
+    const x = document.getElementById(chartId).data[0].x;
+    return x.length > 0 ? new Date(x[0]).getTime() : null;
+}
+
+// 표시 창 밖으로 밀려난 표시가 있는지 (세로선도 x축 범위에 포함되므로 지워야 함)
+function marksExpired(chartId) {
+    const marks = anomalyMarks[chartId];
+    const start = chartStart(chartId);
+    return marks.length > 0 && start !== null && marks[0].epoch * 1000 < start;
+}
+
+function renderAnomalyMarks(chartId) {
+    const start = chartStart(chartId);
+    const marks = anomalyMarks[chartId].filter(mark => start === null || mark.epoch * 1000 >= start);
+    anomalyMarks[chartId] = marks;
+    Plotly.relayout(chartId, {
+        shapes: marks.map(mark => {
+            const style = ANOMALY_STYLES[mark.kind];
+            const x = new Date(mark.epoch * 1000);
+            return {
+                type: 'line', xref: 'x', yref: 'paper', x0: x, x1: x, y0: 0, y1: 1,
+                line: { color: style.color, width: 1, dash: style.dash }
+            };
+        }),
+        annotations: marks.map(mark => {
+            const style = ANOMALY_STYLES[mark.kind];
+            return {
+                xref: 'x', yref: 'paper', x: new Date(mark.epoch * 1000), y: 1, yanchor: 'bottom',
+                text: style.symbol, showarrow: false, font: { color: style.color, size: 12 },
+                hovertext: `${mark.timestamp} ${mark.message}`
+            };
+        })
+    });
+}
+
+socket.on('anomaly', function(event) {
+    if (event.host === currentHost) {
+        addAnomaly(event);
+    }
 });
 
-socket.on('system_data', function(data) {
-    updateData(data);
+// 시스템 정보 카드 (호스트 변경 시)
+function updateSystemInfo(info) {
+    setText('sysOS', info.os || 'N/A');
+    setText('sysProcessor', (info.processor || 'N/A').slice(0, 50));
+    setText('sysCPU', `${info.cpu_count} 코어 / ${info.cpu_threads} 스레드`);
+    setText('sysMemory', info.total_memory || 'N/A');
+}
+
+// 호스트 변경: 차트와 통계를 비우고 새 호스트의 스트림과 히스토리를 받음
+function changeHost(event) {
+    currentHost = event.target.value;
+    for (const key in stats) {
+        stats[key] = { count: 0, sum: 0, max: 0 };
+    }
+    for (const chartId in CHART_TRACES) {
+        pending[chartId] = { x: [], y: Array.from({ length: CHART_TRACES[chartId] }, () => []) };
+    }
+    gpuNames.length = 0;
+    anomalyMarks = {};
+    dirtyMarks.clear();
+    firstEpoch = Infinity;
+    latestData = null;
+    latestProcesses = null;
+    pendingBackfill = null;
+    backfillChunks = [];
+    initCharts();
+    // 정렬 기준은 로컬 수집기에만 적용됨 (원격 호스트는 에이전트 기준)
+    document.getElementById('processSort').disabled = currentHost !== 'local';
+    startStream();
+}
+
+// 호스트 목록 (선택 상자와 호스트 카드)
+const HOST_LABELS = { local: '로컬', fleet: '전체' };
+const hostRows = new Map();
+
+function hostLabel(host) {
+    return HOST_LABELS[host.host] ? `${HOST_LABELS[host.host]} (${host.hostname})` : host.host;
+}
+
+function formatPercent(value) {
+    return value === null || value === undefined ? 'N/A' : value.toFixed(1) + '%';
+}
+
+socket.on('hosts', function(hosts) {
+    const select = document.getElementById('hostSelect');
+    const known = new Set(Array.from(select.options, option => option.value));
+    hosts.forEach(host => {
+        if (!known.has(host.host)) {
+            select.add(new Option(hostLabel(host), host.host));
+        }
+    });
+
+    document.getElementById('hostsCard').style.display = hosts.length > 1 ? '' : 'none';
+    const tbody = document.getElementById('hostTable');
+    hosts.forEach(host => {
+        let cells = hostRows.get(host.host);
+        if (!cells) {
+            const row = tbody.insertRow();
+            cells = Array.from({ length: 7 }, () => row.insertCell());
+            hostRows.set(host.host, cells);
+        }
+        const values = [
+            hostLabel(host),
+            host.connected ? '연결됨' : '끊김',
+            formatPercent(host.cpu),
+            formatPercent(host.memory),
+            formatPercent(host.disk),
+            formatPercent(host.gpu),
+            getStatusText(host.status)
+        ];
+        values.forEach((text, i) => {
+            if (cells[i].textContent !== text) {
+                cells[i].textContent = text;
+            }
+        });
+    });
 });
 
-socket.on('time_update', function(data) {
-    updateTime(data.duration, data.remaining);
+// 구독 그룹 (대시보드는 모든 카드를 표시하므로 전체 구독)
+const METRIC_GROUPS = ['cpu', 'memory', 'disk', 'network', 'gpu', 'processes'];
+
+function changeUpdateRate(event) {
+    socket.emit('subscribe', { max_rate: Number(event.target.value) });
+}
+
+// 델타 프레임 스트림 (frame.base 상태에 set/del 적용, base가 null이면 키프레임)
+const FRAME_HISTORY = 64;  // 서버 stream.STATE_HISTORY와 같은 수 (서버가 델타 기준으로 쓸 수 있는 프레임)
+const frameStates = new Map();  // seq -> 평탄한 상태
+
+function decodeFrame(payload) {
+    if (payload instanceof ArrayBuffer || ArrayBuffer.isView(payload)) {
+        return MessagePack.decode(payload instanceof ArrayBuffer ? new Uint8Array(payload) : payload);
+    }
+    return payload;
+}
+
+// 'cpu.percent' 형태의 평탄한 상태 -> 중첩 객체 (숫자 경로는 배열)
+function unflatten(flat) {
+    const root = {};
+    for (const path in flat) {
+        const parts = path.split('.');
+        let node = root;
+        for (let i = 0; i < parts.length - 1; i++) {
+            if (node[parts[i]] === undefined) {
+                node[parts[i]] = /^\d+$/.test(parts[i + 1]) ? [] : {};
+            }
+            node = node[parts[i]];
+        }
+        node[parts[parts.length - 1]] = flat[path];
+    }
+    return root;
+}
+
+// 백필: 컬럼형 히스토리 청크를 모두 받은 뒤 차트별로 한 번에 반영
+let backfillChunks = [];
+
+function decodeColumn(value, ArrayType) {
+    if (value instanceof Uint8Array) {
+        const buffer = value.buffer.slice(value.byteOffset, value.byteOffset + value.byteLength);
+        return Array.from(new ArrayType(buffer), v => (Number.isNaN(v) ? null : v));
+    }
+    return value;
+}
+
+socket.on('backfill', function(payload) {
+    const chunk = decodeFrame(payload);
+    if (chunk.index === 0) {
+        backfillChunks = [];
+    }
+    backfillChunks.push(chunk);
+    if (backfillChunks.length === chunk.count) {
+        applyBackfill(backfillChunks);
+        backfillChunks = [];
+    }
+});
+
+function applyBackfill(chunks) {
+    let timestamps = [];
+    const series = {};
+    chunks.forEach(chunk => {
+        timestamps = timestamps.concat(decodeColumn(chunk.timestamps, Float64Array));
+        for (const metric in chunk.series) {
+            series[metric] = (series[metric] || []).concat(decodeColumn(chunk.series[metric], Float32Array));
+        }
+    });
+
+    // 이미 차트에 있는 데이터보다 오래된 부분만 앞에 붙임
+    let count = timestamps.findIndex(ts => ts >= firstEpoch);
+    if (count < 0) {
+        count = timestamps.length;
+    }
+    if (count === 0) {
+        return;
+    }
+    firstEpoch = timestamps[0];
+    const x = timestamps.slice(0, count).map(ts => new Date(ts));
+    const values = metric => (series[metric] || []).slice(0, count);
+
+    [['cpu', 'cpu_percent'], ['memory', 'memory_percent'], ['gpu', 'gpu_usage']].forEach(([key, metric]) => {
+        values(metric).forEach(v => {
+            if (v !== null) {
+                addStat(key, v);
+            }
+        });
+    });
+
+    // 차트 반영은 다음 애니메이션 프레임에 (GPU별 트레이스는 실시간 데이터만 표시)
+    pendingBackfill = {
+        x: x,
+        charts: {
+            cpuChart: [values('cpu_percent')],
+            memChart: [values('memory_percent')],
+            gpuChart: [values('gpu_usage')],
+            diskChart: [values('disk_percent')],
+            netChart: [values('network_recv'), values('network_sent')]
+        }
+    };
+    scheduleRender();
+}
+
+// 백필 포인트를 차트 앞에 붙임 (차트마다 update 한 번, 표시 창 크기 유지)
+function prependBackfill(backfill) {
+    for (const chartId in backfill.charts) {
+        const chart = document.getElementById(chartId);
+        const traces = backfill.charts[chartId].map((_, i) => i);
+        Plotly.update(chartId, {
+            x: traces.map(i => backfill.x.concat(chart.data[i].x).slice(-MAX_POINTS)),
+            y: traces.map(i => backfill.charts[chartId][i].concat(chart.data[i].y).slice(-MAX_POINTS))
+        }, {}, traces);
+    }
+}
+
+socket.on('frame', function(payload) {
+    if (switchingHost) {
+        return;
+    }
+    const frame = decodeFrame(payload);
+    let state;
+    if (frame.base === null || frame.base === undefined) {
+        state = Object.assign({}, frame.set);
+    } else {
+        const base = frameStates.get(frame.base);
+        if (!base) {
+            // 기준 상태가 없으면 키프레임 요청
+            socket.emit('frame_ack', null);
+            return;
+        }
+        state = Object.assign({}, base, frame.set);
+        frame.del.forEach(path => delete state[path]);
+    }
+
+    frameStates.set(frame.seq, state);
+    while (frameStates.size > FRAME_HISTORY) {
+        frameStates.delete(frameStates.keys().next().value);
+    }
+    socket.emit('frame_ack', frame.seq);
+
+    updateData(unflatten(state));
 });
 
 socket.on('monitoring_complete', function(data) {
@@ -340,6 +859,114 @@ socket.on('monitoring_complete', function(data) {
     }
 });
 
+// 리포트 생성 진행 상황 (작업 프로세스에서 생성되므로 실시간 업데이트는 계속됨)
+const REPORT_STATUS_TEXT = {
+    queued: '리포트 대기 중',
+    running: '리포트 생성 중',
+    completed: '리포트 생성 완료',
+    failed: '리포트 생성 실패'
+};
+
+socket.on('report_progress', function(data) {
+    const text = REPORT_STATUS_TEXT[data.status] || data.status;
+    document.getElementById('reportStatus').textContent = `${text} (${data.progress}%)`;
+    if (data.status === 'completed' && data.key.startsWith('manual')) {
+        document.getElementById('footerMessage').innerHTML =
+            `PDF 리포트가 생성되었습니다: <strong>${data.pdf_path}</strong>`;
+    }
+});
+
+function requestReport() {
+    socket.emit('request_report', { host: currentHost }, function(job) {
+        if (job && job.status === 'failed') {
+            document.getElementById('reportStatus').textContent = job.error;
+        }
+    });
+}
+
+function changeProcessSort(event) {
+    socket.emit('set_process_sort', event.target.value, function(processes) {
+        if (processes && processes.length > 0) {
+            latestProcesses = processes;
+            scheduleRender();
+        }
+    });
+}
+
+// 모니터 자체 비용 패널 (화면이 보일 때만 INSTRUMENTATION_INTERVAL마다 조회)
+const INSTRUMENTATION_INTERVAL = 2000;
+const STAGE_ORDER = ['tick', 'cpu', 'network', 'memory', 'disk_io', 'disk_usage', 'gpu', 'processes',
+                     'process_scan', 'system_info', 'alerts', 'ingest', 'anomaly', 'serialize', 'emit'];
+let profilerRunning = false;
+let profilerControllable = false;
+
+function stageRank(stage) {
+    const index = STAGE_ORDER.indexOf(stage);
+    return index < 0 ? STAGE_ORDER.length : index;
+}
+
+function renderInstrumentation(snapshot) {
+    const process = snapshot.process;
+    const scheduler = snapshot.scheduler;
+    setText('selfCpu', process.cpu_percent.toFixed(1) + '%');
+    setText('selfRss', process.rss_mb.toFixed(1) + ' MB');
+    if (scheduler.ticks !== undefined) {
+        setText('selfTicks', `${scheduler.ticks} / ${scheduler.overruns}`);
+        setText('selfLateness', (scheduler.avg_lateness * 1000).toFixed(2) + ' / ' +
+                (scheduler.max_lateness * 1000).toFixed(1) + ' ms');
+    }
+
+    const stages = Object.keys(snapshot.stages).sort((a, b) => stageRank(a) - stageRank(b) || a.localeCompare(b));
+    updateTableRows('stageTable', stages, stage => {
+        const summary = snapshot.stages[stage];
+        return [stage, String(summary.count), summary.last_ms.toFixed(3), summary.p50_ms.toFixed(3),
+                summary.p95_ms.toFixed(3), summary.p99_ms.toFixed(3), summary.max_ms.toFixed(2)];
+    });
+    renderProfiler(snapshot.profiler);
+}
+
+function renderProfiler(profiler) {
+    profilerRunning = profiler.running;
+    const button = document.getElementById('profilerButton');
+    // 프로파일러는 서버와 같은 머신에서만 켜고 끌 수 있음 (controllable은 /api/instrumentation 응답에만 있음)
+    if (profiler.controllable !== undefined) {
+        profilerControllable = profiler.controllable;
+    }
+    button.disabled = !profiler.available || !profilerControllable;
+    button.title = profilerControllable ? '' : '서버와 같은 머신(localhost)에서만 사용할 수 있습니다';
+    button.textContent = profiler.running ? `프로파일러 중지 (${profiler.samples})` : '프로파일러 시작';
+    setVisible('profileTable', profiler.samples > 0);
+    updateTableRows('profileRows', profiler.self, entry => [
+        entry.function, String(entry.samples), entry.percent.toFixed(1) + '%'
+    ]);
+}
+
+function refreshInstrumentation() {
+    if (document.hidden) {
+        return;
+    }
+    fetch('/api/instrumentation')
+        .then(response => response.json())
+        .then(renderInstrumentation)
+        .catch(error => console.log('자체 비용 조회 실패:', error));
+}
+
+function toggleProfiler() {
+    fetch('/api/instrumentation/profiler', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ enabled: !profilerRunning })
+    })
+        .then(response => response.json())
+        .then(profiler => {
+            if (profiler.error) {
+                console.log('프로파일러:', profiler.error);
+                return;
+            }
+            renderProfiler(profiler);
+        });
+}
+
 socket.on('disconnect', function() {
     console.log('서버와의 연결이 끊어졌습니다.');
 });
@@ -347,5 +974,12 @@ socket.on('disconnect', function() {
 // 페이지 로드 시 차트 초기화
 window.addEventListener('DOMContentLoaded', function() {
     initCharts();
+    document.getElementById('reportButton').addEventListener('click', requestReport);
+    document.getElementById('processSort').addEventListener('change', changeProcessSort);
+    document.getElementById('updateRate').addEventListener('change', changeUpdateRate);
+    document.getElementById('hostSelect').addEventListener('change', changeHost);
+    document.getElementById('profilerButton').addEventListener('click', toggleProfiler);
+    refreshInstrumentation();
+    setInterval(refreshInstrumentation, INSTRUMENTATION_INTERVAL);
     console.log('대시보드 초기화 완료');
 });
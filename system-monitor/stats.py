@@ -0,0 +1,169 @@
+"""
+Streaming Statistics
+샘플마다 O(1)로 갱신되는 누적 통계와 P² 분위수 추정기
+"""
+
+import bisect
+import math
+from typing import Dict, Any, Sequence
+import numpy as np
+
+# 리포트/대시보드에서 제공하는 분위수
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RunningStats:
+    """Welford 알고리즘 기반 개수/평균/분산/최소/최대"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class P2Quantile:
+    """P² 알고리즘 (Jain & Chlamtac, 1985) 기반 스트리밍 분위수 추정기
+
+    마커 5개만 유지하므로 메모리와 갱신 비용이 샘플 수와 무관하게 일정합니다.
+    처음 EXACT_SAMPLES개는 정렬해 보관하면서 정확한 분위수를 돌려주고, 그 뒤에 마커를
+    버퍼의 분위수 위치로 초기화합니다 (샘플 5개로 시작하면 마커가 목표 위치까지 옮겨 가는 동안
+    p95/p99가 중앙값 근처에 머무름).
+    """
+
+    EXACT_SAMPLES = 32
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []
+        self.positions = None  # 마커 초기화 전에는 None
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+        self.desired = None
+
+    def _init_markers(self):
+        q = self.heights
+        n = len(q)
+        self.desired = [1 + (n - 1) * dp for dp in self.increments]
+        positions = [1]
+        for i in range(1, 5):
+            # 정수 위치, 마커끼리 겹치지 않게
+            positions.append(min(max(round(self.desired[i]), positions[-1] + 1), n - (4 - i)))
+        self.positions = positions
+        self.heights = [q[i - 1] for i in positions]
+
+    def update(self, x: float):
+        q = self.heights
+        if self.positions is None:
+            bisect.insort(q, x)
+            if len(q) >= self.EXACT_SAMPLES:
+                self._init_markers()
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(q, x) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # 중간 마커 위치 보정
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q = self.heights
+        n = self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        q = self.heights
+        if not q:
+            return math.nan
+        if self.positions is None:
+            # 마커 초기화 전에는 정확한 분위수 계산
+            return float(np.percentile(q, self.p * 100))
+        return q[2]
+
+
+class MetricStats:
+    """메트릭 하나의 누적 통계와 분위수"""
+
+    def __init__(self, quantiles: Sequence[float] = QUANTILES):
+        self.running = RunningStats()
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def update(self, x: float):
+        self.running.update(x)
+        for estimator in self.quantiles.values():
+            estimator.update(x)
+
+    def summary(self) -> Dict[str, Any]:
+        running = self.running
+        summary = {
+            'avg': running.mean,
+            'min': running.min,
+            'max': running.max,
+            'count': running.count,
+            'std': math.sqrt(running.variance)
+        }
+        for p, estimator in self.quantiles.items():
+            summary[quantile_key(p)] = estimator.value()
+        return summary
+
+
+def quantile_key(p: float) -> str:
+    """0.95 -> 'p95'"""
+    return f"p{p * 100:g}"
+
+
+def summarize_array(values: np.ndarray, quantiles: Sequence[float] = QUANTILES) -> Dict[str, Any]:
+    """배열 구간의 통계 (NaN 제외, 값이 없으면 None)"""
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return None
+
+    summary = {
+        'avg': float(values.mean(dtype=np.float64)),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'count': int(values.size),
+        'std': float(values.std(dtype=np.float64, ddof=1)) if values.size > 1 else 0.0
+    }
+    percentiles = np.percentile(values, [p * 100 for p in quantiles])
+    for p, value in zip(quantiles, percentiles):
+        summary[quantile_key(p)] = float(value)
+    return summary
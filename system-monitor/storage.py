@@ -0,0 +1,257 @@
+"""
+Segment Storage
+추가 전용 고정 폭 바이너리 세그먼트 파일 기반의 시계열 저장소
+"""
+
+import glob
+import json
+import math
+import mmap
+import os
+import re
+import time
+import zlib
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+MAGIC = b'SMSEG001'
+HEADER_SIZE = 4096  # 헤더 영역 크기 (레코드는 이 오프셋부터 시작)
+
+# segment_<시작 ms>_<시간대 안 순번>_<스키마 CRC>.seg (순번이 없는 이전 형식도 읽음)
+_SEGMENT_NAME = re.compile(r'segment_(\d+)(?:_(\d+))?_(\d+)\.seg$')
+
+
+def record_dtype(columns: Dict[str, int]) -> np.dtype:
+    """컬럼 스키마 -> 고정 폭 레코드 dtype (int64 epoch ms + float32 값)"""
+    fields = [('timestamps', '<i8')]
+    for name, width in columns.items():
+        fields.append((name, '<f4', (width,)) if width else (name, '<f4'))
+    return np.dtype(fields)
+
+
+class Segment:
+    """세그먼트 파일 하나 (헤더 + 고정 폭 레코드 배열)"""
+
+    def __init__(self, path: str, columns: Dict[str, int], start_ms: int, seq: int = 0):
+        self.path = path
+        self.columns = columns
+        self.start_ms = start_ms
+        self.seq = seq  # 같은 시간대에서 만든 순서 (재시작으로 스키마가 바뀌면 새 파일)
+        self.dtype = record_dtype(columns)
+
+    @classmethod
+    def open(cls, path: str) -> Optional['Segment']:
+        """기존 세그먼트 헤더 읽기 (손상된 헤더면 None)"""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+                return None
+            length = int.from_bytes(header[8:12], 'little')
+            meta = json.loads(header[12:12 + length].decode('utf-8'))
+            match = _SEGMENT_NAME.search(os.path.basename(path))
+            seq = int(match.group(2)) if match and match.group(2) is not None else -1
+            return cls(path, dict(meta['columns']), meta['start_ms'], seq)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def write_header(self, f):
+        meta = json.dumps({'columns': list(self.columns.items()), 'start_ms': self.start_ms}).encode('utf-8')
+        header = MAGIC + len(meta).to_bytes(4, 'little') + meta
+        if len(header) > HEADER_SIZE:
+            raise ValueError("segment schema too large for header")
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+
+    def record_count(self) -> int:
+        size = os.path.getsize(self.path)
+        return max(0, (size - HEADER_SIZE) // self.dtype.itemsize)
+
+    def first_timestamp(self) -> float:
+        """첫 레코드 시각 (epoch ms, 레코드가 없으면 inf)"""
+        if self.record_count() == 0:
+            return math.inf
+        with open(self.path, 'rb') as f:
+            f.seek(HEADER_SIZE)
+            return int.from_bytes(f.read(8), 'little', signed=True)
+
+    def sort_key(self):
+        """시간순 정렬 키 - 시간대, 시간대 안 순번, 첫 레코드 시각 (순번이 없는 이전 형식 파일끼리 비교)"""
+        return self.start_ms, self.seq, self.first_timestamp()
+
+    def recover(self) -> int:
+        """마지막 레코드가 중간에 끊긴 경우 완전한 레코드까지 잘라냄"""
+        count = self.record_count()
+        valid_size = HEADER_SIZE + count * self.dtype.itemsize
+        if os.path.getsize(self.path) != valid_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_size)
+                os.fsync(f.fileno())
+        return count
+
+    def records(self) -> np.ndarray:
+        """mmap 기반 레코드 배열 (복사 없음, 읽기 전용)"""
+        count = self.record_count()
+        if count == 0:
+            return np.zeros(0, dtype=self.dtype)
+        with open(self.path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), HEADER_SIZE + count * self.dtype.itemsize, access=mmap.ACCESS_READ)
+        return np.frombuffer(mm, dtype=self.dtype, count=count, offset=HEADER_SIZE)
+
+
+class SegmentStore:
+    """시간 단위로 회전하는 추가 전용 세그먼트 파일 모음
+
+    레코드는 버퍼링 후 fsync_batch개 또는 fsync_interval초마다 일괄 fsync합니다.
+    읽기는 mmap으로 복사 없이 수행되며, 시작 시 끊긴 마지막 레코드를 복구합니다.
+    """
+
+    def __init__(self, directory: str, columns: Dict[str, int],
+                 segment_seconds: float = 3600, retention_seconds: Optional[float] = None,
+                 fsync_batch: int = 100, fsync_interval: float = 5.0):
+        self.directory = directory
+        self.columns = dict(columns)
+        self.dtype = record_dtype(self.columns)
+        self.segment_ms = int(segment_seconds * 1000)
+        self.retention_ms = int(retention_seconds * 1000) if retention_seconds else None
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+
+        self._record = np.zeros((), dtype=self.dtype)
+        self._file = None
+        self._segment: Optional[Segment] = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        self.recover()
+
+    def _paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, 'segment_*.seg')))
+
+    def segments(self) -> List[Segment]:
+        """시간순 세그먼트 목록 (손상된 파일 제외)
+
+        파일 이름순은 같은 시간대의 파일을 스키마 CRC로 정렬하므로 Segment.sort_key로 정렬합니다.
+        """
+        segments = [s for s in (Segment.open(path) for path in self._paths()) if s is not None]
+        return sorted(segments, key=Segment.sort_key)
+
+    def recover(self):
+        """손상된 헤더 파일을 격리하고 끊긴 마지막 레코드 정리"""
+        for path in self._paths():
+            segment = Segment.open(path)
+            if segment is None:
+                os.replace(path, path + '.corrupt')
+            else:
+                segment.recover()
+
+    def _segment_path(self, start_ms: int, seq: int) -> str:
+        schema_id = zlib.crc32(repr(self.dtype.descr).encode('utf-8')) % 10**8
+        return os.path.join(self.directory, f"segment_{start_ms:015d}_{seq:04d}_{schema_id:08d}.seg")
+
+    def _rotate(self, timestamp_ms: int):
+        """레코드 시각에 맞는 세그먼트 파일 열기
+
+        같은 시간대의 마지막 파일이 같은 스키마면 이어서 쓰고, 아니면(예: 재시작 후 코어/장치 수 변경)
+        다음 순번으로 새 파일을 만듭니다. 이전 스키마 파일을 다시 열면 레코드 시각이 섞이기 때문입니다.
+        """
+        start_ms = timestamp_ms - timestamp_ms % self.segment_ms
+        if self._segment is not None and self._segment.start_ms == start_ms:
+            return
+
+        self.close()
+        existing = [s for s in self.segments() if s.start_ms == start_ms]
+        last = existing[-1] if existing else None
+        if last is not None and last.dtype == self.dtype:
+            segment = Segment(last.path, self.columns, start_ms, last.seq)
+            segment.recover()
+            self._file = open(segment.path, 'ab')
+        else:
+            seq = last.seq + 1 if last is not None else 0
+            segment = Segment(self._segment_path(start_ms, seq), self.columns, start_ms, seq)
+            self._file = open(segment.path, 'wb')
+            segment.write_header(self._file)
+        self._segment = segment
+        self._prune(timestamp_ms)
+
+    def append(self, timestamp_ms: int, values: Dict[str, Any]):
+        """레코드 하나 추가 (일괄 fsync)"""
+        self._rotate(timestamp_ms)
+
+        record = self._record
+        record['timestamps'] = timestamp_ms
+        for name, width in self.columns.items():
+            value = values.get(name)
+            if value is None:
+                record[name] = np.nan
+            elif width:
+                row = np.full(width, np.nan, dtype=np.float32)
+                n = min(width, len(value))
+                row[:n] = value[:n]
+                record[name] = row
+            else:
+                record[name] = value
+        self._file.write(record.tobytes())
+
+        self._pending += 1
+        if self._pending >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """버퍼를 비우고 fsync"""
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """현재 세그먼트 fsync 후 닫기"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+        self._file = None
+        self._segment = None
+
+    def _prune(self, now_ms: int):
+        """보관 기간이 지난 세그먼트 삭제"""
+        if self.retention_ms is None:
+            return
+        for segment in self.segments():
+            if segment.start_ms + self.segment_ms < now_ms - self.retention_ms:
+                os.remove(segment.path)
+
+    def read_range(self, start_ms: int = None, end_ms: int = None) -> List[np.ndarray]:
+        """구간의 레코드 배열 목록 (세그먼트별 mmap 뷰, 복사 없음)"""
+        if self._file is not None:
+            self._file.flush()
+
+        arrays = []
+        for segment in self.segments():
+            if end_ms is not None and segment.start_ms > end_ms:
+                continue
+            if start_ms is not None and segment.start_ms + self.segment_ms <= start_ms:
+                continue
+            records = segment.records()
+            timestamps = records['timestamps']
+            lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side='left'))
+            hi = len(records) if end_ms is None else int(np.searchsorted(timestamps, end_ms, side='right'))
+            if hi > lo:
+                arrays.append(records[lo:hi])
+        return arrays
+
+    def tail(self, count: int) -> List[np.ndarray]:
+        """가장 최근 count개 레코드 (세그먼트별 mmap 뷰 목록, 시간순)"""
+        if self._file is not None:
+            self._file.flush()
+
+        arrays = []
+        remaining = count
+        for segment in reversed(self.segments()):
+            if remaining <= 0:
+                break
+            records = segment.records()
+            if len(records):
+                arrays.append(records[-remaining:])
+                remaining -= len(arrays[-1])
+        return arrays[::-1]
@@ -0,0 +1,266 @@
+"""
+Frame Stream
+대시보드 전송용 델타 프레임 인코더 (클라이언트가 확인한 상태 대비 변경분 + 주기적 키프레임)
+"""
+
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
+from decimation import decimate_minmax
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성: 없으면 JSON 프레임만 사용
+    msgpack = None
+
+KEYFRAME_INTERVAL = 30  # 클라이언트별로 이 프레임 수마다 전체 상태 전송
+STATE_HISTORY = 64  # 델타 기준으로 쓸 수 있는 최근 프레임 수 (10 Hz 틱 기준 6.4초)
+ENCODINGS = ('json', 'msgpack')
+
+# 구독 가능한 메트릭 그룹 (평탄한 경로의 첫 부분)
+METRIC_GROUPS = ('cpu', 'memory', 'disk', 'network', 'gpu', 'processes')
+COMMON_FIELDS = ('timestamp', 'epoch', 'time')  # 구독과 무관하게 항상 포함
+
+DEFAULT_MAX_RATE = 1.0  # 클라이언트 기본 최대 업데이트 횟수 (Hz)
+MAX_RATE = 10.0  # 클라이언트가 요청할 수 있는 최대 업데이트 횟수 (Hz)
+MAX_INFLIGHT = 2  # 확인되지 않은 프레임이 이만큼 쌓이면 새 프레임을 보내지 않음
+ACK_TIMEOUT = 10.0  # 이 시간(초) 동안 확인이 없으면 확인 대기를 버리고 키프레임부터 다시 전송
+
+BACKFILL_CHUNK_POINTS = 1000  # 백필 청크 하나의 최대 포인트 수
+
+
+def flatten(data: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """중첩 dict -> 'cpu.percent' 형태의 평탄한 dict
+
+    dict 목록(GPU, 프로세스)은 'processes.0.name'처럼 인덱스 경로로 펼치고,
+    숫자 목록(코어별 사용률 등)과 빈 목록은 값 하나로 취급합니다.
+    """
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + '.'))
+        elif isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            flat.update(flatten({str(i): v for i, v in enumerate(value)}, path + '.'))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def diff(base: Dict[str, Any], state: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """(바뀌거나 추가된 항목, 삭제된 경로)"""
+    changed = {key: value for key, value in state.items()
+               if key not in base or not _same(base[key], value)}
+    removed = [key for key in base if key not in state]
+    return changed, removed
+
+
+def select(state: Dict[str, Any], groups: frozenset) -> Dict[str, Any]:
+    """구독한 그룹과 공통 필드만 남긴 상태"""
+    return {key: value for key, value in state.items()
+            if key.split('.', 1)[0] in groups or key.split('.', 1)[0] in COMMON_FIELDS}
+
+
+class FrameStream:
+    """클라이언트별 구독/전송 주기/확인(ack) 상태를 추적하며 틱마다 프레임을 만드는 인코더
+
+    프레임: {'seq', 'base', 'set', 'del'} - base가 None이면 키프레임(set이 전체 상태)이고,
+    아니면 클라이언트가 확인한 base 프레임 상태에 set/del을 적용합니다.
+    각 클라이언트는 구독한 그룹만 max_rate 이하로 받습니다. 확인되지 않은 프레임이
+    MAX_INFLIGHT개 쌓인 느린 클라이언트는 건너뛰고, 따라잡으면 그 사이 프레임 대신
+    최신 상태의 델타 하나를 받으므로 서버에 오래된 프레임이 쌓이지 않습니다.
+    같은 기준 프레임/구독/인코딩을 가진 클라이언트는 한 번 인코딩한 프레임을 공유합니다.
+    """
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL, history: int = STATE_HISTORY,
+                 clock=time.monotonic):
+        self.keyframe_interval = keyframe_interval
+        self.history = history
+        self.clock = clock
+        self._seq = itertools.count(1)
+        self._states: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        self._clients: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def connect(self, sid: str, encoding: str = 'json', groups: Iterable[str] = None,
+                max_rate: float = None) -> Dict[str, Any]:
+        """클라이언트 등록 (첫 프레임은 키프레임) - 실제 적용된 설정 반환
+
+        groups가 None이면 모든 그룹, max_rate가 None이면 DEFAULT_MAX_RATE
+        """
+        if encoding not in ENCODINGS or (encoding == 'msgpack' and msgpack is None):
+            encoding = 'json'
+        with self._lock:
+            self._clients[sid] = {
+                'encoding': encoding,
+                'groups': frozenset(),
+                'interval': 1.0 / DEFAULT_MAX_RATE,
+                'acked': None,
+                'sent': [],  # 확인 대기 중인 (프레임 seq, 전송 시각)
+                'last_sent': None,
+                'since_keyframe': 0,
+                'dropped': 0
+            }
+        return {'encoding': encoding,
+                **self.subscribe(sid, METRIC_GROUPS if groups is None else groups,
+                                 DEFAULT_MAX_RATE if max_rate is None else max_rate)}
+
+    def subscribe(self, sid: str, groups: Iterable[str] = None, max_rate: float = None) -> Dict[str, Any]:
+        """구독 그룹과 최대 업데이트 횟수(Hz) 변경 - 실제 적용된 값 반환"""
+        with self._lock:
+            client = self._clients.get(sid)
+            if client is None:
+                return {}
+            if groups is not None:
+                client['groups'] = frozenset(g for g in groups if g in METRIC_GROUPS)
+            if max_rate is not None:
+                rate = min(max(float(max_rate), 0.01), MAX_RATE)
+                client['interval'] = 1.0 / rate
+            return {'groups': sorted(client['groups']), 'max_rate': 1.0 / client['interval']}
+
+    def encoding(self, sid: str) -> str:
+        """클라이언트의 프레임 인코딩 (등록 전이면 'json')"""
+        with self._lock:
+            client = self._clients.get(sid)
+            return client['encoding'] if client is not None else 'json'
+
+    def disconnect(self, sid: str):
+        with self._lock:
+            self._clients.pop(sid, None)
+
+    def ack(self, sid: str, seq: Optional[int]):
+        """클라이언트가 seq 프레임까지 적용함 (None이면 다음 프레임을 키프레임으로)"""
+        with self._lock:
+            client = self._clients.get(sid)
+            if client is None:
+                return
+            if seq is None:
+                client['acked'] = None
+                client['sent'] = []
+            elif client['acked'] is None or seq > client['acked']:
+                client['acked'] = seq
+                client['sent'] = [(s, at) for s, at in client['sent'] if s > seq]
+
+    def active_groups(self) -> frozenset:
+        """한 클라이언트라도 구독 중인 그룹"""
+        with self._lock:
+            return frozenset().union(*(c['groups'] for c in self._clients.values()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """클라이언트 수, 느린 클라이언트 때문에 건너뛴 프레임 수"""
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'dropped': sum(c['dropped'] for c in self._clients.values()),
+                'slow_clients': sum(1 for c in self._clients.values() if len(c['sent']) >= MAX_INFLIGHT)
+            }
+
+    def frames(self, data: Dict[str, Any], now: float = None) -> List[Tuple[List[str], Any]]:
+        """이번 틱에 보낼 (클라이언트 sid 목록, 인코딩된 프레임) 목록"""
+        now = self.clock() if now is None else now
+
+        with self._lock:
+            due = []
+            for sid, client in self._clients.items():
+                if client['last_sent'] is not None and now - client['last_sent'] < client['interval'] - 1e-3:
+                    continue
+                if len(client['sent']) >= MAX_INFLIGHT:
+                    if now - client['sent'][0][1] < ACK_TIMEOUT:
+                        # 느린 클라이언트: 쌓아 두지 않고 이번 프레임은 건너뜀
+                        client['dropped'] += 1
+                        continue
+                    # 확인이 유실된 것으로 보고 키프레임부터 다시 시작
+                    client['acked'] = None
+                    client['sent'] = []
+                due.append((sid, client))
+            if not due:
+                return []
+
+            seq = next(self._seq)
+            state = flatten(data)
+
+            groups: Dict[Tuple[Optional[int], str, frozenset], List[str]] = {}
+            for sid, client in due:
+                base = client['acked']
+                if base not in self._states or client['since_keyframe'] >= self.keyframe_interval:
+                    base = None
+                groups.setdefault((base, client['encoding'], client['groups']), []).append(sid)
+
+                client['sent'].append((seq, now))
+                client['last_sent'] = now
+                client['since_keyframe'] = 0 if base is None else client['since_keyframe'] + 1
+
+            encoded = []
+            selected = {}
+            for (base, encoding, subscribed), sids in groups.items():
+                if subscribed not in selected:
+                    selected[subscribed] = select(state, subscribed)
+                if base is None:
+                    frame = {'seq': seq, 'base': None, 'set': selected[subscribed], 'del': []}
+                else:
+                    changed, removed = diff(select(self._states[base], subscribed), selected[subscribed])
+                    frame = {'seq': seq, 'base': base, 'set': changed, 'del': removed}
+                encoded.append((sids, self.encode(frame, encoding)))
+
+            self._states[seq] = state
+            while len(self._states) > self.history:
+                self._states.popitem(last=False)
+        return encoded
+
+    @staticmethod
+    def encode(frame: Dict[str, Any], encoding: str) -> Any:
+        """msgpack이면 bytes, json이면 dict 그대로 (Socket.IO가 직렬화)
+
+        실수는 float64 그대로 보냅니다 (float32는 epoch 초를 128초 단위로 잘라 차트 시간축이 어긋남).
+        """
+        if encoding == 'msgpack':
+            return msgpack.packb(frame)
+        return frame
+
+
+def backfill_chunks(history: Dict[str, Any], max_points: int, encoding: str = 'json',
+                    chunk_points: int = BACKFILL_CHUNK_POINTS) -> List[Any]:
+    """query_history 결과 -> 늦게 접속한 클라이언트용 컬럼형 백필 청크 목록
+
+    max_points를 넘으면 min/max 버킷으로 줄이고(스파이크 유지), chunk_points개씩 나눕니다.
+    청크: {'index', 'count', 'tier', 'timestamps', 'series': {metric: values}}
+    msgpack이면 timestamps는 float64(epoch ms), 값은 float32 리틀 엔디언 바이트(NaN = 빈 값),
+    json이면 숫자 목록(None = 빈 값)입니다.
+    """
+    timestamps, series, _, _ = decimate_minmax(
+        history['timestamps'],
+        {metric: aggregates['avg'] for metric, aggregates in history['series'].items()},
+        max(1, max_points // 2))
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    series = {metric: np.asarray(values, dtype=np.float32) for metric, values in series.items()}
+
+    count = max(1, -(-len(timestamps) // chunk_points))
+    chunks = []
+    for index in range(count):
+        part = slice(index * chunk_points, (index + 1) * chunk_points)
+        chunk = {
+            'index': index,
+            'count': count,
+            'tier': history['tier'],
+            'timestamps': _pack_column(timestamps[part], '<f8', encoding),
+            'series': {metric: _pack_column(values[part], '<f4', encoding)
+                       for metric, values in series.items()}
+        }
+        chunks.append(FrameStream.encode(chunk, encoding))
+    return chunks
+
+
+def _pack_column(values: np.ndarray, dtype: str, encoding: str) -> Any:
+    if encoding == 'msgpack':
+        return np.ascontiguousarray(values, dtype=dtype).tobytes()
+    return [None if not math.isfinite(v) else v for v in values.tolist()]
@@ -0,0 +1,75 @@
+"""
+SegmentStore 회귀 테스트 (python -m pytest tests)
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from storage import Segment, SegmentStore  # noqa: E402
+
+HOUR_MS = 3600 * 1000
+BASE_MS = 1_700_000_000_000 - 1_700_000_000_000 % HOUR_MS  # 시간대 경계
+
+
+def write(directory, columns, timestamps):
+    """새 SegmentStore(재시작)로 timestamps의 레코드를 쓰고 닫기"""
+    store = SegmentStore(directory, columns)
+    for ts in timestamps:
+        store.append(BASE_MS + ts, {'cpu_percent': float(ts), 'cpu_per_core': [float(ts)] * 8})
+    store.close()
+
+
+def timestamps(arrays):
+    return np.concatenate([a['timestamps'] for a in arrays]) - BASE_MS
+
+
+def test_restart_with_different_columns_in_same_hour_stays_monotonic(tmp_path):
+    directory = str(tmp_path)
+    narrow = {'cpu_percent': 0, 'cpu_per_core': 2}
+    wide = {'cpu_percent': 0, 'cpu_per_core': 4}
+    # 같은 시간대 안에서 코어 수가 바뀌는 재시작을 두 번 (이전 스키마로 되돌아감)
+    write(directory, narrow, range(0, 100))
+    write(directory, wide, range(100, 150))
+    write(directory, narrow, range(150, 153))
+
+    store = SegmentStore(directory, narrow)
+    assert len(store.segments()) == 3  # 이전 스키마 파일을 다시 열지 않음
+
+    tail = timestamps(store.tail(10))
+    assert list(tail) == list(range(143, 153))
+
+    everything = timestamps(store.read_range())
+    assert list(everything) == list(range(153))
+    assert list(timestamps(store.read_range(BASE_MS + 95, BASE_MS + 105))) == list(range(95, 106))
+    store.close()
+
+
+def test_same_schema_restart_appends_to_the_same_file(tmp_path):
+    directory = str(tmp_path)
+    columns = {'cpu_percent': 0, 'cpu_per_core': 2}
+    write(directory, columns, range(0, 10))
+    write(directory, columns, range(10, 20))
+
+    store = SegmentStore(directory, columns)
+    assert len(store.segments()) == 1
+    assert list(timestamps(store.tail(100))) == list(range(20))
+    store.close()
+
+
+def test_legacy_segment_names_are_ordered_by_first_record(tmp_path):
+    directory = str(tmp_path)
+    write(directory, {'cpu_percent': 0, 'cpu_per_core': 4}, range(0, 5))
+    write(directory, {'cpu_percent': 0, 'cpu_per_core': 2}, range(5, 10))
+    # 순번 없는 이전 이름 (segment_<시작>_<CRC>.seg) - 먼저 쓴 파일이 이름순으로는 뒤에 오도록
+    segments = sorted((Segment.open(os.path.join(directory, name)) for name in os.listdir(directory)),
+                      key=Segment.first_timestamp)
+    for segment, crc in zip(segments, ('99999999', '00000000')):
+        os.rename(segment.path, os.path.join(directory, f'segment_{segment.start_ms:015d}_{crc}.seg'))
+
+    store = SegmentStore(directory, {'cpu_percent': 0, 'cpu_per_core': 2})
+    assert list(timestamps(store.read_range())) == list(range(10))
+    store.close()
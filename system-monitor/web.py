@@ -0,0 +1,482 @@
+"""
+Web Dashboard Server
+실시간 대시보드 / HTTP API / 에이전트 수신 서버 (Flask-SocketIO)
+
+main.py가 첫 샘플을 수집한 뒤에 불러오므로 Flask / eventlet 로딩이 수집 시작을 늦추지 않습니다.
+"""
+
+from flask import Flask, Response, render_template, request
+from flask_socketio import SocketIO, emit, join_room, leave_room
+from aggregator import Fleet, AgentServer, LOCAL_HOST
+from exporter import MetricsExporter
+from history_api import HistoryAPI
+from monitor import HISTORY_METRICS
+from report_generator import ReportSnapshot
+from report_jobs import ReportJobQueue
+from runner import MonitoringRun
+from stream import FrameStream, METRIC_GROUPS, backfill_chunks
+import contextlib
+import ipaddress
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+import webbrowser
+import os
+
+# Flask 앱 설정
+app = Flask(__name__)
+app.config['SECRET_KEY'] = 'system-monitor-secret-key-2024'
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
+
+# 전역 변수 (모니터와 실행기는 serve()에서 main.py의 설정으로 만듦)
+monitor = None
+monitoring_run = None
+EMIT_INTERVAL = 0.1  # 전송 틱 주기 (초) - 클라이언트별 실제 전송은 각자의 max_rate 이하
+
+# 늦게 접속한 클라이언트에 보내는 차트용 히스토리 (backfill 이벤트)
+BACKFILL_METRICS = ('cpu_percent', 'memory_percent', 'gpu_usage', 'disk_percent', 'network_recv', 'network_sent')
+MAX_BACKFILL_POINTS = 5000
+
+# 원격 에이전트 수신 (agent.py) - 호스트별 히스토리는 data/hosts/<호스트>에 저장
+HOSTS_INTERVAL = 1.0  # 호스트 목록(hosts 이벤트) 전송 주기 (초)
+fleet = None
+agent_server = None
+
+# HTTP 히스토리 조회 (/api/history) - 닫힌 구간 응답은 캐시, 호스트별 처리기
+history_apis = {}
+
+# OpenMetrics 노출 (/metrics) - 틱 결과를 스크레이프 시 한 번만 렌더링해 공유
+metrics_exporter = MetricsExporter()
+
+# 대시보드 전송: 클라이언트마다 구독한 그룹의, 확인한 상태 대비 변경분만 담은 프레임 하나
+# 호스트마다 스트림 하나 (로컬 스트림 구독자만 로컬 수집 그룹을 결정)
+frame_stream = FrameStream()
+host_streams = {LOCAL_HOST: frame_stream}
+client_hosts = {}  # sid -> 보고 있는 호스트
+
+# 다른 스레드(리포트 작업 디스패처)의 이벤트는 큐를 거쳐 서버 이벤트 루프에서 전송
+# (eventlet 모드에서는 OS 스레드에서 직접 emit한 이벤트가 전달되지 않음)
+pending_events = queue.Queue()
+
+def post_event(event: str, payload):
+    """스레드 안전한 이벤트 전송 요청"""
+    pending_events.put((event, payload))
+
+def relay_events():
+    """대기 중인 이벤트를 클라이언트에 전송하는 백그라운드 작업"""
+    while True:
+        while not pending_events.empty():
+            socketio.emit(*pending_events.get_nowait())
+        socketio.sleep(0.1)
+
+# 리포트는 별도 프로세스에서 생성 (진행 상황은 report_progress 이벤트로 전송)
+report_jobs = ReportJobQueue(post_event)
+
+def host_source(host: str = None):
+    """호스트 -> (히스토리, 시스템 정보, 조회 잠금) - 없는 호스트면 None
+
+    원격 호스트 히스토리는 에이전트 연결 스레드가 갱신하므로 잠금 안에서 읽어야 합니다.
+    잠금 안에서는 emit 등 이벤트 루프에 양보하는 호출을 하지 마세요.
+    """
+    if not host or host == LOCAL_HOST:
+        return monitor, monitor.system_info or monitor.get_system_info(), contextlib.nullcontext()
+    remote = fleet.get(host)
+    if remote is None:
+        return None
+    return remote.history, remote.system_info, fleet.reading()
+
+@app.route('/')
+def index():
+    """메인 페이지"""
+    system_info = monitor.get_system_info()
+    start_time = (monitor.start_time or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+    return render_template('dashboard.html',
+                         system_info=system_info,
+                         start_time=start_time,
+                         duration=int(monitoring_run.duration))
+
+@app.route('/api/history')
+def api_history():
+    """히스토리 조회 API - 구간을 step초 버킷으로 나눈 메트릭별 min/max/avg (JSON)
+
+    인자: metrics (쉼표 구분), start, end (epoch 초), step (초), host (기본값: local)
+    """
+    host = request.args.get('host') or LOCAL_HOST
+    source = host_source(host)
+    if source is None:
+        return Response(json.dumps({'error': f'unknown host: {host}'}), status=404,
+                        content_type='application/json')
+    history, _, lock = source
+    if host not in history_apis:
+        history_apis[host] = HistoryAPI(history, HISTORY_METRICS)
+    with lock:
+        status, headers, body = history_apis[host].handle(request.args, request.if_none_match,
+                                                          'gzip' in request.accept_encodings)
+    return Response(body, status=status, headers=headers)
+
+@app.route('/api/hosts')
+def api_hosts():
+    """호스트 목록 (로컬, 전체 집계, 원격 에이전트별 최근 요약)"""
+    return Response(json.dumps(fleet.summary()), content_type='application/json')
+
+def is_local_request() -> bool:
+    """같은 머신(루프백 주소)에서 온 요청인지"""
+    try:
+        return ipaddress.ip_address(request.remote_addr or '').is_loopback
+    except ValueError:
+        return False
+
+@app.route('/api/instrumentation')
+def api_instrumentation():
+    """모니터 자체 비용 - 단계별 지연 시간 히스토그램, 프로세스 CPU/RSS, 틱/오버런, 전송 통계, 프로파일러 상태
+
+    profiler.controllable은 이 요청에서 프로파일러를 켜고 끌 수 있는지 (루프백 주소만)
+    """
+    snapshot = monitoring_run.instrumentation()
+    snapshot['stream'] = frame_stream.get_stats()
+    snapshot['profiler']['controllable'] = is_local_request()
+    return Response(json.dumps(snapshot), content_type='application/json')
+
+@app.route('/api/instrumentation/profiler', methods=['POST'])
+def api_profiler():
+    """샘플링 프로파일러 켜기/끄기 - 본문: {"enabled": true, "interval_ms": 5}
+
+    대시보드는 기본적으로 모든 인터페이스에서 받으므로 루프백 주소의 요청만 허용합니다.
+    """
+    if not is_local_request():
+        return Response(json.dumps({'error': 'profiler control is only allowed from localhost'}), status=403,
+                        content_type='application/json')
+    options = request.get_json(silent=True) or {}
+    profiler = monitor.instrumentation.profiler
+    try:
+        if options.get('enabled'):
+            profiler.start(float(options.get('interval_ms', profiler.interval * 1000)) / 1000)
+        else:
+            profiler.stop()
+    except (RuntimeError, ValueError) as e:
+        return Response(json.dumps({'error': str(e)}), status=400, content_type='application/json')
+    return Response(json.dumps(profiler.summary()), content_type='application/json')
+
+@app.route('/api/instrumentation/profile')
+def api_profile():
+    """프로파일러 샘플의 접힌 스택 텍스트 (flamegraph.pl, speedscope에서 열 수 있음)"""
+    return Response(monitor.instrumentation.profiler.collapsed(), content_type='text/plain; charset=utf-8')
+
+@app.route('/api/alerts')
+def api_alerts():
+    """알림 규칙, 활성 알림, 최근 상태 전이 (로컬 모니터)"""
+    return Response(json.dumps(monitor.alerts.snapshot()), content_type='application/json')
+
+def emit_alert(transition):
+    """알림 상태 전이를 해당 그룹을 구독한 클라이언트(room group:<그룹>)에 전송
+
+    수집 루프(서버 이벤트 루프)에서 호출되므로 바로 전송합니다.
+    """
+    socketio.emit('alert', {**transition, 'host': LOCAL_HOST}, to=f"group:{transition['group']}")
+
+@app.route('/api/anomalies')
+def api_anomalies():
+    """이상치 / 변화점 검출 설정과 최근 이벤트 - 인자: host (기본값: local), since (epoch 초)"""
+    host = request.args.get('host') or LOCAL_HOST
+    source = host_source(host)
+    if source is None:
+        return Response(json.dumps({'error': f'unknown host: {host}'}), status=404,
+                        content_type='application/json')
+    history, _, lock = source
+    since = request.args.get('since', type=float)
+    with lock:
+        snapshot = history.anomalies.snapshot(since)
+    return Response(json.dumps(snapshot), content_type='application/json')
+
+def emit_anomaly(event, host: str = LOCAL_HOST):
+    """이상 징후 이벤트를 해당 그룹을 구독한 클라이언트(room group:<그룹>)에 전송 (차트 표시용)
+
+    로컬 모니터는 수집 루프, 원격 호스트는 fleet_task에서 호출됩니다 (둘 다 서버 이벤트 루프).
+    """
+    socketio.emit('anomaly', {**event, 'host': host}, to=f"group:{event['group']}")
+
+@app.route('/metrics')
+def metrics():
+    """OpenMetrics 텍스트 (수집기를 실행하지 않고 마지막 틱 결과를 사용)"""
+    body, headers = metrics_exporter.scrape('gzip' in request.accept_encodings)
+    return Response(body, headers=headers)
+
+def request_report(key: str, on_done=None, host: str = LOCAL_HOST):
+    """호스트의 현재 히스토리 스냅샷으로 리포트 작업 등록 (같은 key의 진행 중 작업은 재사용)"""
+    history, system_info, lock = host_source(host)
+    with lock:
+        snapshot = ReportSnapshot.capture(history, system_info)
+    return report_jobs.submit(key, snapshot, on_done=on_done)
+
+def on_final_report(job):
+    """모니터링 종료 리포트 완료 알림"""
+    if job.pdf_path is None:
+        print(f"\n✗ PDF 리포트 생성 실패: {job.error}")
+        return
+
+    print(f"\n✓ PDF 리포트가 생성되었습니다: {job.pdf_path}")
+
+    # 클라이언트에 완료 알림
+    post_event('monitoring_complete', {
+        'message': f'모니터링 완료! PDF 리포트: {job.pdf_path}',
+        'pdf_path': job.pdf_path
+    })
+
+def monitoring_task():
+    """백그라운드 모니터링 작업 (서버 이벤트 루프에서 실행 - eventlet에서 다른 스레드의 emit은 실패함)"""
+    print("모니터링 시작...")
+
+    def active_groups():
+        # always_collect 밖의 그룹은 구독자가 있을 때만 수집, 최근 /metrics 스크레이프가 있었으면 모든 그룹 수집
+        active = frame_stream.active_groups()
+        if metrics_exporter.recently_scraped():
+            active = active.union(METRIC_GROUPS)
+        return active
+
+    record = monitor.instrumentation.record
+
+    def on_sample(data):
+        metrics_exporter.update(data, monitor.system_info)
+        fleet.observe_local(LOCAL_HOST, data, monitor.system_info)
+
+    def on_emit(data, now):
+        # 시간 정보
+        elapsed = monitoring_run.elapsed()
+        remaining = monitoring_run.remaining()
+
+        duration_str = str(timedelta(seconds=int(elapsed))).split('.')[0]
+        remaining_str = '--:--' if remaining is None else f"{int(remaining // 60):02d}:{int(remaining % 60):02d}"
+
+        # 데이터와 시간 정보를 프레임 하나로 전송 (같은 기준 상태의 클라이언트는 같은 프레임 공유)
+        state = {**data, 'time': {'duration': duration_str, 'remaining': remaining_str}}
+        started = time.perf_counter()
+        frames = frame_stream.frames(state, now)
+        encoded = time.perf_counter()
+        for sids, frame in frames:
+            for sid in sids:
+                socketio.emit('frame', frame, to=sid)
+        if frames:
+            record('serialize', encoded - started)
+            record('emit', time.perf_counter() - encoded)
+
+    completed = monitoring_run.run(active_groups, on_sample, on_emit, EMIT_INTERVAL)
+    print(f"느린 클라이언트 때문에 건너뛴 프레임 {frame_stream.get_stats()['dropped']}개")
+
+    # 모니터링 완료
+    if completed:
+        print("\n모니터링 완료! PDF 리포트 생성 중...")
+
+        # 리포트는 작업 프로세스에서 생성되고 완료 시 monitoring_complete 전송
+        monitoring_run.final_report('final', on_final_report)
+
+def fleet_task():
+    """원격 호스트 / 전체 집계 프레임과 호스트 목록을 전송하는 백그라운드 작업
+
+    원격 호스트 스트림은 시청 중인 클라이언트가 있고 새 샘플이 도착했을 때만 프레임을 만듭니다.
+    """
+    emitted = {}  # 호스트 -> 마지막으로 프레임을 만든 시점의 샘플 수
+    detected = {}  # 호스트 -> 마지막으로 전송한 시점의 이상 징후 검출 수
+    last_hosts = 0.0
+    while True:
+        now = time.monotonic()
+        for host, stream in list(host_streams.items()):
+            if host == LOCAL_HOST or stream.get_stats()['clients'] == 0:
+                continue
+            with fleet.reading():
+                remote = fleet.get(host)
+                if remote is None or remote.latest is None or emitted.get(host) == remote.samples:
+                    continue
+                emitted[host] = remote.samples
+                state = {**remote.latest,
+                         'time': {'duration': remote.history.get_monitoring_duration(), 'remaining': '--:--'}}
+                # 원격 호스트 히스토리는 에이전트 연결 스레드에서 검출하므로 여기서 새 이벤트만 모아 전송
+                anomalies = remote.history.anomalies
+                events = anomalies.after(detected.get(host, anomalies.detected))
+                detected[host] = anomalies.detected
+            for event in events:
+                emit_anomaly(event, host)
+            for sids, frame in stream.frames(state, now):
+                for sid in sids:
+                    socketio.emit('frame', frame, to=sid)
+
+        if now - last_hosts >= HOSTS_INTERVAL:
+            last_hosts = now
+            socketio.emit('hosts', fleet.summary())
+        socketio.sleep(EMIT_INTERVAL)
+
+@socketio.on('connect')
+def handle_connect():
+    """클라이언트 연결"""
+    print(f"클라이언트 연결됨")
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    """클라이언트 연결 해제"""
+    host_streams[client_hosts.pop(request.sid, LOCAL_HOST)].disconnect(request.sid)
+    print("클라이언트 연결 해제됨")
+
+def client_stream(sid: str) -> FrameStream:
+    """클라이언트가 보고 있는 호스트의 프레임 스트림"""
+    return host_streams[client_hosts.get(sid, LOCAL_HOST)]
+
+def join_groups(subscription):
+    """구독 그룹별 room(group:<이름>) 갱신 - 그룹 단위 이벤트 전송용"""
+    for group in METRIC_GROUPS:
+        if group in subscription.get('groups', ()):
+            join_room(f'group:{group}')
+        else:
+            leave_room(f'group:{group}')
+    return subscription
+
+@socketio.on('stream_hello')
+def handle_stream_hello(options):
+    """프레임 수신 시작 - 실제 적용된 설정 반환
+
+    options: encoding ('msgpack' 또는 'json'), groups (기본값: 전체), max_rate (Hz, 기본값: 1),
+             host (기본값: local, 'fleet'이면 전체 집계) - 다시 보내면 보는 호스트를 바꿈
+    응답의 alerts는 활성 알림 목록 (이후 변경은 구독 그룹의 alert 이벤트)
+    """
+    options = options or {}
+    host = options.get('host') or LOCAL_HOST
+    if host_source(host) is None:
+        host = LOCAL_HOST
+    previous = client_hosts.get(request.sid)
+    if previous is not None and previous != host:
+        host_streams[previous].disconnect(request.sid)
+    client_hosts[request.sid] = host
+    stream = host_streams.setdefault(host, FrameStream())
+    settings = join_groups(stream.connect(request.sid, options.get('encoding', 'json'),
+                                          options.get('groups'), options.get('max_rate')))
+    # 알림은 로컬 수집기에서만 평가 (원격 호스트의 상태는 에이전트가 보낸 샘플의 'status')
+    alerts = monitor.alerts.active_alerts() if host == LOCAL_HOST else []
+    return {**settings, 'host': host, 'system_info': host_source(host)[1], 'alerts': alerts}
+
+@socketio.on('subscribe')
+def handle_subscribe(options):
+    """구독 그룹 / 최대 업데이트 횟수 변경 (생략한 항목은 유지)"""
+    options = options or {}
+    return join_groups(client_stream(request.sid).subscribe(request.sid, options.get('groups'),
+                                                            options.get('max_rate')))
+
+@socketio.on('request_backfill')
+def handle_request_backfill(options):
+    """최근 seconds초 히스토리를 max_points개 이하의 컬럼형 청크로 전송 (backfill 이벤트)
+
+    options: seconds, max_points, host (기본값: 클라이언트가 보고 있는 호스트)
+    응답의 anomalies는 같은 구간의 이상 징후 이벤트 (차트 표시용, 이후는 anomaly 이벤트)
+    """
+    options = options or {}
+    seconds = float(options.get('seconds', 300))
+    max_points = max(2, min(int(options.get('max_points', 300)), MAX_BACKFILL_POINTS))
+    source = host_source(options.get('host') or client_hosts.get(request.sid))
+    if source is None:
+        return {'chunks': 0}
+    history_store, _, lock = source
+    with lock:
+        history = history_store.query_history(BACKFILL_METRICS, start=time.time() - seconds, max_points=max_points)
+        chunks = backfill_chunks(history, max_points, client_stream(request.sid).encoding(request.sid))
+        anomalies = history_store.anomalies.events(since=time.time() - seconds)
+    for chunk in chunks:
+        emit('backfill', chunk)
+    return {'chunks': len(chunks), 'anomalies': anomalies}
+
+@socketio.on('frame_ack')
+def handle_frame_ack(seq):
+    """클라이언트가 적용한 마지막 프레임 (None이면 키프레임 요청)"""
+    client_stream(request.sid).ack(request.sid, seq)
+
+@socketio.on('request_report')
+def handle_request_report(options=None):
+    """클라이언트의 리포트 생성 요청 (샘플링은 계속 진행)
+
+    options: host (기본값: 클라이언트가 보고 있는 호스트)
+    """
+    host = (options or {}).get('host') or client_hosts.get(request.sid, LOCAL_HOST)
+    source = host_source(host)
+    if source is None or len(source[0].data_history) == 0:
+        return {'status': 'failed', 'error': '수집된 데이터가 없습니다.'}
+    key = 'manual' if host == LOCAL_HOST else f'manual:{host}'
+    return request_report(key, host=host).to_dict()
+
+@socketio.on('set_process_sort')
+def handle_set_process_sort(sort_by):
+    """상위 프로세스 정렬 기준 변경 (cpu, rss, io, threads) - 마지막 측정값으로 바로 응답
+
+    원격 호스트는 에이전트의 정렬 기준을 따르므로 로컬 수집기에만 적용됩니다.
+    """
+    try:
+        monitor.process_tracker.set_sort(sort_by)
+    except ValueError as e:
+        return [{'error': str(e)}]
+    return monitor.process_tracker.top()
+
+def open_browser(url: str):
+    """브라우저 자동 열기"""
+    time.sleep(1.5)  # 서버 시작 대기
+    webbrowser.open(url)
+
+def serve(local_monitor, options):
+    """대시보드 서버 실행 (Ctrl+C 또는 SIGTERM까지) - 모니터링은 클라이언트 접속을 기다리지 않고 바로 시작
+
+    options: main.py의 명령행 설정 (duration, report_interval, intervals, always_collect, host, port,
+             no_browser, storage_dir, agent_listen, agent_token)
+    """
+    global monitor, monitoring_run, fleet, agent_server
+    monitor = local_monitor
+    monitoring_run = MonitoringRun(monitor, report_jobs, options.intervals, options.duration,
+                                   options.report_interval, options.always_collect, sleep=socketio.sleep)
+    fleet = Fleet(storage_dir=os.path.join(options.storage_dir, 'hosts'), alert_rules=monitor.alerts.rules)
+    if options.agent_listen:
+        agent_server = AgentServer(fleet, options.agent_listen, options.agent_token)
+    history_apis[LOCAL_HOST] = HistoryAPI(monitor, HISTORY_METRICS)
+    monitor.alerts.add_sink(emit_alert)
+    monitor.anomalies.add_sink(emit_anomaly)
+
+    url = f'http://localhost:{options.port}'
+    print(f"📊 실시간 대시보드: {url}")
+    print("종료하려면 Ctrl+C를 누르세요.")
+    print()
+
+    # 브라우저 자동 열기
+    if not options.no_browser:
+        browser_thread = threading.Thread(target=open_browser, args=(url,))
+        browser_thread.daemon = True
+        browser_thread.start()
+
+    socketio.start_background_task(relay_events)
+    socketio.start_background_task(fleet_task)
+    socketio.start_background_task(monitoring_task)
+
+    if agent_server is not None:
+        try:
+            agent_server.start()
+            print(f"에이전트 수신: {options.agent_listen}")
+        except OSError as e:
+            print(f"에이전트 수신을 시작하지 못했습니다 ({options.agent_listen}): {e}")
+
+    try:
+        # Flask 서버 시작 (Ctrl+C, SIGTERM이면 SystemExit으로 빠져나옴)
+        socketio.run(app, host=options.host, port=options.port, debug=False)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        interrupted = monitoring_run.running
+        if interrupted:
+            print("\n\n모니터링이 중단되었습니다.")
+        monitoring_run.stop()
+        monitor.instrumentation.profiler.stop()
+        monitor.close()
+        if agent_server is not None:
+            agent_server.shutdown()
+        fleet.close()
+
+        # 중단되어도 지금까지의 데이터로 PDF 생성 (완료 리포트가 이미 있으면 생략)
+        job = monitoring_run.final_report('interrupt') if interrupted else None
+        if job is not None:
+            print("지금까지 수집된 데이터로 PDF를 생성합니다...")
+            pdf_path = job.wait()
+            if pdf_path:
+                print(f"✓ PDF 리포트가 생성되었습니다: {pdf_path}")
+        report_jobs.shutdown()
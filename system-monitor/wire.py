@@ -0,0 +1,99 @@
+"""
+Agent Wire Protocol
+에이전트와 집계 서버 사이의 길이 접두 메시지 형식 (msgpack, 없으면 JSON)
+"""
+
+import ipaddress
+import json
+import socket
+import struct
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성: 없으면 JSON 메시지
+    msgpack = None
+
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct('!cI')  # 인코딩 (b'm' = msgpack, b'j' = JSON) + 본문 길이
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+DEFAULT_AGENT_PORT = 5001
+
+
+class ProtocolError(Exception):
+    """잘못된 메시지 (연결을 끊어야 함)"""
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """메시지 dict -> 헤더 + 본문 바이트"""
+    if msgpack is not None:
+        body = msgpack.packb(message, use_bin_type=True)
+        codec = b'm'
+    else:
+        body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+        codec = b'j'
+    return HEADER.pack(codec, len(body)) + body
+
+
+def decode_body(codec: bytes, body: bytes) -> Dict[str, Any]:
+    if codec == b'm':
+        if msgpack is None:
+            raise ProtocolError("msgpack message received but msgpack is not installed")
+        message = msgpack.unpackb(body, raw=False)
+    elif codec == b'j':
+        message = json.loads(body.decode('utf-8'))
+    else:
+        raise ProtocolError(f"unknown codec: {codec!r}")
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ProtocolError("message must be a dict with a type")
+    return message
+
+
+def _read_exact(stream, size: int) -> Optional[bytes]:
+    """size 바이트 읽기 (연결이 닫히면 None)"""
+    data = stream.read(size)
+    if not data:
+        return None
+    if len(data) < size:
+        raise ProtocolError("connection closed mid-message")
+    return data
+
+
+def read_message(stream) -> Optional[Dict[str, Any]]:
+    """버퍼드 스트림(socket.makefile('rb'))에서 메시지 하나 읽기 (정상 종료 시 None)"""
+    header = _read_exact(stream, HEADER.size)
+    if header is None:
+        return None
+    codec, size = HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"message too large: {size} bytes")
+    body = _read_exact(stream, size) if size else b''
+    if body is None:
+        raise ProtocolError("connection closed mid-message")
+    return decode_body(codec, body)
+
+
+def parse_address(address: str) -> Tuple[int, Any]:
+    """'tcp://host:port', 'host:port' 또는 'unix:///path' -> (소켓 family, 주소)"""
+    if address.startswith('unix://'):
+        return socket.AF_UNIX, address[len('unix://'):]
+    if address.startswith('tcp://'):
+        address = address[len('tcp://'):]
+    host, _, port = address.rpartition(':')
+    if not host:
+        host, port = address, DEFAULT_AGENT_PORT
+    host = host.strip('[]') or '0.0.0.0'
+    return (socket.AF_INET6 if ':' in host else socket.AF_INET), (host, int(port))
+
+
+def is_local_address(address: str) -> bool:
+    """Unix 소켓 또는 루프백 TCP 주소인지 (같은 머신에서만 연결 가능)"""
+    family, address = parse_address(address)
+    if family == socket.AF_UNIX:
+        return True
+    if address[0] == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(address[0]).is_loopback
+    except ValueError:
+        return False  # 호스트 이름은 외부 인터페이스일 수 있음